@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Add Processing Status
+Brings every scholarship file up to the current schema, which adds the
+progress_status field, without recategorizing any criteria
+"""
+
+from improved_processor import get_scholarship_files
+from schema_migrations import CURRENT_SCHEMA_VERSION, migrate_corpus
+
+def add_processing_status():
+    """
+    Migrate all scholarship files so each carries a progress_status
+    """
+    json_files = get_scholarship_files()
+    print(f"Found {len(json_files)} scholarship files, target schema version {CURRENT_SCHEMA_VERSION}...")
+    
+    result = migrate_corpus(json_files)
+    
+    print(f"\nProcessing status update complete!")
+    print(f"Updated: {result['migrated']}")
+    print(f"Already current: {result['skipped']}")
+    print(f"Failed: {result['failed']}")
+
+if __name__ == "__main__":
+    add_processing_status()
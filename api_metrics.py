@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+API Metrics
+Counters, gauges and histograms for the API server, rendered in the Prometheus
+text exposition format (version 0.0.4) without a client library:
+- Counters and histograms are recorded by request threads under one lock
+- Gauges are read from callbacks when /metrics is scraped, so values the server
+  already tracks (snapshot version, batcher totals) are never copied
+- Histograms use fixed cumulative buckets, so any Prometheus server or a plain
+  text parser can compute rates and quantiles
+
+    curl -s http://127.0.0.1:8001/metrics
+"""
+
+import math
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Request latency buckets in seconds, from a cached catalog page to a cold snapshot build
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+GaugeValue = Union[float, Dict[LabelValues, float]]
+
+def escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, bool) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def sample_line(name: str, label_names: Sequence[str], label_values: Sequence[str], value: float) -> str:
+    if not label_names:
+        return f"{name} {format_value(value)}"
+    labels = ','.join(f'{label}="{escape_label(label_value)}"'
+                      for label, label_value in zip(label_names, label_values))
+    return f"{name}{{{labels}}} {format_value(value)}"
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        return [sample_line(self.name, self.label_names, labels, value)
+                for labels, value in sorted(self.values.items())]
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # labels → (per-bucket counts, not yet cumulative; sum; count)
+        self.values: Dict[LabelValues, List] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()):
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = [[0] * len(self.buckets), 0.0, 0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                entry[0][index] += 1
+                break
+        entry[1] += value
+        entry[2] += 1
+
+    def render(self) -> List[str]:
+        lines = []
+        label_names = self.label_names + ('le',)
+        for labels, (counts, total, count) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(sample_line(f"{self.name}_bucket", label_names, labels + (format_value(bound),),
+                                         cumulative))
+            lines.append(sample_line(f"{self.name}_sum", self.label_names, labels, total))
+            lines.append(sample_line(f"{self.name}_count", self.label_names, labels, count))
+        return lines
+
+class Gauge:
+    """
+    A value read from a callback at scrape time: a number, or {label values: number}
+    """
+
+    def __init__(self, name: str, help_text: str, read: Callable[[], Optional[GaugeValue]],
+                 label_names: Sequence[str] = (), kind: str = 'gauge'):
+        self.name = name
+        self.help_text = help_text
+        self.read = read
+        self.label_names = tuple(label_names)
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        value = self.read()
+        if value is None:
+            return []
+        if not isinstance(value, dict):
+            return [sample_line(self.name, self.label_names, (), value)]
+        return [sample_line(self.name, self.label_names, labels, sample)
+                for labels, sample in sorted(value.items())]
+
+class MetricsRegistry:
+    """
+    Every metric the server exposes, in registration order
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: List[Union[Counter, Histogram, Gauge]] = []
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, label_names))
+
+    def histogram(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, label_names, buckets))
+
+    def gauge(self, name: str, help_text: str, read: Callable[[], Optional[GaugeValue]],
+              label_names: Sequence[str] = (), kind: str = 'gauge') -> Gauge:
+        """
+        kind='counter' for monotonic totals kept elsewhere (e.g. the batcher's batch count)
+        """
+        return self._register(Gauge(name, help_text, read, label_names, kind))
+
+    def _register(self, metric):
+        with self._lock:
+            if any(existing.name == metric.name for existing in self._metrics):
+                raise ValueError(f"Metric {metric.name!r} is already registered")
+            self._metrics.append(metric)
+        return metric
+
+    def inc(self, counter: Counter, labels: LabelValues = (), amount: float = 1):
+        with self._lock:
+            counter.inc(labels, amount)
+
+    def observe(self, histogram: Histogram, value: float, labels: LabelValues = ()):
+        with self._lock:
+            histogram.observe(value, labels)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics)
+        for metric in metrics:
+            kind = metric.kind if isinstance(metric, Gauge) else type(metric).__name__.lower()
+            if isinstance(metric, Gauge):
+                samples = metric.render()
+            else:
+                with self._lock:
+                    samples = metric.render()
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {kind}")
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+def hit_ratio(hits: float, misses: float) -> Optional[float]:
+    """
+    Share of lookups served from a cache, or None before the first lookup
+    """
+    total = hits + misses
+    return round(hits / total, 6) if total else None
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Scholarship API Server
+Small stdlib JSON API for the scholarship portal:
+- GET  /api/progress          All progress statuses with their versions
+- POST /api/progress          Bulk status update {"updates": [...], "updated_by": "..."}
+- POST /api/progress/export   Sync changed statuses back into the scholarship JSON files
+- GET  /api/catalog           One page of filtered, sorted scholarships with facet counts
+                              (see catalog_index.py for the query parameters)
+- POST /api/eligibility       Banner-checkable eligibility for {"students": [roster rows]}
+- GET  /api/snapshot          Version and build time of the corpus snapshot being served
+- GET  /api/scholarships/automatable
+                              Scholarships of one automation class (?class=fully|partially|
+                              manual_only|all, default fully; ?college=CODE), read from the
+                              automation view in derived_data (503 until it has been built)
+- GET  /metrics               Prometheus text metrics: request counts and latency per endpoint,
+                              cache hit rates, snapshot version, eligibility batch timings
+- GET  /debug/profile         Sample every thread's stack for ?seconds=N (default 5, max 60) and
+                              return a collapsed-stack file for flame graphs; requires
+                              "Authorization: Bearer $SCHOLARSHIP_PROFILE_TOKEN" and is
+                              disabled when that variable is not set
+
+    SCHOLARSHIP_PROFILE_TOKEN=secret python api_server.py 8001
+    curl -s -H "Authorization: Bearer secret" "http://127.0.0.1:8001/debug/profile?seconds=10" > api.folded
+"""
+
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import api_metrics
+from derived_artifacts import AUTOMATION_CLASSES, AUTOMATION_VIEW_FILE, DERIVED_DIR, load_json
+from eligibility_batcher import EligibilityBatcher
+from eligibility_service import SnapshotManager
+from progress_store import ProgressStore
+from sampling_profiler import DEFAULT_INTERVAL, MAX_SECONDS, collapsed_text, sample_stacks
+
+DEFAULT_PORT = 8001
+PROFILE_TOKEN_ENV = 'SCHOLARSHIP_PROFILE_TOKEN'
+DEFAULT_PROFILE_SECONDS = 5.0
+
+class APIError(Exception):
+    """
+    Error reported to the client as a JSON body with an HTTP status
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class TextBody(NamedTuple):
+    """
+    A non-JSON response payload
+    """
+    content_type: str
+    text: str
+    filename: Optional[str] = None
+
+class ScholarshipAPIHandler(BaseHTTPRequestHandler):
+    server_version = 'ScholarshipAPI/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    GET_ROUTES = {
+        '/api/progress': 'get_progress',
+        '/api/catalog': 'get_catalog',
+        '/api/snapshot': 'get_snapshot',
+        '/api/scholarships/automatable': 'get_automatable',
+        '/metrics': 'get_metrics',
+        '/debug/profile': 'get_profile',
+    }
+    POST_ROUTES = {
+        '/api/progress': 'post_progress',
+        '/api/progress/export': 'post_progress_export',
+        '/api/eligibility': 'post_eligibility',
+    }
+
+    def do_GET(self):
+        self.dispatch(self.GET_ROUTES)
+
+    def do_HEAD(self):
+        # Same status and headers as GET; send_json/send_text leave out the body
+        self.dispatch(self.GET_ROUTES)
+
+    def do_POST(self):
+        self.dispatch(self.POST_ROUTES)
+
+    def dispatch(self, routes: Dict[str, str]):
+        start = time.perf_counter()
+        parsed = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        endpoint = parsed.path.rstrip('/') or '/'
+        status = 500
+        try:
+            try:
+                handler_name = routes.get(endpoint)
+                if handler_name is None:
+                    # One label for every unknown path keeps the metric's cardinality bounded
+                    endpoint = 'unmatched'
+                    raise APIError(404, f"Unknown endpoint: {parsed.path}")
+                status, payload = getattr(self, handler_name)(query)
+            except APIError as e:
+                status, payload = e.status, {'error': e.message}
+            except ValueError as e:
+                status, payload = 400, {'error': str(e)}
+            except Exception as e:
+                self.log_error("Error handling %s %s: %r", self.command, self.path, e)
+                if not self.server.quiet:
+                    traceback.print_exc()
+                status, payload = 500, {'error': f"Internal server error: {type(e).__name__}"}
+            if isinstance(payload, TextBody):
+                self.send_text(status, payload)
+            else:
+                self.send_json(status, payload)
+        finally:
+            # Counted even when the response could not be sent, so failures show up in the metrics
+            self.server.record_request(self.command, endpoint, status, time.perf_counter() - start)
+
+    def read_json_body(self) -> Dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except json.JSONDecodeError as e:
+            raise APIError(400, f"Invalid JSON body: {e}")
+
+    def send_json(self, status: int, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def send_text(self, status: int, payload: TextBody):
+        body = payload.text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', payload.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        if payload.filename:
+            self.send_header('Content-Disposition', f'attachment; filename="{payload.filename}"')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    # Progress status endpoints
+
+    def get_progress(self, query: Dict) -> Tuple[int, Dict]:
+        statuses = self.server.progress_store.get_all()
+        return 200, {'statuses': {str(sid): entry for sid, entry in statuses.items()}}
+
+    def post_progress(self, query: Dict) -> Tuple[int, Dict]:
+        body = self.read_json_body()
+        updates = body.get('updates')
+        if not isinstance(updates, list):
+            raise APIError(400, "Expected an 'updates' list")
+        result = self.server.progress_store.bulk_update(updates, body.get('updated_by', ''))
+        return (409 if result['conflicts'] and not result['applied'] else 200), result
+
+    def post_progress_export(self, query: Dict) -> Tuple[int, Dict]:
+        return 200, self.server.progress_store.export_to_json()
+
+    # Catalog endpoints
+
+    def get_catalog(self, query: Dict) -> Tuple[int, Dict]:
+        # Shared progress statuses win over the values stored in the scholarship files
+        statuses = {sid: entry['status'] for sid, entry in self.server.progress_store.get_all().items()}
+        return 200, self.server.snapshots.current().catalog.query(query, statuses)
+
+    # Eligibility endpoints
+
+    def post_eligibility(self, query: Dict) -> Tuple[int, Dict]:
+        students = self.read_json_body().get('students')
+        if not isinstance(students, list) or not all(isinstance(row, dict) for row in students):
+            raise APIError(400, "Expected a 'students' list of roster rows")
+
+        # Concurrent requests are coalesced into one roster evaluation against a single snapshot
+        return 200, self.server.batcher.evaluate(students)
+
+    def get_snapshot(self, query: Dict) -> Tuple[int, Dict]:
+        return 200, self.server.snapshots.metrics()
+
+    # Automation endpoints
+
+    def get_automatable(self, query: Dict) -> Tuple[int, Dict]:
+        automation_class = query.get('class', 'fully')
+        if automation_class != 'all' and automation_class not in AUTOMATION_CLASSES:
+            raise APIError(400, f"Unknown class {automation_class!r}; use all, {', '.join(AUTOMATION_CLASSES)}")
+        college = query.get('college')
+
+        counts = {name: 0 for name in AUTOMATION_CLASSES}
+        scholarships = []
+        for entry in self.server.automation_view().values():
+            if entry['automation_class'] is None or (college and entry['college_code'] != college):
+                continue
+            counts[entry['automation_class']] += 1
+            if automation_class in ('all', entry['automation_class']):
+                scholarships.append(entry)
+        scholarships.sort(key=lambda entry: (-entry['automation_percentage'], entry['name']))
+        return 200, {'class': automation_class, 'counts': counts, 'count': len(scholarships),
+                     'scholarships': scholarships}
+
+    # Operations endpoints
+
+    def get_metrics(self, query: Dict) -> Tuple[int, TextBody]:
+        return 200, TextBody(api_metrics.CONTENT_TYPE, self.server.metrics.render())
+
+    def get_profile(self, query: Dict) -> Tuple[int, TextBody]:
+        token = self.server.profile_token
+        if not token:
+            raise APIError(404, f"Profiling is disabled; set {PROFILE_TOKEN_ENV} to enable it")
+        supplied = self.headers.get('Authorization', '')
+        if not hmac.compare_digest(supplied.encode('utf-8'), f'Bearer {token}'.encode('utf-8')):
+            raise APIError(401, "Missing or invalid profiling token")
+
+        seconds = float(query.get('seconds', DEFAULT_PROFILE_SECONDS))
+        interval = float(query.get('interval', DEFAULT_INTERVAL))
+        if not 0 < seconds <= MAX_SECONDS:
+            raise APIError(400, f"seconds must be in (0, {MAX_SECONDS:g}]")
+        if not 0.001 <= interval <= 1:
+            raise APIError(400, "interval must be between 0.001 and 1 second")
+
+        # One profile at a time: overlapping samplers would mostly profile each other
+        if not self.server.profile_lock.acquire(blocking=False):
+            raise APIError(409, "A profile is already being captured")
+        try:
+            stacks = sample_stacks(seconds, interval)
+        finally:
+            self.server.profile_lock.release()
+        filename = f"api-profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.folded"
+        return 200, TextBody('text/plain; charset=utf-8', collapsed_text(stacks), filename)
+
+class ScholarshipAPIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, progress_store: ProgressStore = None, quiet: bool = False,
+                 handler_class=ScholarshipAPIHandler):
+        super().__init__(address, handler_class)
+        self._progress_store = progress_store
+        self.snapshots = SnapshotManager()
+        self.batcher = EligibilityBatcher(lambda: self.snapshots.current(), on_batch=self.record_batch)
+        self.quiet = quiet
+        self._automation_view = (None, {})
+        self._automation_lock = threading.Lock()
+        self.automation_view_hits = 0
+        self.automation_view_loads = 0
+        self.profile_token = os.environ.get(PROFILE_TOKEN_ENV)
+        self.profile_lock = threading.Lock()
+        self.register_metrics()
+
+    @property
+    def progress_store(self) -> ProgressStore:
+        # Opened on first use so servers that never touch progress do not create the database
+        if self._progress_store is None:
+            self._progress_store = ProgressStore()
+        return self._progress_store
+
+    def automation_view(self) -> Dict[str, Dict]:
+        """
+        The automation view, reloaded only when processing has rewritten it. Building it
+        means rebuilding every derived artifact, which is not done in a request.
+        """
+        path = os.path.join(DERIVED_DIR, AUTOMATION_VIEW_FILE)
+        with self._automation_lock:
+            try:
+                # Stat before reading: a rewrite in between is picked up by the next request
+                version = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                version = None
+            if version is not None and version == self._automation_view[0]:
+                self.automation_view_hits += 1
+                return self._automation_view[1]
+
+            view = load_json(path) if version is not None else None
+            if view is None:
+                raise APIError(503, "Automation view not built yet; run derived_artifacts.py")
+            self._automation_view = (version, view)
+            self.automation_view_loads += 1
+            return view
+
+    # Metrics
+
+    def register_metrics(self):
+        metrics = self.metrics = api_metrics.MetricsRegistry()
+        self.requests_total = metrics.counter(
+            'scholarship_api_requests_total', "HTTP requests by method, endpoint and status",
+            ('method', 'endpoint', 'status'))
+        self.request_seconds = metrics.histogram(
+            'scholarship_api_request_duration_seconds', "Time to handle and answer a request",
+            ('method', 'endpoint'))
+        self.batch_seconds = metrics.histogram(
+            'scholarship_api_eligibility_batch_seconds', "Time to evaluate one coalesced eligibility batch")
+
+        snapshots, batcher = self.snapshots, self.batcher
+        metrics.gauge('scholarship_api_snapshot_version', "Version of the corpus snapshot being served",
+                      lambda: snapshots.metrics()['version'])
+        metrics.gauge('scholarship_api_snapshot_scholarships', "Scholarships in the current snapshot",
+                      lambda: snapshots.metrics()['scholarships'])
+        metrics.gauge('scholarship_api_snapshot_build_seconds', "Build time of the current snapshot",
+                      lambda: snapshots.metrics()['build_seconds'])
+        metrics.gauge('scholarship_api_snapshot_builds_total', "Snapshots built and swapped in",
+                      lambda: snapshots.builds, kind='counter')
+        metrics.gauge('scholarship_api_snapshot_failed_builds_total', "Snapshot builds that failed",
+                      lambda: snapshots.failed_builds, kind='counter')
+
+        metrics.gauge('scholarship_api_eligibility_batches_total', "Eligibility batches evaluated",
+                      lambda: batcher.batches, kind='counter')
+        metrics.gauge('scholarship_api_eligibility_requests_total', "Eligibility requests answered by the batcher",
+                      lambda: batcher.requests, kind='counter')
+        metrics.gauge('scholarship_api_eligibility_students_total', "Student rows evaluated by the batcher",
+                      lambda: batcher.students, kind='counter')
+        metrics.gauge('scholarship_api_eligibility_failed_batches_total', "Eligibility batches that raised",
+                      lambda: batcher.failed_batches, kind='counter')
+
+        metrics.gauge('scholarship_api_cache_hits_total', "Lookups served from a cache", lambda: {
+            (name,): hits for name, (hits, _) in self.cache_counts().items()}, ('cache',), kind='counter')
+        metrics.gauge('scholarship_api_cache_misses_total', "Lookups that had to load or compute", lambda: {
+            (name,): misses for name, (_, misses) in self.cache_counts().items()}, ('cache',), kind='counter')
+        metrics.gauge('scholarship_api_cache_hit_ratio', "Share of lookups served from a cache since start", lambda: {
+            (name,): ratio for name, ratio in ((name, api_metrics.hit_ratio(hits, misses))
+                                               for name, (hits, misses) in self.cache_counts().items())
+            if ratio is not None}, ('cache',))
+
+    def cache_counts(self) -> Dict[str, Tuple[int, int]]:
+        """
+        (hits, misses) per cache: files reused across snapshot builds, predicate masks
+        shared between plans within a batch, and the automation view
+        """
+        return {
+            'snapshot_files': (self.snapshots.files_reused, self.snapshots.files_loaded),
+            'predicate_masks': (self.batcher.predicate_cache_hits, self.batcher.predicate_cache_misses),
+            'automation_view': (self.automation_view_hits, self.automation_view_loads),
+        }
+
+    def record_request(self, method: str, endpoint: str, status: int, seconds: float):
+        self.metrics.inc(self.requests_total, (method, endpoint, str(status)))
+        self.metrics.observe(self.request_seconds, seconds, (method, endpoint))
+
+    def record_batch(self, students: int, seconds: float):
+        self.metrics.observe(self.batch_seconds, seconds)
+
+def run_server(port: int = DEFAULT_PORT, host: str = '127.0.0.1'):
+    server = ScholarshipAPIServer((host, port))
+    server.snapshots.start()
+    print(f"Scholarship API listening on http://{host}:{port}")
+    print("Press Ctrl+C to stop the server")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    run_server(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT)
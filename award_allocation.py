@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+"""
+Award Allocation
+Assigns students to scholarship awards as a weighted bipartite b-matching: each
+scholarship has a capacity, each student an optional limit on awards, and every
+eligible (student, scholarship) pair a weight that ranks filling an award first,
+then soft-criteria fit, then cumulative GPA.
+
+- Only eligible pairs are materialized: per student, the eligible scholarships
+  grouped by soft-criteria bonus, built from the candidate_ranking score levels
+- With no per-student limit the scholarships do not interact, so each one simply
+  takes its best `capacity` candidates (the candidate_ranking top-k walk)
+- With a limit, a forward auction (Bertsekas) finds a near-optimal assignment:
+  each student seat bids for its most profitable scholarship slot and slot prices
+  rise until no seat prefers another slot by more than ε. Seats scan their groups
+  best bonus first and stop once nothing left can beat the runner-up, so a bid
+  usually touches a handful of scholarships, not all of them
+- The auction result is then checked as a min-cost flow: Bellman-Ford over the
+  residual graph contracted to scholarships looks for a cycle of moves with positive
+  gain and applies it, until none is left and the assignment is proved optimal.
+  A scholarship's row keeps only each target's best move, claimed best gain first,
+  and the search keeps its distances between cycles, so after a cycle is canceled
+  only the rows it changed are scanned again
+
+On one core the 20k-student synthetic roster (ROSTER_SCALES 100x) against the full
+corpus takes about 2 s with `--max-awards 1`, 10 s with 2 and 26 s with 3, build
+included. The residual check dominates above 1 and grows with the number of cycles
+the auction leaves behind, so larger limits on larger rosters scale worse than linearly
+
+    python award_allocation.py roster.csv --max-awards 1
+    python award_allocation.py roster.csv --max-awards 2 --capacities capacities.csv
+"""
+
+import argparse
+import csv
+import heapq
+import os
+import time
+from collections import deque
+from operator import itemgetter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from banner_roster import read_roster
+from bitsets import bit_positions
+from candidate_ranking import GPA_COLUMN, RankingPlan, compile_ranking_corpus, gpa_bands, score_levels, top_k
+from derived_artifacts import DERIVED_DIR
+from eligibility_engine import RosterIndex, evaluate_plan
+from improved_processor import get_scholarship_files
+
+ALLOCATIONS_DIR = os.path.join(DERIVED_DIR, 'allocations')
+DEFAULT_CAPACITY = 1
+
+# Integer pair weights: any award outweighs every fit/GPA difference, and a full
+# soft-criteria match outweighs a full grade point of GPA
+AWARD_WEIGHT = 100000
+SOFT_WEIGHT = 10000
+GPA_WEIGHT = 1000
+
+# Scholarships a seat remembers between bids, and the minimum bid increment: coarse
+# enough that ties settle in a few bids, as the residual check closes the rest of the gap
+AUCTION_LOOKAHEAD = 3
+AUCTION_EPSILON = SOFT_WEIGHT / 8
+# Opening price of every slot. Every pair weight includes the award weight, so opening
+# just below it changes no choice (each seat still values each slot at ε or more), but
+# when seats outnumber slots the prices that turn the extra seats away no longer have
+# to climb through the award weight one bid at a time
+AUCTION_RESERVE = AWARD_WEIGHT - AUCTION_EPSILON
+
+class AllocationProblem(NamedTuple):
+    plans: List[RankingPlan]
+    capacities: List[int]
+    # Per scholarship: score level → bitset of eligible students
+    levels: List[Dict[int, int]]
+    # Per scholarship: score level → bonus added to the pair weight
+    bonuses: List[Dict[int, int]]
+    student_values: List[int]
+
+def plan_capacity(plan: RankingPlan, overrides: Optional[Dict[int, int]] = None) -> int:
+    scholarship_id = plan.eligibility.scholarship_id
+    if overrides and scholarship_id in overrides:
+        return overrides[scholarship_id]
+    return plan.candidate_count or DEFAULT_CAPACITY
+
+def soft_bonus(plan: RankingPlan, score: int) -> int:
+    max_score = sum(criterion.points for criterion in plan.soft_criteria)
+    return round(SOFT_WEIGHT * score / max_score) if max_score else 0
+
+def build_problem(plans: List[RankingPlan], roster: RosterIndex,
+                  capacity_overrides: Optional[Dict[int, int]] = None) -> AllocationProblem:
+    """
+    Eligible pairs and their weights for every scholarship with capacity and candidates
+    """
+    kept, capacities, levels, bonuses = [], [], [], []
+    for plan in plans:
+        capacity = plan_capacity(plan, capacity_overrides)
+        if capacity <= 0:
+            continue
+        eligible = evaluate_plan(plan.eligibility, roster)
+        if not eligible:
+            continue
+        plan_levels = score_levels(eligible, plan.soft_criteria, roster)
+        kept.append(plan)
+        capacities.append(capacity)
+        levels.append(plan_levels)
+        bonuses.append({score: soft_bonus(plan, score) for score in plan_levels})
+
+    student_values = [AWARD_WEIGHT] * roster.size
+    for gpa, position in zip(*roster.numbers[GPA_COLUMN]):
+        student_values[position] += round(GPA_WEIGHT * gpa)
+    return AllocationProblem(kept, capacities, levels, bonuses, student_values)
+
+def student_candidates(problem: AllocationProblem, size: int) -> List[List[Tuple[int, List[int]]]]:
+    """
+    Sparse eligible pairs: per student, (bonus, scholarship indexes) groups, best bonus first
+    """
+    groups: List[Dict[int, List[int]]] = [{} for _ in range(size)]
+    for index, (plan_levels, plan_bonuses) in enumerate(zip(problem.levels, problem.bonuses)):
+        for score, mask in plan_levels.items():
+            bonus = plan_bonuses[score]
+            for position in bit_positions(mask):
+                student_groups = groups[position]
+                if bonus in student_groups:
+                    student_groups[bonus].append(index)
+                else:
+                    student_groups[bonus] = [index]
+    return [sorted(student_groups.items(), reverse=True) for student_groups in groups]
+
+def allocate_unlimited(problem: AllocationProblem, roster: RosterIndex) -> List[Tuple[int, int]]:
+    """
+    Without a per-student limit every scholarship takes its own best candidates
+    """
+    bands = gpa_bands(roster)
+    pairs = []
+    for index, (plan_levels, capacity) in enumerate(zip(problem.levels, problem.capacities)):
+        pairs.extend((position, index) for _, _, position in top_k(plan_levels, capacity, bands))
+    return pairs
+
+class SlotAuction:
+    """
+    Forward auction: student seats (max_awards per student) bid for scholarship slots
+    and a slot's price rises each time it changes hands. Ends with every seat holding
+    an award within ε of its best option, or none worth taking.
+    """
+
+    def __init__(self, problem: AllocationProblem, candidates: List[List[Tuple[int, List[int]]]], max_awards: int):
+        self.candidates = candidates
+        self.values = problem.student_values
+        self.max_awards = max_awards
+        # Slots of a scholarship are interchangeable: untaken ones all sit at the opening
+        # price, taken ones are a min-heap of (price, seat) so the cheapest is the one to bid on
+        self.open_slots = list(problem.capacities)
+        self.taken_slots: List[List[Tuple[float, int]]] = [[] for _ in problem.capacities]
+        # Per scholarship the price of its cheapest slot
+        self.prices = [AUCTION_RESERVE] * len(problem.capacities)
+        self.held = [set() for _ in range(len(candidates))]
+        # Seat → (scholarship index, pair weight) of its current award
+        self.seat_awards: Dict[int, Tuple[int, int]] = {}
+        self.seats = [student * max_awards + seat for student in range(len(candidates)) if candidates[student]
+                      for seat in range(max_awards)]
+        # Seat → (best few (scholarship index, weight), upper bound on every other option's value).
+        # Prices only rise, so a bound stays valid until the seat's options grow.
+        self.cache: Dict[int, Tuple[List[Tuple[int, int]], float]] = {}
+        self.bids = 0
+        self.scans = 0
+
+    def scan(self, seat: int) -> Tuple[List[Tuple[int, int]], float]:
+        """
+        Best AUCTION_LOOKAHEAD scholarships of one seat and a bound on the rest
+        """
+        self.scans += 1
+        student = seat // self.max_awards
+        held = self.held[student]
+        price = self.prices.__getitem__
+        wanted = AUCTION_LOOKAHEAD + 1
+        # (value, scholarship index, weight), best first
+        top: List[Tuple[float, int, int]] = []
+        for bonus, indexes in self.candidates[student]:
+            weight = self.values[student] + bonus
+            # No slot is priced below the reserve, so later (lower bonus) groups cannot place
+            if len(top) == wanted and weight - AUCTION_RESERVE < top[-1][0]:
+                break
+            top.extend((weight - price(index), index, weight)
+                       for index in sorted(indexes, key=price)[:wanted + len(held)] if index not in held)
+            top.sort(reverse=True)
+            del top[wanted:]
+        bound = top[AUCTION_LOOKAHEAD][0] if len(top) == wanted else 0.0
+        entry = ([(index, weight) for _, index, weight in top[:AUCTION_LOOKAHEAD]], max(bound, 0.0))
+        self.cache[seat] = entry
+        return entry
+
+    def bid(self, seat: int, epsilon: float) -> int:
+        """
+        One forward bid; returns the seat that was outbid, or -1
+        """
+        held = self.held[seat // self.max_awards]
+        entry = self.cache.get(seat)
+        while True:
+            options, bound = entry if entry is not None else self.scan(seat)
+            best_value = float('-inf')
+            second_value = bound
+            best_index = best_weight = -1
+            for index, weight in options:
+                if index in held:
+                    continue
+                value = weight - self.prices[index]
+                if value > best_value:
+                    second_value = max(second_value, best_value)
+                    best_value, best_index, best_weight = value, index, weight
+                elif value > second_value:
+                    second_value = value
+            # A cached choice only stands if it is still at least as good as everything outside the cache
+            if best_value >= bound or entry is None:
+                break
+            entry = None
+        if best_index < 0 or best_value <= 0:
+            return -1
+
+        self.bids += 1
+        taken = self.taken_slots[best_index]
+        if self.open_slots[best_index]:
+            # An untaken slot is simply taken: no one is displaced, so the price stays
+            self.open_slots[best_index] -= 1
+            heapq.heappush(taken, (AUCTION_RESERVE, seat))
+            previous = -1
+        else:
+            # Outbidding the holder of the cheapest slot raises its price as far as the bidder
+            # still prefers it; the next-cheapest slot of the same scholarship is an alternative too
+            price, previous = taken[0]
+            if len(taken) > 1:
+                next_price = taken[1][0] if len(taken) == 2 else min(taken[1][0], taken[2][0])
+                second_value = max(second_value, best_weight - next_price)
+            heapq.heapreplace(taken, (price + best_value - second_value + epsilon, seat))
+            del self.seat_awards[previous]
+            self.held[previous // self.max_awards].discard(best_index)
+            if self.max_awards > 1:
+                # The displaced student's other seats can see this scholarship again, so their bounds no longer hold
+                first = previous // self.max_awards * self.max_awards
+                for sibling in range(first, first + self.max_awards):
+                    if sibling != previous:
+                        self.cache.pop(sibling, None)
+        self.prices[best_index] = AUCTION_RESERVE if self.open_slots[best_index] else taken[0][0]
+        held.add(best_index)
+        self.seat_awards[seat] = (best_index, best_weight)
+        return previous
+
+    def run(self, epsilon: float):
+        queue = deque(self.seats)
+        while queue:
+            outbid = self.bid(queue.popleft(), epsilon)
+            if outbid >= 0:
+                queue.append(outbid)
+
+    def pairs(self) -> List[Tuple[int, int]]:
+        return [(seat // self.max_awards, index) for seat, (index, _) in self.seat_awards.items()]
+
+class ResidualGraph:
+    """
+    Residual graph of an assignment, contracted to one node per scholarship plus one
+    node for "no scholarship". An edge j → k carries the best gain of moving one of
+    j's students to k; edges into the extra node free a slot or drop a student, and
+    edges out of it open a slot or bring in a student with awards to spare.
+    The assignment is optimal exactly when no cycle of positive gain remains
+    (min-cost flow optimality), so Bellman-Ford both proves optimality and finds
+    the next improvement when there is one.
+    """
+
+    def __init__(self, problem: AllocationProblem, candidates: List[List[Tuple[int, List[int]]]], max_awards: int,
+                 pairs: List[Tuple[int, int]]):
+        self.problem = problem
+        self.candidates = candidates
+        self.values = problem.student_values
+        self.max_awards = max_awards
+        self.outside = len(problem.capacities)
+        self.members: List[Dict[int, int]] = [{} for _ in problem.capacities]
+        self.held = [set() for _ in candidates]
+        for student, index in pairs:
+            self.members[index][student] = self.pair_weight(student, index)
+            self.held[student].add(index)
+        # Per scholarship a lazy max-heap of (-weight, student) over students with awards to spare
+        self.fills: List[List[Tuple[int, int]]] = [[] for _ in problem.capacities]
+        for student in range(len(candidates)):
+            self.add_fills(student)
+        for fills in self.fills:
+            heapq.heapify(fills)
+        # Per scholarship the (weight, student) of its weakest member, until its members change
+        self.weakest_members: Dict[int, Tuple[int, int]] = {}
+        self.swaps = 0
+        self.cycles = 0
+        self.swap_pass(range(self.outside))
+        # Node → {node: (gain, student moved or -1)}
+        self.edges: List[Dict[int, Tuple[int, int]]] = [self.scholarship_edges(index) for index in range(self.outside)]
+        self.edges.append(self.outside_edges())
+        # Bellman-Ford state kept between searches: any distances are a valid start, so after
+        # a cycle is canceled only the nodes whose rows changed (or were not yet scanned) are revisited
+        nodes = len(self.edges)
+        self.distance = [0] * nodes
+        self.queue = deque(range(nodes))
+        self.queued = [True] * nodes
+
+    def pair_weight(self, student: int, index: int) -> int:
+        bonus = next(bonus for bonus, indexes in self.candidates[student] if index in indexes)
+        return self.values[student] + bonus
+
+    def add_fills(self, student: int, push: bool = False):
+        held = self.held[student]
+        if len(held) >= self.max_awards:
+            return
+        for bonus, indexes in self.candidates[student]:
+            entry = (-self.values[student] - bonus, student)
+            for index in indexes:
+                if index not in held:
+                    if push:
+                        heapq.heappush(self.fills[index], entry)
+                    else:
+                        self.fills[index].append(entry)
+
+    def weakest(self, index: int) -> Tuple[int, int]:
+        """
+        (weight, student) of the weakest member of a scholarship that has members
+        """
+        weakest = self.weakest_members.get(index)
+        if weakest is None:
+            members = self.members[index]
+            student = min(members, key=members.__getitem__)
+            weakest = self.weakest_members[index] = (members[student], student)
+        return weakest
+
+    def best_fill(self, index: int) -> Optional[Tuple[int, int]]:
+        """
+        (weight, student) of the best student with an award to spare for a scholarship
+        """
+        fills = self.fills[index]
+        while fills:
+            weight, student = fills[0]
+            held = self.held[student]
+            if len(held) < self.max_awards and index not in held:
+                return -weight, student
+            heapq.heappop(fills)
+        return None
+
+    def scholarship_edges(self, index: int) -> Dict[int, Tuple[int, int]]:
+        members = self.members[index]
+        moves = []
+        for student, weight in members.items():
+            for bonus, indexes in self.candidates[student]:
+                moves.append((self.values[student] + bonus - weight, student, indexes))
+        # Claimed best gain first (the last of equal moves first), so each scholarship keeps its
+        # best move and the walk stops once every scholarship has one
+        moves.sort(key=itemgetter(0))
+        edges: Dict[int, Tuple[int, int]] = {}
+        unclaimed = set(range(self.outside))
+        for gain, student, indexes in reversed(moves):
+            row = unclaimed.intersection(indexes)
+            row.difference_update(self.held[student])
+            if row:
+                edges.update(dict.fromkeys(row, (gain, student)))
+                unclaimed -= row
+                if not unclaimed:
+                    break
+        if len(members) < self.problem.capacities[index]:
+            edges[self.outside] = (0, -1)
+        elif members:
+            weight, weakest = self.weakest(index)
+            edges[self.outside] = (-weight, weakest)
+        return edges
+
+    def outside_edges(self) -> Dict[int, Tuple[int, int]]:
+        edges = {}
+        for index, members in enumerate(self.members):
+            fill = self.best_fill(index)
+            if fill is not None and fill[0] > 0:
+                edges[index] = fill
+            elif members:
+                edges[index] = (0, -1)
+        return edges
+
+    def move(self, removals: List[Tuple[int, int]], additions: List[Tuple[int, int]]) -> bool:
+        """
+        Apply (student, scholarship) removals then additions; False, with nothing changed,
+        if the result breaks a capacity or award limit
+        """
+        held = {student: set(self.held[student]) for student, _ in removals + additions}
+        counts = {index: len(self.members[index]) for _, index in removals + additions}
+        for student, index in removals:
+            if index not in held[student]:
+                return False
+            held[student].discard(index)
+            counts[index] -= 1
+        for student, index in additions:
+            if index in held[student]:
+                return False
+            held[student].add(index)
+            counts[index] += 1
+        if any(len(indexes) > self.max_awards for indexes in held.values()) or \
+                any(count > self.problem.capacities[index] for index, count in counts.items()):
+            return False
+
+        for student, index in removals:
+            del self.members[index][student]
+            self.weakest_members.pop(index, None)
+        for student, index in additions:
+            self.members[index][student] = self.pair_weight(student, index)
+            self.weakest_members.pop(index, None)
+        for student, indexes in held.items():
+            previous = self.held[student]
+            self.held[student] = indexes
+            if len(indexes) >= self.max_awards:
+                continue
+            if len(previous) >= self.max_awards:
+                # Entries are only dropped while a student is full or holds the scholarship
+                self.add_fills(student, push=True)
+            else:
+                for index in previous - indexes:
+                    heapq.heappush(self.fills[index], (-self.pair_weight(student, index), student))
+        return True
+
+    def swap_pass(self, indexes: Iterable[int]) -> Set[int]:
+        """
+        Greedy two-move improvements: a student with an award to spare takes a free slot,
+        or the place of a weaker member. Returns the scholarships whose rows changed.
+        """
+        queue = deque(indexes)
+        queued = set(queue)
+        changed: Set[int] = set()
+        capacities, weakest_members = self.problem.capacities, self.weakest_members
+        while queue:
+            index = queue.popleft()
+            queued.discard(index)
+            fill = self.best_fill(index)
+            if fill is None:
+                continue
+            weight, student = fill
+            members = self.members[index]
+            removals = []
+            if len(members) >= self.problem.capacities[index]:
+                weakest_weight, weakest = self.weakest(index)
+                if weakest_weight >= weight:
+                    continue
+                removals.append((weakest, index))
+            self.move(removals, [(student, index)])
+            self.swaps += 1
+            changed.add(index)
+            changed.update(self.held[student])
+            for weakest, _ in removals:
+                changed.update(self.held[weakest])
+                # The dropped student may now improve another scholarship: one with a free
+                # slot or a weaker member than it (nothing else changed for the others)
+                held = self.held[weakest]
+                for bonus, others in self.candidates[weakest]:
+                    weight = self.values[weakest] + bonus
+                    for other in others:
+                        if other in queued or other in held:
+                            continue
+                        if len(self.members[other]) < capacities[other] or \
+                                (weakest_members.get(other) or self.weakest(other))[0] < weight:
+                            queue.append(other)
+                            queued.add(other)
+            if index not in queued:
+                queue.append(index)
+                queued.add(index)
+        return changed
+
+    def enqueue(self, node: int):
+        if not self.queued[node]:
+            self.queued[node] = True
+            self.queue.append(node)
+
+    def positive_cycle(self) -> Optional[List[int]]:
+        """
+        Longest paths from every node at once (Bellman-Ford with a work queue). With a
+        positive cycle the distances grow forever, and the predecessor graph, checked
+        every `nodes` relaxations, soon contains it; an emptied queue proves there is none,
+        since every edge then satisfies distance[other] >= distance[node] + gain.
+        """
+        nodes = len(self.edges)
+        distance, queue, queued = self.distance, self.queue, self.queued
+        predecessor = [-1] * nodes
+        relaxations = 0
+        while queue:
+            node = queue.popleft()
+            queued[node] = False
+            base = distance[node]
+            for other, (gain, _) in self.edges[node].items():
+                if base + gain > distance[other]:
+                    distance[other] = base + gain
+                    predecessor[other] = node
+                    relaxations += 1
+                    if not queued[other]:
+                        queued[other] = True
+                        queue.append(other)
+                    if relaxations % nodes == 0:
+                        cycle = predecessor_cycle(predecessor)
+                        if cycle is not None:
+                            # The rest of this row was not scanned
+                            self.enqueue(node)
+                            return cycle
+        return None
+
+    def apply(self, cycle: List[int]) -> bool:
+        """
+        Move students along a positive cycle; False if the contracted cycle does not
+        correspond to a valid assignment (a student used twice with more than one award)
+        """
+        removals, additions = [], []
+        for node, other in zip(cycle, cycle[1:] + cycle[:1]):
+            gain, student = self.edges[node][other]
+            if student < 0:
+                continue
+            if node != self.outside:
+                removals.append((student, node))
+            if other != self.outside:
+                additions.append((student, other))
+        if not self.move(removals, additions):
+            return False
+        self.cycles += 1
+
+        # Rows built from a moved student's awards, or of a scholarship whose members changed
+        stale = {index for _, index in removals + additions}
+        for student, _ in removals + additions:
+            stale.update(self.held[student])
+        stale.update(self.swap_pass(stale))
+        for index in stale:
+            self.edges[index] = self.scholarship_edges(index)
+            self.enqueue(index)
+        self.edges[self.outside] = self.outside_edges()
+        self.enqueue(self.outside)
+        return True
+
+    def improve(self) -> bool:
+        """
+        Cancel positive cycles until none is left; True once the assignment is proved optimal
+        """
+        while True:
+            cycle = self.positive_cycle()
+            if cycle is None:
+                return True
+            if not self.apply(cycle):
+                return False
+
+    def pairs(self) -> List[Tuple[int, int]]:
+        return [(student, index) for index, members in enumerate(self.members) for student in members]
+
+def predecessor_cycle(predecessor: List[int]) -> Optional[List[int]]:
+    """
+    Any cycle among predecessor links, in edge order
+    """
+    visited = [0] * len(predecessor)
+    for start in range(len(predecessor)):
+        node = start
+        while node >= 0 and not visited[node]:
+            visited[node] = start + 1
+            node = predecessor[node]
+        if node >= 0 and visited[node] == start + 1:
+            cycle = [node]
+            other = predecessor[node]
+            while other != node:
+                cycle.append(other)
+                other = predecessor[other]
+            cycle.reverse()
+            return cycle
+    return None
+
+def pair_weights(problem: AllocationProblem, pairs: List[Tuple[int, int]]) -> List[Tuple[int, int, int, int]]:
+    """
+    (student position, scholarship index, soft score, weight) of each assigned pair
+    """
+    weighted = []
+    for position, index in pairs:
+        bit = 1 << position
+        score = next(score for score, mask in problem.levels[index].items() if mask & bit)
+        weighted.append((position, index, score, problem.student_values[position] + problem.bonuses[index][score]))
+    return weighted
+
+def allocate(plans: List[RankingPlan], roster: RosterIndex, max_awards: Optional[int] = None,
+             capacity_overrides: Optional[Dict[int, int]] = None) -> Dict:
+    """
+    Optimal awards for one roster; max_awards=None leaves students unlimited
+    """
+    start = time.perf_counter()
+    problem = build_problem(plans, roster, capacity_overrides)
+    built_at = time.perf_counter()
+    if max_awards is None:
+        pairs, stats = allocate_unlimited(problem, roster), {}
+    else:
+        candidates = student_candidates(problem, roster.size)
+        auction = SlotAuction(problem, candidates, max_awards)
+        auction.run(AUCTION_EPSILON)
+        auctioned_at = time.perf_counter()
+        residual = ResidualGraph(problem, candidates, max_awards, auction.pairs())
+        optimal = residual.improve()
+        pairs = residual.pairs()
+        stats = {'seats': len(auction.seats), 'bids': auction.bids, 'scans': auction.scans,
+                 'auction_seconds': auctioned_at - built_at, 'swaps': residual.swaps,
+                 'cycles_canceled': residual.cycles, 'optimal': optimal}
+    solved_at = time.perf_counter()
+
+    weighted = pair_weights(problem, pairs)
+    awards = [{'scholarship_id': problem.plans[index].eligibility.scholarship_id,
+               'scholarship_name': problem.plans[index].eligibility.name,
+               'college_code': problem.plans[index].eligibility.college_code,
+               'student_id': roster.student_ids[position],
+               'score': score,
+               'weight': weight}
+              for position, index, score, weight in sorted(weighted, key=lambda pair: (pair[1], -pair[3], pair[0]))]
+    return {
+        'awards': awards,
+        'total_weight': sum(weight for _, _, _, weight in weighted),
+        'students_awarded': len({position for position, _, _, _ in weighted}),
+        'slots': sum(problem.capacities),
+        'scholarships': len(problem.plans),
+        'eligible_pairs': sum(mask.bit_count() for plan_levels in problem.levels for mask in plan_levels.values()),
+        'build_seconds': built_at - start,
+        'solve_seconds': solved_at - built_at,
+        **stats
+    }
+
+def read_capacities(path: str) -> Dict[int, int]:
+    """
+    scholarship_id,capacity CSV of award counts that override candidate_count
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return {int(row['scholarship_id']): int(row['capacity']) for row in csv.DictReader(f)}
+
+def write_allocation(awards: List[Dict], path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['scholarship_id', 'scholarship_name', 'college_code',
+                                               'student_id', 'score', 'weight'])
+        writer.writeheader()
+        writer.writerows(awards)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Allocate scholarship awards across an eligible roster")
+    parser.add_argument('roster', help="Banner extract CSV")
+    parser.add_argument('--max-awards', type=int, help="Awards per student (default: no limit)")
+    parser.add_argument('--capacities', help="CSV of scholarship_id,capacity overriding candidate_count")
+    parser.add_argument('--output', default=os.path.join(ALLOCATIONS_DIR, 'allocation.csv'))
+    args = parser.parse_args()
+
+    plans = compile_ranking_corpus(get_scholarship_files())
+    roster = RosterIndex(read_roster(args.roster))
+    overrides = read_capacities(args.capacities) if args.capacities else None
+    result = allocate(plans, roster, args.max_awards, overrides)
+    awards = result.pop('awards')
+    write_allocation(awards, args.output)
+
+    print(f"Allocated {len(awards)} of {result['slots']} award slots across {result['scholarships']} scholarships "
+          f"to {result['students_awarded']} of {roster.size} students")
+    print(f"  {result['eligible_pairs']:,} eligible pairs, built in {result['build_seconds']:.2f} s, "
+          f"solved in {result['solve_seconds']:.2f} s")
+    if 'bids' in result:
+        print(f"  auction: {result['seats']} seats, {result['bids']:,} bids, {result['scans']:,} full scans "
+              f"in {result['auction_seconds']:.2f} s; {result['swaps']} swaps and {result['cycles_canceled']} cycles "
+              f"canceled, {'proved optimal' if result['optimal'] else 'NOT proved optimal'}")
+    print(f"  total weight {result['total_weight']:,} → {args.output}")
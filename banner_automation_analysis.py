@@ -1,21 +1,37 @@
 #!/usr/bin/env python3
 """
 Banner Automation Analysis
-Analyzes all scholarships to provide insights into Banner automation potential
+Analyzes all scholarships to provide insights into Banner automation potential.
+Reads the automation view in derived_data, which processing keeps current.
 """
 
-import json
-import glob
-from collections import defaultdict, Counter
+from collections import Counter
+from typing import Dict, List, Optional
 
-def analyze_banner_automation():
+from corpus_storage import logical_name
+from derived_artifacts import build_automation_entry, load_automation_view, load_scholarships
+
+def automation_entries(json_files: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Automation view entries: read from derived_data when analyzing the default corpus,
+    built from the given files otherwise
+    """
+    if json_files is None:
+        return sorted(load_automation_view().values(), key=lambda entry: entry['file'])
+    
+    entries = []
+    for json_file, scholarship in zip(json_files, load_scholarships(json_files)):
+        if scholarship is not None:
+            entries.append(build_automation_entry(scholarship, logical_name(json_file)))
+    return entries
+
+def analyze_banner_automation(json_files: Optional[List[str]] = None):
     """
     Analyze all scholarship files for Banner automation potential
     """
-    json_files = glob.glob('/Users/Nayan/Documents/UCO-Foundation/Python/Scholarship_info_website/scholarship_json_files/*.json')
-    json_files = [f for f in json_files if not f.endswith('file-list.json')]
+    entries = automation_entries(json_files)
     
-    print(f"Analyzing {len(json_files)} scholarships for Banner automation potential...\n")
+    print(f"Analyzing {len(entries)} scholarships for Banner automation potential...\n")
     
     # Statistics tracking
     total_scholarships = 0
@@ -28,87 +44,18 @@ def analyze_banner_automation():
     fully_automatable = []  # All criteria can be checked via Banner
     partially_automatable = []  # Some criteria can be checked via Banner
     manual_only = []  # All criteria require manual review
+    by_class = {'fully': fully_automatable, 'partially': partially_automatable, 'manual_only': manual_only}
     
-    accessibility_breakdown = defaultdict(list)
-    criteria_types = Counter()
-    
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                scholarship = json.load(f)
-            
-            scholarship_name = scholarship['basic_information']['scholarship_name']
-            scholarship_id = scholarship['basic_information']['scholarship_id']
-            hard_criteria = scholarship.get('hard_criteria', {})
-            general_criteria = scholarship.get('general_criteria', {})
-            
-            # Count criteria from both hard and general criteria
-            total_hard_criteria = len(hard_criteria.get('criteria', []))
-            total_general_criteria = len(general_criteria.get('criteria', []))
-            
-            if not total_hard_criteria and not total_general_criteria:
-                continue
-                
-            total_scholarships += 1
-            scholarship_criteria = total_hard_criteria + total_general_criteria
-            total_criteria += scholarship_criteria
-            
-            banner_count = 0
-            app_count = 0
-            manual_count = 0
-            
-            # Process hard criteria
-            for criteria in hard_criteria.get('criteria', []):
-                accessibility = criteria.get('banner_accessibility', 'manual_review')
-                criteria_types[accessibility] += 1
-                
-                if accessibility == 'banner_accessible':
-                    banner_count += 1
-                    banner_accessible_count += 1
-                elif accessibility == 'application_required':
-                    app_count += 1
-                    application_required_count += 1
-                else:
-                    manual_count += 1
-                    manual_review_count += 1
-            
-            # Process general criteria (soft requirements)
-            for criteria in general_criteria.get('criteria', []):
-                accessibility = criteria.get('banner_accessibility', 'manual_review')
-                criteria_types[accessibility] += 1
-                
-                if accessibility == 'banner_accessible':
-                    banner_count += 1
-                    banner_accessible_count += 1
-                elif accessibility == 'application_required':
-                    app_count += 1
-                    application_required_count += 1
-                else:
-                    manual_count += 1
-                    manual_review_count += 1
-            
-            # Categorize scholarships by automation potential
-            automation_percentage = (banner_count / scholarship_criteria) * 100
-            
-            scholarship_info = {
-                'id': scholarship_id,
-                'name': scholarship_name,
-                'total_criteria': scholarship_criteria,
-                'banner_accessible': banner_count,
-                'application_required': app_count,
-                'manual_review': manual_count,
-                'automation_percentage': automation_percentage
-            }
-            
-            if banner_count == scholarship_criteria:
-                fully_automatable.append(scholarship_info)
-            elif banner_count > 0:
-                partially_automatable.append(scholarship_info)
-            else:
-                manual_only.append(scholarship_info)
-                
-        except Exception as e:
-            print(f"Error processing {json_file}: {e}")
+    for entry in entries:
+        if entry['automation_class'] is None:
+            continue
+        
+        total_scholarships += 1
+        total_criteria += entry['total_criteria']
+        banner_accessible_count += entry['banner_accessible']
+        application_required_count += entry['application_required']
+        manual_review_count += entry['manual_review']
+        by_class[entry['automation_class']].append(entry)
     
     # Generate report
     print("=" * 80)
@@ -162,41 +109,9 @@ def analyze_banner_automation():
     # Banner field usage analysis
     print(f"\n🔧 BANNER FIELD USAGE ANALYSIS")
     print("-" * 60)
-    banner_fields = defaultdict(int)
-    
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                scholarship = json.load(f)
-            
-            # Check both hard and general criteria
-            for criteria_section in ['hard_criteria', 'general_criteria']:
-                criteria_data = scholarship.get(criteria_section, {})
-                for criteria in criteria_data.get('criteria', []):
-                    if criteria.get('banner_accessibility') == 'banner_accessible':
-                        description = criteria.get('description', '')
-                        if 'SIS_Major' in description:
-                            banner_fields['Major Requirements'] += 1
-                        if 'SIS_Minor' in description:
-                            banner_fields['Minor Requirements'] += 1
-                        if 'SIS_Classification' in description:
-                            banner_fields['Classification Requirements'] += 1
-                        if 'SIS_CumGPA' in description:
-                            banner_fields['Cumulative GPA Requirements'] += 1
-                        if 'SIS_MajorGPA' in description:
-                            banner_fields['Major GPA Requirements'] += 1
-                        if 'SIS_Enrolled HRS' in description or 'SIS_Enrolled_HRS' in description:
-                            banner_fields['Enrolled Hours Requirements'] += 1
-                        if 'SIS_College' in description:
-                            banner_fields['College Requirements'] += 1
-                        if 'SIS_Resident' in description:
-                            banner_fields['Residency Requirements'] += 1
-                        if 'SIS_Hours' in description and 'Enrolled' not in description:
-                            banner_fields['Credit Hours Requirements'] += 1
-                        if 'SIS_Level' in description:
-                            banner_fields['Academic Level Requirements'] += 1
-        except:
-            continue
+    banner_fields = Counter()
+    for entry in entries:
+        banner_fields.update(entry['banner_field_usage'])
     
     for field, count in sorted(banner_fields.items(), key=lambda x: x[1], reverse=True):
         print(f"{field}: {count} scholarships")
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Banner Roster I/O
+Reads and writes Banner student extracts (CSV) using the columns listed in
+banner_data_reference.md
+"""
+
+import csv
+from typing import Dict, Iterable, Iterator, List
+
+ROSTER_COLUMNS = [
+    'Term Code', 'Term', 'PIDM', 'ID', 'First Name', 'Last Name', 'Gender', 'Hispanic/Latino Flag',
+    'Term Hours Enrolled', 'Term Hours Billed', 'Residency', 'Sport Code', 'High School',
+    'Level', 'Classification',
+    'College 1', 'Major Code 1', 'Major 1',
+    'College 2', 'Major Code 2', 'Major 2',
+    'College Code 3', 'Major Code 3', 'Major 3',
+    'Minor Code 1', 'Minor 1', 'Minor Code 2', 'Minor 2', 'Minor Code 3', 'Minor 3',
+    'Term Admitted', 'Admission Type', 'Transfer Hours', 'Cumulative Hours', 'Cumulative GPA',
+    'Unmet Need', 'FAFSA', 'UCO Email'
+]
+
+NUMERIC_COLUMNS = ['Term Hours Enrolled', 'Term Hours Billed', 'Transfer Hours', 'Cumulative Hours',
+                   'Cumulative GPA', 'Unmet Need']
+
+def read_roster(csv_path: str) -> List[Dict[str, str]]:
+    """
+    Load a Banner extract as a list of row dicts keyed by column name
+    """
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        return list(csv.DictReader(f))
+
+def iter_roster(csv_path: str) -> Iterator[Dict[str, str]]:
+    """
+    Stream a Banner extract one row dict at a time, for rosters too large to load
+    """
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        yield from csv.DictReader(f)
+
+def write_roster(csv_path: str, rows: Iterable[Dict[str, str]]):
+    """
+    Write rows as a Banner extract with the standard column order
+    """
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=ROSTER_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
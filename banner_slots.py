@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Banner Slot Tables
+Banner exports majors, minors and colleges as three numbered slots each (Major 1/2/3,
+Minor 1/2/3, College 1/2/College Code 3), while criteria name them through SIS
+variants (SIS_Major, SIS_Major_2, SIS_Major_1_2, SIS_Major_2_2, ...):
+- explode_slots turns the slot columns of a roster into one long table per family,
+  (student, slot, code) rows with every value dictionary-encoded once
+- SLOT_VARIANTS maps each SIS variant to its family and the slots it covers
+- SlotIndex joins the long table into code → student bitset per slot plus the union
+  over all slots, so "any slot holds this value" is one lookup instead of a check
+  per slot column; the same per-student view (value → slots held) serves
+  single-student checks
+
+    python banner_slots.py roster.csv      # slot fill and distinct values per family
+"""
+
+import sys
+from array import array
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from bitsets import mask_from_ranks
+
+SLOT_FAMILIES = {
+    'Major': ('Major 1', 'Major 2', 'Major 3'),
+    'Minor': ('Minor 1', 'Minor 2', 'Minor 3'),
+    'College': ('College 1', 'College 2', 'College Code 3'),
+}
+ALL_SLOTS = (1, 2, 3)
+
+# SIS variant → (family, slots it covers). The corpus repeats each major/minor/college
+# condition across every variant of one OR and banner_data_reference.md maps each field
+# to all three Banner slots, so today every variant covers every slot; a narrower
+# reading of a variant is a change to this table only.
+SLOT_VARIANTS: Dict[str, Tuple[str, Tuple[int, ...]]] = {
+    'SIS_Major': ('Major', ALL_SLOTS),
+    'SIS_Major_2': ('Major', ALL_SLOTS),
+    'SIS_Major_1_2': ('Major', ALL_SLOTS),
+    'SIS_Major_2_2': ('Major', ALL_SLOTS),
+    'SIS_Minor': ('Minor', ALL_SLOTS),
+    'SIS_Minor_2': ('Minor', ALL_SLOTS),
+    'SIS_Minor_1_2': ('Minor', ALL_SLOTS),
+    'SIS_Minor_2_2': ('Minor', ALL_SLOTS),
+    'SIS_College': ('College', ALL_SLOTS),
+    'SIS_College_2': ('College', ALL_SLOTS),
+}
+
+def variant_columns(field: str) -> Tuple[str, ...]:
+    """
+    Banner columns behind one SIS slot variant, in slot order
+    """
+    family, slots = SLOT_VARIANTS[field]
+    return tuple(SLOT_FAMILIES[family][slot - 1] for slot in slots)
+
+def slot_bits(slots: Iterable[int]) -> int:
+    """
+    Slots as a small bitset: bit (slot - 1) for every slot covered
+    """
+    bits = 0
+    for slot in slots:
+        bits |= 1 << (slot - 1)
+    return bits
+
+SLOT_COLUMNS = {column: (family, slot) for family, columns in SLOT_FAMILIES.items()
+                for slot, column in enumerate(columns, 1)}
+# SIS variant → (family, slot bitset), for checking one student's student_slots
+SLOT_VARIANT_BITS = {field: (family, slot_bits(slots)) for field, (family, slots) in SLOT_VARIANTS.items()}
+
+class SlotTable:
+    """
+    Long-format slot values of one family: row i is (students[i], slots[i], codes[i]),
+    and values[code] is the normalized value a code stands for
+    """
+
+    def __init__(self, family: str):
+        self.family = family
+        self.students = array('I')
+        self.slots = array('B')
+        self.codes = array('I')
+        self.values: List[str] = []
+        self.code_of: Dict[str, int] = {}
+
+    def append(self, student: int, slot: int, value: str):
+        code = self.code_of.get(value)
+        if code is None:
+            code = self.code_of[value] = len(self.values)
+            self.values.append(value)
+        self.students.append(student)
+        self.slots.append(slot)
+        self.codes.append(code)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+def explode_slots(rows: Iterable[Dict[str, str]], normalize: Callable[[str], str]) -> Dict[str, SlotTable]:
+    """
+    One long table per slot family; empty slots produce no row
+    """
+    tables = {family: SlotTable(family) for family in SLOT_FAMILIES}
+    families = [(tables[family], list(enumerate(columns, 1))) for family, columns in SLOT_FAMILIES.items()]
+    for student, row in enumerate(rows):
+        for table, columns in families:
+            for slot, column in columns:
+                value = row.get(column)
+                if value:
+                    table.append(student, slot, normalize(value))
+    return tables
+
+class SlotIndex:
+    """
+    Student bitsets of one family joined from its long table: per code, one mask per
+    slot and the union over all slots
+    """
+
+    def __init__(self, table: SlotTable, size: int):
+        self.family = table.family
+        self.code_of = table.code_of
+        self.values = table.values
+        groups: Dict[Tuple[int, int], List[int]] = {}
+        for student, slot, code in zip(table.students, table.slots, table.codes):
+            groups.setdefault((code, slot), []).append(student)
+
+        self.by_slot: List[List[int]] = [[0] * len(ALL_SLOTS) for _ in table.values]
+        for (code, slot), students in groups.items():
+            self.by_slot[code][slot - 1] = mask_from_ranks(students, size)
+        self.any_slot = [masks[0] | masks[1] | masks[2] for masks in self.by_slot]
+
+    def mask(self, value: str, slots: Tuple[int, ...] = ALL_SLOTS) -> int:
+        """
+        Students holding value in any of the given slots
+        """
+        code = self.code_of.get(value)
+        if code is None:
+            return 0
+        if slots == ALL_SLOTS:
+            return self.any_slot[code]
+        mask = 0
+        for slot in slots:
+            mask |= self.by_slot[code][slot - 1]
+        return mask
+
+    def column_values(self, slot: int) -> Dict[str, int]:
+        """
+        value → bitset for one slot column, as RosterIndex keeps its other text columns
+        """
+        return {value: masks[slot - 1] for value, masks in zip(self.values, self.by_slot) if masks[slot - 1]}
+
+def student_slots(row: Dict[str, str], normalize: Callable[[str], str]) -> Dict[str, Dict[str, int]]:
+    """
+    One student's slot values per family: value → bitset of the slots holding it
+    """
+    families = {}
+    for family, columns in SLOT_FAMILIES.items():
+        held: Dict[str, int] = {}
+        for slot, column in enumerate(columns, 1):
+            value = row.get(column)
+            if value:
+                value = normalize(value)
+                held[value] = held.get(value, 0) | 1 << (slot - 1)
+        families[family] = held
+    return families
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python banner_slots.py ROSTER.csv")
+        sys.exit(1)
+
+    from banner_roster import read_roster
+    from eligibility_engine import normalize_text
+
+    rows = read_roster(sys.argv[1])
+    for family, table in explode_slots(rows, normalize_text).items():
+        filled = [0] * len(ALL_SLOTS)
+        for slot in table.slots:
+            filled[slot - 1] += 1
+        print(f"{family:<8} {len(table):>8} slot values from {len(rows)} students, {len(table.values)} distinct; "
+              f"filled per slot: {', '.join(f'{slot}: {count}' for slot, count in zip(ALL_SLOTS, filled))}")
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Times the processing pipeline and analysis scripts against a synthetic corpus
+and synthetic Banner rosters (see synthetic_data.py), then saves the results as
+JSON under benchmark_results/ so runs can be compared across commits:
+
+    python benchmark_suite.py                      # run everything, save results
+    python benchmark_suite.py --only categorize    # run benchmarks whose name contains "categorize"
+    python benchmark_suite.py --compare OLD.json NEW.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from award_allocation import allocate
+from banner_roster import read_roster
+from candidate_ranking import compile_ranking_corpus, rank_candidates
+from catalog_index import CatalogIndex
+from corpus_storage import CODECS, convert_directory, list_files, read_text, read_texts
+from derived_artifacts import rebuild_all, update_artifacts
+from eligibility_engine import RosterIndex, compile_corpus, evaluate_roster, evaluate_student
+from banner_automation_analysis import analyze_banner_automation
+from fully_automatable_analysis import analyze_fully_automatable_scholarships
+import json_backend
+from improved_processor import (categorize_banner_accessibility, get_scholarship_files, parse_sis_criteria,
+                                process_scholarship_json, update_all_scholarships)
+from near_miss import find_near_misses
+from predicate_ordering import PredicateStatistics, order_plans
+from synthetic_data import ROSTER_SCALES, generate_corpus, generate_rosters
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_results')
+
+# Registered benchmarks as (name, unit, setup), where setup(context) returns (run, items per run)
+BENCHMARKS: List[Tuple[str, str, Callable]] = []
+
+def benchmark(name: str, unit: str):
+    """
+    Register a benchmark. The decorated setup function receives the shared
+    context and returns a zero-argument callable plus the items it handles per run.
+    """
+    def register(setup: Callable) -> Callable:
+        BENCHMARKS.append((name, unit, setup))
+        return setup
+    return register
+
+def load_criteria(json_files: List[str]) -> List[Dict]:
+    criteria = []
+    for json_file in json_files:
+        scholarship = json.loads(read_text(json_file))
+        for section in ['hard_criteria', 'general_criteria']:
+            criteria.extend(scholarship.get(section, {}).get('criteria', []))
+    return criteria
+
+@benchmark('parse_sis_criteria', 'criteria')
+def bench_parse_sis_criteria(context: Dict):
+    descriptions = [c['description'] for c in context['criteria'] if 'SIS_' in c['description']]
+    def run():
+        for description in descriptions:
+            parse_sis_criteria(description)
+    return run, len(descriptions)
+
+@benchmark('categorize_banner_accessibility', 'criteria')
+def bench_categorize(context: Dict):
+    pairs = [(c.get('type', ''), c['description']) for c in context['criteria']]
+    def run():
+        for criteria_type, description in pairs:
+            categorize_banner_accessibility(criteria_type, description)
+    return run, len(pairs)
+
+@benchmark('process_scholarship_json', 'files')
+def bench_process_scholarship_json(context: Dict):
+    json_files = context['json_files']
+    def run():
+        for json_file in json_files:
+            process_scholarship_json(json_file)
+    return run, len(json_files)
+
+@benchmark('update_all_scholarships', 'files')
+def bench_update_all_scholarships(context: Dict):
+    json_files = context['json_files']
+    return (lambda: update_all_scholarships(json_files)), len(json_files)
+
+@benchmark('analyze_banner_automation', 'files')
+def bench_analyze_banner_automation(context: Dict):
+    json_files = context['json_files']
+    return (lambda: analyze_banner_automation(json_files)), len(json_files)
+
+@benchmark('analyze_fully_automatable_scholarships', 'files')
+def bench_analyze_fully_automatable(context: Dict):
+    json_files = context['json_files']
+    return (lambda: analyze_fully_automatable_scholarships(json_files)), len(json_files)
+
+@benchmark('automation_view_update', 'files')
+def bench_automation_view_update(context: Dict):
+    # One scholarship changed: the automation view and index are updated, not rebuilt
+    derived_dir = os.path.join(context['work_dir'], 'derived_data')
+    rebuild_all(context['json_dir'], derived_dir)
+    changed = context['json_files'][:1]
+    return (lambda: update_artifacts(changed, (), context['json_dir'], derived_dir)), len(changed)
+
+@contextlib.contextmanager
+def json_backend_selected(backend: str):
+    previous = json_backend.BACKEND
+    json_backend.set_backend(backend)
+    try:
+        yield
+    finally:
+        json_backend.set_backend(previous)
+
+def register_json_benchmarks():
+    for backend in json_backend.BACKENDS:
+        if json_backend.available_backend(backend) != backend:
+            continue
+
+        @benchmark(f'json_decode_{backend}', 'files')
+        def bench_json_decode(context: Dict, backend=backend):
+            texts = read_texts(context['json_files'])
+            def run():
+                with json_backend_selected(backend):
+                    for text in texts:
+                        json_backend.loads(text)
+            return run, len(texts)
+
+        @benchmark(f'json_encode_{backend}', 'files')
+        def bench_json_encode(context: Dict, backend=backend):
+            documents = [json_backend.loads(text) for text in read_texts(context['json_files'])]
+            def run():
+                with json_backend_selected(backend):
+                    for document in documents:
+                        json_backend.dumps(document)
+            return run, len(documents)
+
+register_json_benchmarks()
+
+def register_storage_benchmarks():
+    for codec in [None] + list(CODECS):
+        for mode, workers in (('serial', 1), ('pooled', None)):
+            @benchmark(f"corpus_load_{codec or 'plain'}_{mode}", 'files')
+            def bench_corpus_load(context: Dict, codec=codec, workers=workers):
+                json_dir = os.path.join(context['work_dir'], f"corpus_{codec or 'plain'}")
+                if not os.path.isdir(json_dir):
+                    shutil.copytree(context['json_dir'], json_dir)
+                    convert_directory(json_dir, codec)
+                json_files = list_files(json_dir)
+                return (lambda: read_texts(json_files, workers)), len(json_files)
+
+register_storage_benchmarks()
+
+CATALOG_QUERIES = [
+    {},
+    {'college': 'CLA', 'type': 'gpa', 'sort': 'candidates'},
+    {'accessibility': 'banner_accessible', 'renewable': 'false', 'gpa_min': '2.5', 'gpa_max': '3.5'},
+    {'q': 'memorial', 'sort': 'complexity-desc'},
+]
+
+@benchmark('catalog_index_build', 'files')
+def bench_catalog_index_build(context: Dict):
+    json_files = context['json_files']
+    return (lambda: CatalogIndex.from_json_files(json_files)), len(json_files)
+
+@benchmark('catalog_query', 'queries')
+def bench_catalog_query(context: Dict):
+    catalog = CatalogIndex.from_json_files(context['json_files'])
+    def run():
+        for params in CATALOG_QUERIES:
+            catalog.query(params)
+    return run, len(CATALOG_QUERIES)
+
+def register_roster_benchmarks():
+    for scale in ROSTER_SCALES:
+        @benchmark(f'read_roster_{scale}x', 'students')
+        def bench_read_roster(context: Dict, scale=scale):
+            path = context['rosters'][scale]
+            return (lambda: read_roster(path)), context['roster_sizes'][scale]
+
+        @benchmark(f'evaluate_roster_{scale}x', 'students')
+        def bench_evaluate_roster(context: Dict, scale=scale):
+            rows = read_roster(context['rosters'][scale])
+            plans = compile_corpus(context['json_files'])
+            return (lambda: evaluate_roster(plans, RosterIndex(rows))), len(rows)
+
+        @benchmark(f'rank_candidates_{scale}x', 'students')
+        def bench_rank_candidates(context: Dict, scale=scale):
+            rows = read_roster(context['rosters'][scale])
+            plans = compile_ranking_corpus(context['json_files'])
+            return (lambda: rank_candidates(plans, RosterIndex(rows))), len(rows)
+
+        @benchmark(f'allocate_awards_{scale}x', 'students')
+        def bench_allocate_awards(context: Dict, scale=scale):
+            rows = read_roster(context['rosters'][scale])
+            plans = compile_ranking_corpus(context['json_files'])
+            return (lambda: allocate(plans, RosterIndex(rows), max_awards=1)), len(rows)
+
+        @benchmark(f'allocate_awards_2_{scale}x', 'students')
+        def bench_allocate_two_awards(context: Dict, scale=scale):
+            rows = read_roster(context['rosters'][scale])
+            plans = compile_ranking_corpus(context['json_files'])
+            return (lambda: allocate(plans, RosterIndex(rows), max_awards=2)), len(rows)
+
+        @benchmark(f'near_misses_{scale}x', 'students')
+        def bench_near_misses(context: Dict, scale=scale):
+            rows = read_roster(context['rosters'][scale])
+            plans = compile_corpus(context['json_files'])
+            return (lambda: find_near_misses(plans, RosterIndex(rows))), len(rows)
+
+register_roster_benchmarks()
+
+# Per-student checks are far slower than whole-roster evaluation, so they run on the 10x roster only
+PER_STUDENT_SCALE = 10
+
+@benchmark('per_student_file_order', 'students')
+def bench_per_student_file_order(context: Dict):
+    rows = read_roster(context['rosters'][PER_STUDENT_SCALE])
+    plans = compile_corpus(context['json_files'])
+    return (lambda: [evaluate_student(plans, row) for row in rows]), len(rows)
+
+@benchmark('per_student_cost_order', 'students')
+def bench_per_student_cost_order(context: Dict):
+    rows = read_roster(context['rosters'][PER_STUDENT_SCALE])
+    plans = order_plans(compile_corpus(context['json_files']), PredicateStatistics.from_rows(rows))
+    return (lambda: [evaluate_student(plans, row) for row in rows]), len(rows)
+
+def time_benchmark(run: Callable, repeat: int) -> List[float]:
+    """
+    Time repeat runs of a benchmark with its output suppressed
+    """
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    return timings
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except Exception:
+        return 'unknown'
+
+def build_context(work_dir: str, scale: float, seed: int) -> Dict:
+    """
+    Generate the synthetic corpus and rosters shared by all benchmarks
+    """
+    json_dir = os.path.join(work_dir, 'scholarship_json_files')
+    generate_corpus(json_dir, scale, seed)
+    rosters = generate_rosters(os.path.join(work_dir, 'rosters'), ROSTER_SCALES, seed)
+    json_files = get_scholarship_files(json_dir)
+    return {
+        'work_dir': work_dir,
+        'json_dir': json_dir,
+        'json_files': json_files,
+        'criteria': load_criteria(json_files),
+        'rosters': rosters,
+        'roster_sizes': {scale: len(read_roster(path)) for scale, path in rosters.items()}
+    }
+
+def run_benchmarks(scale: float = 1, repeat: int = 3, only: str = '', seed: int = 42) -> Dict:
+    """
+    Run the registered benchmarks and return a results document
+    """
+    work_dir = tempfile.mkdtemp(prefix='scholarship-bench-')
+    try:
+        context = build_context(work_dir, scale, seed)
+        results = {}
+        for name, unit, setup in BENCHMARKS:
+            if only and only not in name:
+                continue
+            run, items = setup(context)
+            timings = time_benchmark(run, repeat)
+            best = min(timings)
+            results[name] = {
+                'unit': unit,
+                'items': items,
+                'repeat': repeat,
+                'best_seconds': best,
+                'median_seconds': statistics.median(timings),
+                'items_per_second': items / best if best else 0
+            }
+            print(f"{name:<42} {best * 1000:10.2f} ms  {results[name]['items_per_second']:12.0f} {unit}/s")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': scale,
+        'seed': seed,
+        'results': results
+    }
+
+def save_results(document: Dict, results_dir: str = RESULTS_DIR) -> str:
+    os.makedirs(results_dir, exist_ok=True)
+    stamp = document['timestamp'].replace(':', '').replace('-', '')
+    path = os.path.join(results_dir, f"{stamp}_{document['commit']}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    return path
+
+def compare_results(old_path: str, new_path: str):
+    """
+    Print per-benchmark speedups between two saved runs
+    """
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, 'r', encoding='utf-8') as f:
+        new = json.load(f)
+
+    print(f"Comparing {old['commit']} ({old['timestamp']}) → {new['commit']} ({new['timestamp']})")
+    print(f"{'BENCHMARK':<42} {'OLD ms':>10} {'NEW ms':>10} {'SPEEDUP':>8}")
+    for name, result in new['results'].items():
+        if name not in old['results']:
+            print(f"{name:<42} {'-':>10} {result['best_seconds'] * 1000:>10.2f} {'new':>8}")
+            continue
+        old_seconds = old['results'][name]['best_seconds']
+        speedup = old_seconds / result['best_seconds'] if result['best_seconds'] else 0
+        print(f"{name:<42} {old_seconds * 1000:>10.2f} {result['best_seconds'] * 1000:>10.2f} {speedup:>7.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scholarship pipeline on synthetic data")
+    parser.add_argument('--scale', type=float, default=1, help="Synthetic corpus size as a multiple of 671 scholarships")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', default='', help="Run only benchmarks whose name contains this text")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="Compare two saved result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_results(*args.compare)
+    else:
+        document = run_benchmarks(args.scale, args.repeat, args.only, args.seed)
+        print(f"\nResults saved to {save_results(document)}")
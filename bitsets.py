@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Bitset Helpers
+Sets of positions (scholarships in a sort order, students in a roster) are stored
+as Python ints, one bit per position, so set algebra runs as whole-int & | ~ ops.
+"""
+
+from typing import Iterable, Iterator, List
+
+def mask_from_ranks(ranks: Iterable[int], size: int) -> int:
+    """
+    Bitset with the given bit positions set, built in one pass
+    """
+    bitmap = bytearray((size + 7) // 8)
+    for rank in ranks:
+        bitmap[rank >> 3] |= 1 << (rank & 7)
+    return int.from_bytes(bitmap, 'little')
+
+def iter_bits(mask: int, start: int = 0) -> Iterator[int]:
+    """
+    Positions of the set bits in mask at or after start, lowest first
+    """
+    mask >>= start
+    while mask:
+        low = mask & -mask
+        yield start + low.bit_length() - 1
+        mask ^= low
+
+def bit_positions(mask: int) -> List[int]:
+    """
+    All set positions; faster than iter_bits for dense masks
+    """
+    positions = []
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+    for byte_index, byte in enumerate(data):
+        base = byte_index << 3
+        while byte:
+            low = byte & -byte
+            positions.append(base + low.bit_length() - 1)
+            byte ^= low
+    return positions
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Candidate Ranking
+Ranks the students who pass a scholarship's hard criteria by its general_criteria
+(soft requirements worth points) and keeps a shortlist per scholarship:
+- Soft criteria are compiled to the same SIS predicates as the hard criteria and
+  scored over the whole eligible bitset at once: students are split into score
+  levels (score → bitset) by one & / & ~ per criterion and level
+- Levels are read from the highest score down, each split again by cumulative GPA
+  band, until k = candidate_count × SHORTLIST_MULTIPLIER students are found, so
+  candidates come out already in rank order and the full ranked list of eligible
+  students is never built
+- Soft criteria Banner cannot answer (essays, letters, manual review) are reported
+  as unscored points for the committee
+
+    python candidate_ranking.py roster.csv                # write shortlists to derived_data/rankings
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import time
+from bisect import bisect_right
+from itertools import islice
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from banner_roster import read_roster
+from bitsets import iter_bits, mask_from_ranks
+from derived_artifacts import DERIVED_DIR, load_scholarships
+from eligibility_engine import Predicate, RosterIndex, ScholarshipPlan, compile_predicate, compile_scholarship, evaluate_plan
+from improved_processor import get_scholarship_files
+from schema_migrations import write_text_atomic
+
+RANKINGS_DIR = os.path.join(DERIVED_DIR, 'rankings')
+SHORTLISTS_FILE = 'shortlists.json'
+SHORTLIST_MULTIPLIER = 3
+DEFAULT_SHORTLIST_SIZE = 10
+GPA_COLUMN = 'Cumulative GPA'
+
+# Soft criteria list alternatives with "and" as often as "or" ("Classification is Junior and
+# SIS_Classification is Senior"), so conditions are grouped by field: any within a field, all across fields
+SOFT_CONDITION_SPLIT = re.compile(r'\s+(?:and|or)\s+(?=SIS_)')
+
+class SoftCriterion(NamedTuple):
+    criteria_id: Optional[int]
+    description: str
+    points: int
+    groups: Tuple[Tuple[Predicate, ...], ...]
+
+class RankingPlan(NamedTuple):
+    eligibility: ScholarshipPlan
+    candidate_count: int
+    shortlist_size: int
+    total_possible_points: int
+    soft_criteria: Tuple[SoftCriterion, ...]
+    unscored_points: int
+
+def compile_soft_criterion(criteria: Dict) -> Optional[SoftCriterion]:
+    """
+    A soft criterion is scored only if every condition in it is a Banner predicate
+    """
+    description = criteria.get('description', '')
+    if 'SIS_' not in description:
+        return None
+    by_field: Dict[str, List[Predicate]] = {}
+    for condition in SOFT_CONDITION_SPLIT.split(description.strip()):
+        predicate = compile_predicate(condition)
+        if predicate is None:
+            return None
+        by_field.setdefault(predicate.field, []).append(predicate)
+    points = criteria.get('points') or 0
+    return SoftCriterion(criteria.get('id'), description, points,
+                         tuple(tuple(dict.fromkeys(predicates)) for predicates in by_field.values()))
+
+def parse_candidate_count(candidate_count) -> int:
+    try:
+        return max(0, int(candidate_count or 0))
+    except (TypeError, ValueError):
+        return 0
+
+def shortlist_size(candidate_count: int) -> int:
+    return candidate_count * SHORTLIST_MULTIPLIER if candidate_count > 0 else DEFAULT_SHORTLIST_SIZE
+
+def compile_ranking_plan(scholarship: Dict) -> RankingPlan:
+    general = scholarship.get('general_criteria', {})
+    soft_criteria = []
+    unscored_points = 0
+    for criteria in general.get('criteria', []):
+        soft = compile_soft_criterion(criteria)
+        if soft is None:
+            unscored_points += criteria.get('points') or 0
+        elif soft.points:
+            # A 0-point criterion cannot change a score, so it is not scored at all
+            soft_criteria.append(soft)
+    candidate_count = parse_candidate_count(scholarship.get('basic_information', {}).get('candidate_count'))
+    return RankingPlan(
+        eligibility=compile_scholarship(scholarship),
+        candidate_count=candidate_count,
+        shortlist_size=shortlist_size(candidate_count),
+        total_possible_points=general.get('total_possible_points') or 0,
+        soft_criteria=tuple(soft_criteria),
+        unscored_points=unscored_points
+    )
+
+def compile_ranking_corpus(json_files: Iterable[str]) -> List[RankingPlan]:
+    return [compile_ranking_plan(scholarship) for scholarship in load_scholarships(json_files)
+            if scholarship is not None]
+
+def soft_criterion_mask(criterion: SoftCriterion, roster: RosterIndex) -> int:
+    mask = roster.all_mask
+    for predicates in criterion.groups:
+        group_mask = 0
+        for predicate in predicates:
+            group_mask |= roster.predicate_mask(predicate)
+        mask &= group_mask
+    return mask
+
+def score_levels(eligible: int, soft_criteria: Iterable[SoftCriterion], roster: RosterIndex) -> Dict[int, int]:
+    """
+    Split the eligible bitset by soft-criteria score: score → bitset of students with that score
+    """
+    levels = {0: eligible} if eligible else {}
+    for criterion in soft_criteria:
+        matched = soft_criterion_mask(criterion, roster) & eligible
+        if not matched:
+            continue
+        next_levels: Dict[int, int] = {}
+        for score, mask in levels.items():
+            hit = mask & matched
+            miss = mask & ~matched
+            if miss:
+                next_levels[score] = next_levels.get(score, 0) | miss
+            if hit:
+                next_levels[score + criterion.points] = next_levels.get(score + criterion.points, 0) | hit
+        levels = next_levels
+    return levels
+
+def gpa_bands(roster: RosterIndex) -> List[Tuple[float, int]]:
+    """
+    (cumulative GPA, bitset of students with it), highest GPA first; missing GPAs last as -1
+    """
+    values, ranks = roster.numbers[GPA_COLUMN]
+    bands = []
+    start = 0
+    while start < len(values):
+        end = bisect_right(values, values[start], start)
+        bands.append((values[start], mask_from_ranks(ranks[start:end], roster.size)))
+        start = end
+    bands.reverse()
+    missing = roster.all_mask & ~mask_from_ranks(ranks, roster.size)
+    if missing:
+        bands.append((-1.0, missing))
+    return bands
+
+def top_k(levels: Dict[int, int], k: int, bands: List[Tuple[float, int]]) -> List[Tuple[int, float, int]]:
+    """
+    Best k (score, gpa, roster position), best first. Levels are walked from the highest
+    score and each level by GPA band, so candidates arrive in rank order and the
+    walk stops as soon as k are found; earlier roster positions win remaining ties.
+    """
+    selected: List[Tuple[int, float, int]] = []
+    for score in sorted(levels, reverse=True):
+        level = levels[score]
+        for gpa, band in bands:
+            hits = level & band
+            if not hits:
+                continue
+            for position in islice(iter_bits(hits), k - len(selected)):
+                selected.append((score, gpa, position))
+            if len(selected) == k:
+                return selected
+            level &= ~band
+            if not level:
+                break
+    return selected
+
+def rank_candidates(plans: Iterable[RankingPlan], roster: RosterIndex) -> Dict[int, Dict]:
+    """
+    Shortlist of each scholarship with at least one eligible student
+    """
+    bands = gpa_bands(roster)
+    shortlists = {}
+    for plan in plans:
+        eligible = evaluate_plan(plan.eligibility, roster)
+        if not eligible:
+            continue
+        levels = score_levels(eligible, plan.soft_criteria, roster)
+        shortlists[plan.eligibility.scholarship_id] = {
+            'scholarship_id': plan.eligibility.scholarship_id,
+            'scholarship_name': plan.eligibility.name,
+            'college_code': plan.eligibility.college_code,
+            'eligible_count': eligible.bit_count(),
+            'total_possible_points': plan.total_possible_points,
+            'unscored_points': plan.unscored_points,
+            'candidates': [{'rank': position + 1,
+                            'student_id': roster.student_ids[rank],
+                            'score': score,
+                            'gpa': gpa if gpa >= 0 else None}
+                           for position, (score, gpa, rank) in enumerate(top_k(levels, plan.shortlist_size, bands))]
+        }
+    return shortlists
+
+def shortlists_by_college(shortlists: Dict[int, Dict]) -> Dict[str, List[Dict]]:
+    by_college: Dict[str, List[Dict]] = {}
+    for shortlist in shortlists.values():
+        by_college.setdefault(shortlist['college_code'], []).append(shortlist)
+    for college_shortlists in by_college.values():
+        college_shortlists.sort(key=lambda shortlist: shortlist['scholarship_name'])
+    return by_college
+
+def write_shortlists(shortlists: Dict[int, Dict], output_dir: str = RANKINGS_DIR) -> List[str]:
+    """
+    shortlists.json for every scholarship plus one CSV per college
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    written = [os.path.join(output_dir, SHORTLISTS_FILE)]
+    write_text_atomic(written[0], json.dumps([shortlists[key] for key in sorted(shortlists)], indent=2))
+
+    for college_code, college_shortlists in sorted(shortlists_by_college(shortlists).items()):
+        path = os.path.join(output_dir, f"{college_code}_shortlists.csv")
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['scholarship_id', 'scholarship_name', 'rank', 'student_id', 'score',
+                             'total_possible_points', 'unscored_points', 'gpa', 'eligible_count'])
+            for shortlist in college_shortlists:
+                for candidate in shortlist['candidates']:
+                    writer.writerow([shortlist['scholarship_id'], shortlist['scholarship_name'], candidate['rank'],
+                                     candidate['student_id'], candidate['score'], shortlist['total_possible_points'],
+                                     shortlist['unscored_points'], candidate['gpa'], shortlist['eligible_count']])
+        written.append(path)
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank eligible students by soft criteria and write shortlists")
+    parser.add_argument('roster', help="Banner extract CSV")
+    parser.add_argument('--output', default=RANKINGS_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    plans = compile_ranking_corpus(get_scholarship_files())
+    roster = RosterIndex(read_roster(args.roster))
+    prepared_at = time.perf_counter()
+    shortlists = rank_candidates(plans, roster)
+    ranked_at = time.perf_counter()
+
+    scored = sum(1 for plan in plans if plan.soft_criteria)
+    print(f"Ranked {roster.size} students for {len(shortlists)} scholarships "
+          f"({scored} with Banner-scorable soft criteria) in {(ranked_at - prepared_at) * 1000:.0f} ms")
+    for path in write_shortlists(shortlists, args.output):
+        print(f"  → {path}")
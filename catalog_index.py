@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Catalog Index
+In-memory query index over the processed scholarship corpus, so the website can
+ask the server for one page of filtered results instead of downloading every file:
+- Facet filters (college, committee, criteria type, accessibility, level, renewable,
+  progress status), GPA range and name/code text search
+- Facet counts computed with every other active filter applied
+- Precomputed sort orders with stable cursor pagination
+
+Every set of scholarships is a Python int used as a bitset. Each sort order keeps
+its own copy of the bitsets laid out in that order, so a page is simply the next
+`limit` set bits after the cursor.
+
+    python catalog_index.py "college=CLA" "type=gpa" "sort=candidates"
+"""
+
+import base64
+import hashlib
+import json
+import re
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bitsets import iter_bits, mask_from_ranks
+from derived_artifacts import load_scholarships
+from improved_processor import SCHOLARSHIP_JSON_DIR, get_scholarship_files
+
+FACETS = ('college', 'committee', 'type', 'accessibility', 'level', 'renewable', 'progress_status')
+
+# Sort name → (record field, descending); ties always break on scholarship id ascending
+SORT_ORDERS = {
+    'name': ('sort_name', False),
+    'name-desc': ('sort_name', True),
+    'id': ('id', False),
+    'id-desc': ('id', True),
+    'candidates': ('candidate_count', True),
+    'complexity': ('complexity', False),
+    'complexity-desc': ('complexity', True),
+}
+DEFAULT_SORT = 'name'
+DEFAULT_LIMIT = 12
+MAX_LIMIT = 100
+CARD_DESCRIPTION_CHARS = 151
+
+LEVEL_PATTERN = re.compile(r'SIS_Level is (\w+)')
+NUMBER_PATTERN = re.compile(r'(\d+\.?\d*)')
+
+def calculate_complexity_score(scholarship: Dict) -> int:
+    """
+    Same weighting as calculateComplexityScore in js/app.js
+    """
+    complexity = scholarship.get('hard_criteria', {}).get('criteria_count', 0) * 3
+    complexity += scholarship.get('general_criteria', {}).get('criteria_count', 0)
+    complexity += scholarship.get('conditional_criteria', {}).get('criteria_count', 0) * 2
+    for criteria in scholarship.get('hard_criteria', {}).get('criteria', []):
+        if criteria.get('banner_accessibility') == 'application_required':
+            complexity += 2
+        elif criteria.get('banner_accessibility') == 'manual_review':
+            complexity += 3
+    return complexity
+
+def build_catalog_record(scholarship: Dict) -> Dict:
+    """
+    Filterable fields plus the card fields the website needs to render one result
+    """
+    basic_info = scholarship.get('basic_information', {})
+    hard_criteria = scholarship.get('hard_criteria', {}).get('criteria', [])
+    general_criteria = scholarship.get('general_criteria', {})
+    renewable = scholarship.get('renewable_information', {}).get('is_renewable', False)
+    complexity = calculate_complexity_score(scholarship)
+
+    # The website's GPA filter compares the first number in each hard GPA criterion
+    gpa_values = [float(match.group(1)) for criteria in hard_criteria if criteria.get('type') == 'gpa'
+                  for match in [NUMBER_PATTERN.search(criteria.get('description', ''))] if match]
+    levels = {level.lower() for criteria in hard_criteria if criteria.get('type') == 'level'
+              for level in LEVEL_PATTERN.findall(criteria.get('description', ''))}
+
+    card = {
+        'basic_information': basic_info,
+        'renewable_information': {'is_renewable': renewable},
+        'hard_criteria': {'criteria_count': len(hard_criteria)},
+        'general_criteria': {'criteria_count': general_criteria.get('criteria_count', 0),
+                             'total_possible_points': general_criteria.get('total_possible_points', 0)},
+        'conditional_criteria': {'criteria_count': scholarship.get('conditional_criteria', {}).get('criteria_count', 0)},
+        'description': scholarship.get('description', '')[:CARD_DESCRIPTION_CHARS],
+        'progress_status': scholarship.get('progress_status', 'not-processed'),
+        'complexityScore': complexity,
+    }
+
+    name = basic_info.get('scholarship_name', '')
+    return {
+        'id': basic_info.get('scholarship_id'),
+        'sort_name': name.casefold(),
+        'search_text': f"{name} {basic_info.get('scholarship_code', '')}".lower(),
+        'candidate_count': basic_info.get('candidate_count', 0),
+        'complexity': complexity,
+        'gpa': max(gpa_values) if gpa_values else None,
+        'facets': {
+            'college': [basic_info.get('college_code') or 'GENERAL'],
+            'committee': [basic_info.get('committee_name', '')],
+            'type': sorted({criteria.get('type', 'unknown') for criteria in hard_criteria}),
+            'accessibility': sorted({criteria.get('banner_accessibility', 'unknown') for criteria in hard_criteria}),
+            'level': sorted(levels),
+            'renewable': ['true' if renewable else 'false'],
+            'progress_status': [card['progress_status']],
+        },
+        'card': card,
+    }
+
+def trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class OrderedIndex:
+    """
+    Bitsets for one sort order: bit i stands for the i-th record in that order
+    """
+
+    def __init__(self, records: List[Dict], field: str, descending: bool):
+        self.field = field
+        self.descending = descending
+        self.records = sorted(records, key=lambda record: record['id'])
+        self.records.sort(key=lambda record: record[field], reverse=descending)
+        self.rank_by_id = {record['id']: rank for rank, record in enumerate(self.records)}
+
+        facet_ranks: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in FACETS}
+        trigram_ranks: Dict[str, List[int]] = {}
+        for rank, record in enumerate(self.records):
+            for facet, values in record['facets'].items():
+                for value in values:
+                    facet_ranks[facet].setdefault(value, []).append(rank)
+            for gram in trigrams(record['search_text']):
+                trigram_ranks.setdefault(gram, []).append(rank)
+
+        size = len(self.records)
+        self.facets = {facet: {value: mask_from_ranks(ranks, size) for value, ranks in values.items()}
+                       for facet, values in facet_ranks.items()}
+        self.trigram_masks = {gram: mask_from_ranks(ranks, size) for gram, ranks in trigram_ranks.items()}
+
+        gpa_ranked = sorted((record['gpa'], rank) for rank, record in enumerate(self.records)
+                            if record['gpa'] is not None)
+        self.gpa_values = [gpa for gpa, _ in gpa_ranked]
+        self.gpa_ranks = [rank for _, rank in gpa_ranked]
+
+    def sort_key(self, record: Dict) -> Tuple:
+        return (record[self.field], record['id'])
+
+    def rank_after(self, key: Tuple) -> int:
+        """
+        Rank of the first record that sorts after key (binary search on the order)
+        """
+        low, high = 0, len(self.records)
+        while low < high:
+            middle = (low + high) // 2
+            value, record_id = self.sort_key(self.records[middle])
+            if self.descending:
+                after = value < key[0] or (value == key[0] and record_id > key[1])
+            else:
+                after = value > key[0] or (value == key[0] and record_id > key[1])
+            if after:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def gpa_mask(self, gpa_min: Optional[float], gpa_max: Optional[float]) -> int:
+        low = bisect_left(self.gpa_values, gpa_min) if gpa_min is not None else 0
+        high = bisect_right(self.gpa_values, gpa_max) if gpa_max is not None else len(self.gpa_values)
+        return mask_from_ranks(self.gpa_ranks[low:high], len(self.records))
+
+    def text_mask(self, text: str, all_mask: int) -> int:
+        text = text.lower()
+        if len(text) < 3:
+            return mask_from_ranks([rank for rank, record in enumerate(self.records)
+                                    if text in record['search_text']], len(self.records))
+
+        # Trigram candidates are a superset of the matches; confirm each with a substring check
+        candidates = all_mask
+        for gram in trigrams(text):
+            candidates &= self.trigram_masks.get(gram, 0)
+            if not candidates:
+                return 0
+        return mask_from_ranks([rank for rank in iter_bits(candidates)
+                                if text in self.records[rank]['search_text']], len(self.records))
+
+def encode_cursor(payload: Dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor: str) -> Dict:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def split_values(value) -> List[str]:
+    if value is None or value == '':
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value]
+    return [part for part in str(value).split(',') if part != '']
+
+class CatalogIndex:
+    """
+    Immutable query index over one version of the corpus
+    """
+
+    def __init__(self, records: Iterable[Dict]):
+        records = [record for record in records if record['id'] is not None]
+        self.size = len(records)
+        self.all_mask = (1 << self.size) - 1
+        self.orders = {name: OrderedIndex(records, field, descending)
+                       for name, (field, descending) in SORT_ORDERS.items()}
+
+        digest = hashlib.sha256()
+        for record in self.orders['id'].records:
+            digest.update(json.dumps(record['card'], sort_keys=True).encode('utf-8'))
+        self.version = digest.hexdigest()[:12]
+
+    @classmethod
+    def from_json_files(cls, json_files: Iterable[str]) -> 'CatalogIndex':
+        return cls([build_catalog_record(scholarship) for scholarship in load_scholarships(json_files)
+                    if scholarship is not None])
+
+    def facet_masks(self, order: OrderedIndex, status_overrides: Optional[Dict[int, str]]) -> Dict[str, Dict[str, int]]:
+        """
+        Facet bitsets for an order, with live progress statuses applied on top of the file values
+        """
+        if not status_overrides:
+            return order.facets
+        progress = order.facets['progress_status']
+        overridden: Dict[str, List[int]] = {}
+        for scholarship_id, status in status_overrides.items():
+            rank = order.rank_by_id.get(scholarship_id)
+            if rank is not None:
+                overridden.setdefault(status, []).append(rank)
+        cleared = ~mask_from_ranks([rank for ranks in overridden.values() for rank in ranks], self.size)
+        progress = {value: mask & cleared for value, mask in progress.items()}
+        for status, ranks in overridden.items():
+            progress[status] = progress.get(status, 0) | mask_from_ranks(ranks, self.size)
+        return {**order.facets, 'progress_status': progress}
+
+    def query(self, params: Dict, status_overrides: Optional[Dict[int, str]] = None) -> Dict:
+        """
+        Run one catalog query. params uses the /api/catalog query-string names:
+        facet names (comma-separated values are ORed), gpa_min, gpa_max, q, sort, cursor, limit.
+        """
+        start_time = time.perf_counter()
+        cursor = decode_cursor(params['cursor']) if params.get('cursor') else None
+        sort = cursor['sort'] if cursor else params.get('sort') or DEFAULT_SORT
+        if sort not in self.orders:
+            raise ValueError(f"Unknown sort order: {sort}")
+        limit = min(max(int(params.get('limit') or DEFAULT_LIMIT), 1), MAX_LIMIT)
+
+        order = self.orders[sort]
+        facets = self.facet_masks(order, status_overrides)
+
+        # One mask per active filter; facet counts leave out the facet's own filter
+        filters = {}
+        for facet in FACETS:
+            values = split_values(params.get(facet))
+            if values:
+                mask = 0
+                for value in values:
+                    mask |= facets[facet].get(value, 0)
+                filters[facet] = mask
+        gpa_min = float(params['gpa_min']) if params.get('gpa_min') not in (None, '') else None
+        gpa_max = float(params['gpa_max']) if params.get('gpa_max') not in (None, '') else None
+        if gpa_min is not None or gpa_max is not None:
+            filters['gpa'] = order.gpa_mask(gpa_min, gpa_max)
+        if params.get('q'):
+            filters['q'] = order.text_mask(params['q'], self.all_mask)
+
+        matched = self.all_mask
+        for mask in filters.values():
+            matched &= mask
+
+        facet_counts = {}
+        for facet in FACETS:
+            base = self.all_mask
+            for name, mask in filters.items():
+                if name != facet:
+                    base &= mask
+            facet_counts[facet] = {value: (mask & base).bit_count()
+                                   for value, mask in sorted(facets[facet].items()) if mask & base}
+
+        start_rank = self.resume_rank(order, cursor) if cursor else 0
+        ranks = []
+        for rank in iter_bits(matched, start_rank):
+            ranks.append(rank)
+            if len(ranks) == limit + 1:
+                break
+        has_more = len(ranks) > limit
+        ranks = ranks[:limit]
+
+        next_cursor = None
+        if has_more:
+            last = order.records[ranks[-1]]
+            next_cursor = encode_cursor({'sort': sort, 'version': self.version, 'rank': ranks[-1] + 1,
+                                         'key': [last[order.field], last['id']]})
+
+        items = []
+        for rank in ranks:
+            card = order.records[rank]['card']
+            if status_overrides and card['basic_information'].get('scholarship_id') in status_overrides:
+                card = {**card, 'progress_status': status_overrides[card['basic_information']['scholarship_id']]}
+            items.append(card)
+
+        return {
+            'total': matched.bit_count(),
+            'items': items,
+            'next_cursor': next_cursor,
+            'sort': sort,
+            'facets': facet_counts,
+            'version': self.version,
+            'took_ms': round((time.perf_counter() - start_time) * 1000, 3)
+        }
+
+    def resume_rank(self, order: OrderedIndex, cursor: Dict) -> int:
+        """
+        Where the next page starts. Within the same index version that is the stored rank;
+        after the corpus changed, it is the first record that sorts after the last one shown.
+        """
+        if cursor.get('version') == self.version:
+            return int(cursor['rank'])
+        return order.rank_after(tuple(cursor['key']))
+
+def load_catalog(json_dir: str = SCHOLARSHIP_JSON_DIR) -> CatalogIndex:
+    return CatalogIndex.from_json_files(get_scholarship_files(json_dir))
+
+if __name__ == "__main__":
+    build_start = time.perf_counter()
+    catalog = load_catalog()
+    print(f"Indexed {catalog.size} scholarships in {(time.perf_counter() - build_start) * 1000:.0f} ms "
+          f"(version {catalog.version})")
+
+    params = dict(arg.split('=', 1) for arg in sys.argv[1:])
+    result = catalog.query(params)
+    print(f"{result['total']} matches in {result['took_ms']} ms")
+    for item in result['items']:
+        basic_info = item['basic_information']
+        print(f"  {basic_info['scholarship_id']:>7}  {basic_info['scholarship_name']}")
+    for facet, counts in result['facets'].items():
+        print(f"  {facet}: {counts}")
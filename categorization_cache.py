@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Categorization Cache
+Persists criterion categorizations across runs so unchanged descriptions are never
+recategorized, even on a cold start:
+- Entries live in a small SQLite file, keyed by (description hash, rule-set version),
+  and hold the category, the rule that fired and the parse_sis_criteria result
+- The key includes RULESET_VERSION, which changes with any pattern list, so entries
+  from an older rule set never match; they are purged when the cache is opened
+- The whole cache is read into memory on open and new or used entries are written
+  back in one transaction on close; the least recently used are evicted beyond
+  max_entries
+
+    python categorization_cache.py            # categorize the corpus twice, cold and warm
+    python categorization_cache.py --clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, NamedTuple, Optional
+
+import corpus_storage
+import improved_processor
+from improved_processor import RULESET_VERSION, get_scholarship_files
+
+CACHE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'derived_data', 'categorization_cache.db')
+DEFAULT_MAX_ENTRIES = 50000
+# Bump when parse_sis_criteria or the entry layout changes; pattern lists are covered by RULESET_VERSION
+CACHE_FORMAT = 1
+CACHE_VERSION = f'{CACHE_FORMAT}:{RULESET_VERSION}'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categorizations (
+    description_hash TEXT NOT NULL,
+    version TEXT NOT NULL,
+    category TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    parsed_sis TEXT,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (description_hash, version)
+)
+"""
+
+class CachedCategorization(NamedTuple):
+    category: str
+    rule: str
+    parsed_sis: Optional[Dict]
+
+def description_hash(description: str) -> str:
+    """
+    Hash of the exact description: the rules are prefix-, spacing- and case-sensitive,
+    so any normalization beyond the text itself could merge descriptions that differ
+    """
+    return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+class CategorizationCache:
+    """
+    In-memory view of the on-disk cache for the current rule set
+    """
+
+    def __init__(self, db_path: str = CACHE_DB, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(SCHEMA)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS categorizations_last_used ON categorizations (last_used)')
+        # Entries of any other rule set can never be hit again
+        self.purged = self._conn.execute('DELETE FROM categorizations WHERE version != ?', (CACHE_VERSION,)).rowcount
+        rows = self._conn.execute('SELECT description_hash, category, rule, parsed_sis FROM categorizations')
+        self._entries: Dict[str, tuple] = {row[0]: row[1:] for row in rows}
+        self._used: Dict[str, tuple] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, description: str) -> Optional[CachedCategorization]:
+        key = description_hash(description)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used[key] = entry
+        category, rule, parsed_sis = entry
+        # Decoded on every hit, so callers never share one parsed_sis dict
+        return CachedCategorization(category, rule, json.loads(parsed_sis) if parsed_sis is not None else None)
+
+    def put(self, description: str, category: str, rule: str, parsed_sis: Optional[Dict]):
+        key = description_hash(description)
+        entry = (category, rule, json.dumps(parsed_sis) if parsed_sis is not None else None)
+        self._entries[key] = entry
+        self._used[key] = entry
+
+    def flush(self):
+        """
+        Write entries used or added since the last flush, then evict the least recently used
+        """
+        if not self._used:
+            return
+        now = time.time()
+        with self._conn:
+            self._conn.execute('BEGIN')
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO categorizations VALUES (?, ?, ?, ?, ?, ?)',
+                [(key, CACHE_VERSION, category, rule, parsed_sis, now)
+                 for key, (category, rule, parsed_sis) in self._used.items()])
+            self._conn.execute('DELETE FROM categorizations WHERE rowid IN (SELECT rowid FROM categorizations '
+                               'ORDER BY last_used DESC LIMIT -1 OFFSET ?)', (self.max_entries,))
+        self._used.clear()
+        if len(self._entries) > self.max_entries:
+            kept = {row[0] for row in self._conn.execute('SELECT description_hash FROM categorizations')}
+            self._entries = {key: entry for key, entry in self._entries.items() if key in kept}
+
+    def clear(self):
+        self._conn.execute('DELETE FROM categorizations')
+        self._entries.clear()
+        self._used.clear()
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def stats(self) -> Dict:
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses, 'purged': self.purged,
+                'version': CACHE_VERSION}
+
+@contextmanager
+def use_categorization_cache(db_path: str = CACHE_DB, max_entries: int = DEFAULT_MAX_ENTRIES):
+    """
+    Install a CategorizationCache for improve_criteria_parsing for the duration of the block
+    """
+    cache = CategorizationCache(db_path, max_entries)
+    previous = improved_processor.CATEGORIZATION_CACHE
+    improved_processor.CATEGORIZATION_CACHE = cache
+    try:
+        yield cache
+    finally:
+        improved_processor.CATEGORIZATION_CACHE = previous
+        cache.close()
+
+def categorize_corpus(json_files) -> int:
+    """
+    Run every criterion of the corpus through improve_criteria_parsing, in memory
+    """
+    count = 0
+    for text in corpus_storage.read_texts(json_files):
+        scholarship = json.loads(text)
+        for section in ('hard_criteria', 'general_criteria'):
+            for criteria in scholarship.get(section, {}).get('criteria', []):
+                improved_processor.improve_criteria_parsing(criteria)
+                count += 1
+    return count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Persistent categorization cache")
+    parser.add_argument('--db', default=CACHE_DB)
+    parser.add_argument('--max-entries', type=int, default=DEFAULT_MAX_ENTRIES)
+    parser.add_argument('--clear', action='store_true', help="Delete every cached entry")
+    args = parser.parse_args()
+
+    if args.clear:
+        cache = CategorizationCache(args.db, args.max_entries)
+        cache.clear()
+        cache.close()
+        print(f"Cleared {args.db}")
+    else:
+        json_files = get_scholarship_files()
+        start = time.perf_counter()
+        uncached = categorize_corpus(json_files)
+        uncached_seconds = time.perf_counter() - start
+        for run in ('first', 'second'):
+            start = time.perf_counter()
+            with use_categorization_cache(args.db, args.max_entries) as cache:
+                categorize_corpus(json_files)
+            print(f"{run} cached run: {time.perf_counter() - start:.2f} s {cache.stats()}")
+        print(f"uncached run: {uncached_seconds:.2f} s for {uncached} criteria")
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Categorizer Differential Runner
+Compares two versions of the categorizer and SIS parser (improved_processor.py)
+over the whole corpus, in memory, and reports what moved:
+- A version is a git revision, a path to an improved_processor.py, or WORKTREE
+  for the file on disk; each is loaded from source into its own module
+- Scholarships are split across worker processes; every criterion (hard and
+  general) is run through both versions' improve_criteria_parsing, and nothing
+  is ever written back to the JSON files
+- The result lists every changed criterion per scholarship (category, the rule
+  that fired, parsed_sis) plus aggregate from → to movement counts
+
+    python categorizer_diff.py                      # HEAD vs the working tree
+    python categorizer_diff.py --base HEAD~3 --head HEAD --json diff.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import types
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import corpus_storage
+import json_backend
+from improved_processor import SCHOLARSHIP_JSON_DIR, get_scholarship_files
+from schema_migrations import iter_batches
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+PROCESSOR_FILE = 'improved_processor.py'
+WORKTREE = 'WORKTREE'
+FILES_PER_TASK = 25
+CRITERIA_SECTIONS = ('hard_criteria', 'general_criteria')
+
+def version_source(spec: str) -> str:
+    """
+    Source of improved_processor.py for a version spec
+    """
+    if spec == WORKTREE:
+        spec = os.path.join(REPO_DIR, PROCESSOR_FILE)
+    if os.path.isfile(spec):
+        with open(spec, 'r', encoding='utf-8') as f:
+            return f.read()
+    result = subprocess.run(['git', 'show', f'{spec}:{PROCESSOR_FILE}'], capture_output=True, text=True, cwd=REPO_DIR)
+    if result.returncode != 0:
+        raise ValueError(f"Cannot load {PROCESSOR_FILE} at {spec!r}: {result.stderr.strip()}")
+    return result.stdout
+
+def load_version(spec: str, source: str) -> types.ModuleType:
+    """
+    Execute one version's source as a standalone module; it shares the current tree's
+    helpers (schema_migrations, pipeline_metrics) but none of its categorizer state
+    """
+    module = types.ModuleType(f'improved_processor[{spec}]')
+    module.__file__ = os.path.join(REPO_DIR, PROCESSOR_FILE)
+    exec(compile(source, f'{spec}:{PROCESSOR_FILE}', 'exec'), module.__dict__)
+    return module
+
+def categorize(version: types.ModuleType, criteria: Dict) -> Dict:
+    """
+    Category, rule and parsed_sis of one criterion under one version
+    """
+    improved = version.improve_criteria_parsing(criteria)
+    match_rule = getattr(version, 'match_banner_rule', None)
+    return {
+        'category': improved.get('banner_accessibility'),
+        # Older versions only return the category
+        'rule': match_rule(criteria.get('description', ''))[1] if match_rule else None,
+        'parsed_sis': improved.get('parsed_sis')
+    }
+
+# Worker process state: the two loaded versions
+VERSIONS: Dict[str, types.ModuleType] = {}
+
+def init_worker(sources: Dict[str, Tuple[str, str]]):
+    for side, (spec, source) in sources.items():
+        VERSIONS[side] = load_version(spec, source)
+
+def diff_files(json_files: List[str]) -> List[Dict]:
+    """
+    Worker task: per scholarship, criterion counts and every criterion whose result differs
+    """
+    results = []
+    for json_file in json_files:
+        scholarship = json_backend.loads(corpus_storage.read_text(json_file))
+        basic_info = scholarship.get('basic_information', {})
+        record = {'scholarship_id': basic_info.get('scholarship_id'),
+                  'scholarship_name': basic_info.get('scholarship_name', ''),
+                  'file': corpus_storage.logical_name(json_file), 'movements': Counter(), 'changes': []}
+        for section in CRITERIA_SECTIONS:
+            for position, criteria in enumerate(scholarship.get(section, {}).get('criteria', [])):
+                if 'description' not in criteria:
+                    continue
+                base = categorize(VERSIONS['base'], criteria)
+                head = categorize(VERSIONS['head'], criteria)
+                record['movements'][(base['category'], head['category'])] += 1
+                changed = [key for key in ('category', 'rule', 'parsed_sis') if base[key] != head[key]]
+                # A rule only counts as changed when both versions report one
+                if 'rule' in changed and (base['rule'] is None or head['rule'] is None):
+                    changed.remove('rule')
+                if changed:
+                    record['changes'].append({'section': section, 'position': position,
+                                              'criteria_id': criteria.get('id'),
+                                              'description': criteria['description'], 'changed': changed,
+                                              'base': base, 'head': head})
+        results.append(record)
+    return results
+
+def run_diff(base: str = 'HEAD', head: str = WORKTREE, json_dir: str = SCHOLARSHIP_JSON_DIR,
+             workers: Optional[int] = None) -> Dict:
+    """
+    Diff two versions over every scholarship in json_dir
+    """
+    sources = {'base': (base, version_source(base)), 'head': (head, version_source(head))}
+    json_files = get_scholarship_files(json_dir)
+    movements = Counter()
+    scholarships = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(sources,)) as executor:
+        for records in executor.map(diff_files, iter_batches(json_files, FILES_PER_TASK)):
+            for record in records:
+                movements.update(record.pop('movements'))
+                if record['changes']:
+                    scholarships.append(record)
+
+    moved = {f'{old} → {new}': count for (old, new), count in movements.most_common() if old != new}
+    return {
+        'base': base,
+        'head': head,
+        'scholarships_compared': len(json_files),
+        'criteria_compared': sum(movements.values()),
+        'criteria_changed': sum(len(record['changes']) for record in scholarships),
+        'scholarships_changed': len(scholarships),
+        'category_movements': moved,
+        'category_totals': {'base': dict(sum_by_category(movements, 0)), 'head': dict(sum_by_category(movements, 1))},
+        'scholarships': scholarships
+    }
+
+def sum_by_category(movements: Counter, side: int) -> Counter:
+    totals = Counter()
+    for pair, count in movements.items():
+        totals[pair[side]] += count
+    return totals
+
+def print_diff(diff: Dict, limit: int):
+    print(f"{diff['base']} → {diff['head']}: {diff['criteria_changed']} of {diff['criteria_compared']} criteria changed "
+          f"in {diff['scholarships_changed']} of {diff['scholarships_compared']} scholarships")
+    if diff['category_movements']:
+        print("Category movements:")
+        for movement, count in diff['category_movements'].items():
+            print(f"  {count:>6}  {movement}")
+    for category in sorted(set(diff['category_totals']['base']) | set(diff['category_totals']['head'])):
+        print(f"  {category}: {diff['category_totals']['base'].get(category, 0)} → "
+              f"{diff['category_totals']['head'].get(category, 0)}")
+    shown = 0
+    for record in diff['scholarships']:
+        if shown >= limit:
+            print(f"... {diff['scholarships_changed'] - shown} more scholarships (use --json for all)")
+            break
+        print(f"\n{record['scholarship_id']} {record['scholarship_name']}")
+        for change in record['changes']:
+            print(f"  [{change['section']} #{change['position']}] {change['description'][:70]}")
+            for key in change['changed']:
+                print(f"      {key}: {change['base'][key]} → {change['head'][key]}")
+        shown += 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Diff two categorizer/parser versions over the corpus, in memory")
+    parser.add_argument('--base', default='HEAD', help="git revision or path of the old improved_processor.py")
+    parser.add_argument('--head', default=WORKTREE, help="git revision, path, or WORKTREE (default)")
+    parser.add_argument('--json-dir', default=SCHOLARSHIP_JSON_DIR)
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--json', help="Write the full structured diff to this path")
+    parser.add_argument('--limit', type=int, default=20, help="Scholarships to print")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        diff = run_diff(args.base, args.head, args.json_dir, args.workers)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print_diff(diff, args.limit)
+    print(f"\nCompared in {time.perf_counter() - start:.2f} s")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(diff, f, indent=2, ensure_ascii=False)
+        print(f"Diff written to {args.json}")
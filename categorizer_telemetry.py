@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Categorizer Rule Telemetry
+Counts which categorization rules fire over a full-corpus run (in memory, no
+files are written back), how long each decision takes, how often criteria fall
+through to the default, and which scholarships changed category since the last
+recorded rule-set version. Replaces the per-string debug scripts:
+
+    python categorizer_telemetry.py                  # corpus table + rule-version diff
+    python categorizer_telemetry.py "SIS_Level is Undergraduate"   # trace one description
+"""
+
+import json
+import os
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+import improved_processor
+from corpus_storage import read_text
+from improved_processor import (APPLICATION_PATTERNS, BANNER_ACCESSIBLE_PATTERNS, MANUAL_REVIEW_PATTERNS,
+                                RULESET_VERSION, categorize_banner_accessibility, get_scholarship_files)
+
+RUNS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'derived_data', 'categorizer_runs')
+
+class CategorizerTelemetry:
+    """
+    Rule hit counters filled in by categorize_banner_accessibility while installed
+    """
+
+    def __init__(self):
+        self.hits = Counter()
+        self.seconds = Counter()
+        self.categories = Counter()
+        # Hits served by the categorization cache; they count as hits but were not timed
+        self.cached = Counter()
+
+    def record(self, rule: str, category: str, seconds: float, cached: bool = False):
+        self.hits[rule] += 1
+        self.seconds[rule] += seconds
+        self.categories[category] += 1
+        if cached:
+            self.cached[rule] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.hits.values())
+
+    @property
+    def fall_throughs(self) -> int:
+        return self.hits['default']
+
+    def unused_rules(self) -> List[str]:
+        """
+        Patterns that never fired (candidates for pruning)
+        """
+        rules = ([f'banner_prefix:{p}' for p in BANNER_ACCESSIBLE_PATTERNS] +
+                 [f'manual_review:{p}' for p in MANUAL_REVIEW_PATTERNS] +
+                 [f'application:{p}' for p in APPLICATION_PATTERNS])
+        return [rule for rule in rules if not self.hits[rule]]
+
+    def as_dict(self) -> Dict:
+        return {
+            'ruleset_version': RULESET_VERSION,
+            'total': self.total,
+            'fall_throughs': self.fall_throughs,
+            'categories': dict(self.categories),
+            'rules': {rule: {'hits': hits, 'cached': self.cached[rule], 'seconds': self.seconds[rule]}
+                      for rule, hits in self.hits.most_common()},
+            'unused_rules': self.unused_rules()
+        }
+
+@contextmanager
+def collect_telemetry():
+    """
+    Install a CategorizerTelemetry for the duration of the block
+    """
+    telemetry = CategorizerTelemetry()
+    previous = improved_processor.CATEGORIZER_TELEMETRY
+    improved_processor.CATEGORIZER_TELEMETRY = telemetry
+    try:
+        yield telemetry
+    finally:
+        improved_processor.CATEGORIZER_TELEMETRY = previous
+
+def categorize_corpus(json_files: Iterable[str]) -> Dict[str, str]:
+    """
+    Categorize every hard and general criterion in memory.
+    Returns {"<scholarship_id>:<section>:<criteria id>": category}.
+    """
+    assignments = {}
+    for json_file in json_files:
+        try:
+            scholarship = json.loads(read_text(json_file))
+        except Exception as e:
+            print(f"Error reading {json_file}: {e}")
+            continue
+
+        scholarship_id = scholarship.get('basic_information', {}).get('scholarship_id')
+        for section in ['hard_criteria', 'general_criteria']:
+            for criteria in scholarship.get(section, {}).get('criteria', []):
+                key = f"{scholarship_id}:{section}:{criteria.get('id')}"
+                assignments[key] = categorize_banner_accessibility(criteria.get('type', ''),
+                                                                   criteria.get('description', ''))
+    return assignments
+
+def save_run(assignments: Dict[str, str], runs_dir: str = RUNS_DIR) -> str:
+    """
+    Store this rule-set version's assignments for later comparison
+    """
+    os.makedirs(runs_dir, exist_ok=True)
+    path = os.path.join(runs_dir, f'{RULESET_VERSION}.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(assignments, f)
+    return path
+
+def load_previous_run(runs_dir: str = RUNS_DIR) -> Optional[Dict]:
+    """
+    Most recent saved run from a different rule-set version, if any
+    """
+    if not os.path.isdir(runs_dir):
+        return None
+    candidates = [os.path.join(runs_dir, name) for name in os.listdir(runs_dir)
+                  if name.endswith('.json') and name != f'{RULESET_VERSION}.json']
+    if not candidates:
+        return None
+    latest = max(candidates, key=os.path.getmtime)
+    with open(latest, 'r', encoding='utf-8') as f:
+        return {'version': os.path.basename(latest)[:-len('.json')], 'assignments': json.load(f)}
+
+def diff_runs(previous: Dict[str, str], current: Dict[str, str]) -> Dict[str, List[Dict]]:
+    """
+    Group criteria whose category changed between two runs by scholarship
+    """
+    changed = {}
+    for key, category in current.items():
+        old_category = previous.get(key)
+        if old_category is not None and old_category != category:
+            scholarship_id = key.split(':', 1)[0]
+            changed.setdefault(scholarship_id, []).append({'criteria': key, 'from': old_category, 'to': category})
+    return changed
+
+def print_table(telemetry: CategorizerTelemetry):
+    """
+    Print rule hits, share of decisions and decision time per rule
+    """
+    total = telemetry.total or 1
+    print(f"{'RULE':<48} {'HITS':>7} {'SHARE':>7} {'TOTAL ms':>9} {'AVG us':>8}")
+    print("-" * 83)
+    for rule, hits in telemetry.hits.most_common():
+        seconds = telemetry.seconds[rule]
+        timed = hits - telemetry.cached[rule]
+        average = f"{seconds / timed * 1e6:>8.2f}" if timed else f"{'-':>8}"
+        print(f"{rule[:48]:<48} {hits:>7} {hits / total * 100:>6.1f}% {seconds * 1000:>9.2f} {average}")
+    print("-" * 83)
+    print(f"Total decisions: {telemetry.total} ({sum(telemetry.cached.values())} from the categorization cache), "
+          f"default fall-throughs: {telemetry.fall_throughs}")
+    for category, count in telemetry.categories.most_common():
+        print(f"  {category}: {count}")
+
+    unused = telemetry.unused_rules()
+    if unused:
+        print(f"\nRules that never fired ({len(unused)}):")
+        for rule in unused:
+            print(f"  {rule}")
+
+def trace_description(description: str):
+    """
+    Show every pattern that matches a single description and the rule that wins
+    """
+    description_lower = description.lower()
+    print(f"Description: {description!r}")
+    print(f"Banner prefix matches: {[p for p in BANNER_ACCESSIBLE_PATTERNS if description.startswith(p)]}")
+    print(f"Manual review matches: {[p for p in MANUAL_REVIEW_PATTERNS if p in description_lower]}")
+    print(f"Application matches:   {[p for p in APPLICATION_PATTERNS if p.lower() in description_lower]}")
+    category, rule = improved_processor.match_banner_rule(description)
+    print(f"Result: {category} (rule {rule}, ruleset {RULESET_VERSION})")
+
+def run_corpus_telemetry(json_files: Optional[List[str]] = None, save: bool = True) -> Dict:
+    """
+    Categorize the corpus with telemetry on, print the table and the rule-version diff
+    """
+    if json_files is None:
+        json_files = get_scholarship_files()
+
+    with collect_telemetry() as telemetry:
+        assignments = categorize_corpus(json_files)
+
+    print("=" * 83)
+    print(f"CATEGORIZER RULE TELEMETRY (ruleset {RULESET_VERSION}, {len(json_files)} scholarships)")
+    print("=" * 83)
+    print_table(telemetry)
+
+    previous = load_previous_run()
+    changed = {}
+    if previous:
+        changed = diff_runs(previous['assignments'], assignments)
+        print(f"\nScholarships with category changes since ruleset {previous['version']}: {len(changed)}")
+        for scholarship_id, changes in sorted(changed.items()):
+            for change in changes:
+                print(f"  {change['criteria']}: {change['from']} → {change['to']}")
+
+    if save:
+        save_run(assignments)
+
+    report = telemetry.as_dict()
+    report['changed_scholarships'] = changed
+    return report
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for text in sys.argv[1:]:
+            trace_description(text)
+            print()
+    else:
+        run_corpus_telemetry()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Corpus Storage
+How scholarship files are found, read and written, in plain or compressed form:
+- A scholarship is stored as <id>.json, or compressed as <id>.json.gz (or .json.zst
+  when a zstd module is installed); every reader goes through read_text/read_bytes,
+  which decode by suffix, and write_bytes_atomic keeps whichever form a file has
+- list_files returns one path per scholarship, sorted by logical name (<id>.json);
+  a plain file wins over a compressed one, so the .gz siblings written by
+  `static_server.py --build` are never read twice
+- Bulk reads and writes run through a bounded thread pool (SCHOLARSHIP_IO_WORKERS,
+  default 8): zlib and file I/O release the GIL, so a cold corpus load overlaps
+  disk waits and decompression instead of blocking on one open at a time
+- `compress` rewrites the directory in compressed form and `decompress` restores it
+  byte for byte; file-list.json stays plain and lists logical names for the website
+
+    python corpus_storage.py stats                  # size on disk, cold and warm load times
+    python corpus_storage.py compress --codec gzip  # keep the corpus compressed
+    python corpus_storage.py decompress             # back to plain .json files
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+PLAIN_SUFFIX = '.json'
+MANIFEST_FILE = 'file-list.json'
+GZIP_LEVEL = 9
+ZSTD_LEVEL = 19
+DEFAULT_IO_WORKERS = 8
+IO_WORKERS = int(os.environ.get('SCHOLARSHIP_IO_WORKERS') or DEFAULT_IO_WORKERS)
+CHUNKS_PER_WORKER = 4
+
+def zstd_functions() -> Optional[Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]]:
+    """
+    (compress, decompress) from the stdlib zstd module (Python 3.14+) or the zstandard
+    package, or None when neither is installed
+    """
+    try:
+        from compression import zstd
+        return (lambda data: zstd.compress(data, ZSTD_LEVEL)), zstd.decompress
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return ((lambda data: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)),
+            (lambda data: zstandard.ZstdDecompressor().decompress(data)))
+
+# Codec name → (file suffix after .json, compress, decompress)
+CODECS: Dict[str, Tuple[str, Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    'gzip': ('.gz', lambda data: gzip.compress(data, GZIP_LEVEL, mtime=0), gzip.decompress),
+}
+_zstd = zstd_functions()
+if _zstd is not None:
+    CODECS['zstd'] = ('.zst', _zstd[0], _zstd[1])
+CODEC_BY_SUFFIX = {suffix: name for name, (suffix, _, _) in CODECS.items()}
+
+def codec_of(path: str) -> Optional[str]:
+    """
+    Codec a stored scholarship file is compressed with, or None for plain JSON
+    """
+    for suffix, name in CODEC_BY_SUFFIX.items():
+        if path.endswith(PLAIN_SUFFIX + suffix):
+            return name
+    return None
+
+def logical_name(path: str) -> str:
+    """
+    <id>.json for any stored form of a scholarship file
+    """
+    name = os.path.basename(path)
+    codec = codec_of(name)
+    return name[:-len(CODECS[codec][0])] if codec else name
+
+def stored_path(path: str, codec: Optional[str]) -> str:
+    """
+    Where a scholarship file lives in the given form, from any of its stored paths
+    """
+    base = os.path.join(os.path.dirname(path), logical_name(path))
+    return base + CODECS[codec][0] if codec else base
+
+def is_scholarship_file(name: str) -> bool:
+    if name.startswith('.') or logical_name(name) == MANIFEST_FILE:
+        return False
+    return name.endswith(PLAIN_SUFFIX) or codec_of(name) is not None
+
+def stored_entries(json_dir: str) -> Dict[str, os.DirEntry]:
+    """
+    Logical name → directory entry of the file to read, preferring plain JSON
+    """
+    entries: Dict[str, os.DirEntry] = {}
+    with os.scandir(json_dir) as scan:
+        for entry in scan:
+            if not is_scholarship_file(entry.name):
+                continue
+            name = logical_name(entry.name)
+            if name not in entries or entry.name == name:
+                entries[name] = entry
+    return entries
+
+def list_files(json_dir: str) -> List[str]:
+    if not os.path.isdir(json_dir):
+        return []
+    entries = stored_entries(json_dir)
+    return [entries[name].path for name in sorted(entries)]
+
+def encode_bytes(path: str, text: str) -> bytes:
+    """
+    The bytes to store for text at path: UTF-8, compressed when the suffix says so
+    """
+    data = text.encode('utf-8')
+    codec = codec_of(path)
+    return CODECS[codec][1](data) if codec else data
+
+def read_bytes(path: str) -> bytes:
+    """
+    The decoded (plain JSON) bytes of a stored file
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    codec = codec_of(path)
+    return CODECS[codec][2](data) if codec else data
+
+def read_text(path: str) -> str:
+    return read_bytes(path).decode('utf-8')
+
+def read_prefix(path: str, size: int) -> bytes:
+    """
+    The first size decoded bytes, without decompressing a whole gzip file
+    """
+    codec = codec_of(path)
+    if codec == 'gzip':
+        with gzip.open(path, 'rb') as f:
+            return f.read(size)
+    if codec is not None:
+        return read_bytes(path)[:size]
+    with open(path, 'rb') as f:
+        return f.read(size)
+
+def write_bytes_atomic(path: str, data: bytes):
+    """
+    Write to a temporary file in the same directory and swap it into place, so
+    readers never see a half-written file
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def map_files(func: Callable, items: Iterable, workers: Optional[int] = None) -> List:
+    """
+    func over items in a bounded thread pool, results in input order; items go to the
+    pool in contiguous chunks (a few per worker), so a corpus of small files does not
+    pay one future per file
+    """
+    items = list(items)
+    workers = min(workers or IO_WORKERS, len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+    size = -(-len(items) // (workers * CHUNKS_PER_WORKER))
+    chunks = [items[start:start + size] for start in range(0, len(items), size)]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='corpus-io') as executor:
+        return [result for results in executor.map(lambda chunk: [func(item) for item in chunk], chunks)
+                for result in results]
+
+def read_texts(paths: Iterable[str], workers: Optional[int] = None) -> List[str]:
+    return map_files(read_text, paths, workers)
+
+def write_texts(texts: Dict[str, str], workers: Optional[int] = None):
+    """
+    Atomically write {path: text}, each in the form its path names
+    """
+    map_files(lambda item: write_bytes_atomic(item[0], encode_bytes(item[0], item[1])), texts.items(), workers)
+
+def convert_directory(json_dir: str, codec: Optional[str], workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Rewrite every scholarship file in the given form (None for plain JSON); the
+    decoded bytes are unchanged, so converting back restores the original files
+    """
+    if codec is not None and codec not in CODECS:
+        raise ValueError(f"Unknown or unavailable codec {codec!r}; choose from {', '.join(CODECS)}")
+
+    def convert(path: str) -> bool:
+        target = stored_path(path, codec)
+        if target == path:
+            return False
+        data = read_bytes(path)
+        write_bytes_atomic(target, CODECS[codec][1](data) if codec else data)
+        # Drop the other stored forms, including a static-build .gz sibling of a plain file
+        for other in [stored_path(path, None)] + [stored_path(path, name) for name in CODECS]:
+            if other != target and os.path.exists(other):
+                os.remove(other)
+        return True
+
+    converted = map_files(convert, list_files(json_dir), workers)
+    return {'files': len(converted), 'converted': sum(converted)}
+
+def evict_from_page_cache(paths: Iterable[str]):
+    """
+    Drop files from the OS page cache so the next read is cold (Linux, no root needed)
+    """
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+def directory_stats(json_dir: str) -> Dict:
+    """
+    Bytes on disk and cold/warm load times of the corpus, serially and through the pool
+    """
+    paths = list_files(json_dir)
+    stored = sum(os.path.getsize(path) for path in paths)
+    timings = {}
+    for mode, workers in (('serial', 1), ('pooled', IO_WORKERS)):
+        for state in ('cold', 'warm'):
+            if state == 'cold' and hasattr(os, 'posix_fadvise'):
+                evict_from_page_cache(paths)
+            start = time.perf_counter()
+            texts = read_texts(paths, workers)
+            timings[f'{mode}_{state}_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return {'files': len(paths), 'codecs': sorted({codec_of(path) or 'plain' for path in paths}),
+            'stored_bytes': stored, 'json_bytes': sum(len(text.encode('utf-8')) for text in texts), **timings}
+
+if __name__ == "__main__":
+    from improved_processor import SCHOLARSHIP_JSON_DIR
+
+    parser = argparse.ArgumentParser(description="Plain or compressed storage of the scholarship corpus")
+    parser.add_argument('--json-dir', default=SCHOLARSHIP_JSON_DIR)
+    parser.add_argument('--workers', type=int, help=f"I/O threads (default {IO_WORKERS})")
+    commands = parser.add_subparsers(dest='command', required=True)
+    compress_parser = commands.add_parser('compress', help="Store every scholarship file compressed")
+    compress_parser.add_argument('--codec', default='gzip', help=f"One of: {', '.join(CODECS)}")
+    commands.add_parser('decompress', help="Store every scholarship file as plain JSON")
+    commands.add_parser('stats', help="Size on disk and load times")
+    args = parser.parse_args()
+
+    if args.workers:
+        IO_WORKERS = args.workers
+    try:
+        if args.command == 'stats':
+            stats = directory_stats(args.json_dir)
+            print(f"{stats['files']} files ({', '.join(stats['codecs'])}): {stats['stored_bytes'] / 1e6:.2f} MB on disk, "
+                  f"{stats['json_bytes'] / 1e6:.2f} MB of JSON")
+            for mode in ('serial', 'pooled'):
+                print(f"  {mode:<7} load: cold {stats[f'{mode}_cold_ms']:7.1f} ms, warm {stats[f'{mode}_warm_ms']:7.1f} ms")
+        else:
+            start = time.perf_counter()
+            counts = convert_directory(args.json_dir, args.codec if args.command == 'compress' else None, args.workers)
+            print(f"Converted {counts['converted']} of {counts['files']} files in {time.perf_counter() - start:.2f} s")
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Corpus Store
+Keeps one copy of the scholarship corpus per academic term without duplicating
+what carries over between terms:
+- Every scholarship file is split into blobs: each criteria block (hard, general,
+  conditional) and the metadata block are stored once under the SHA-256 of their
+  content, and the rest of the record points at them by hash
+- A term is just a manifest (file name → record hash), so a term that changed
+  ten scholarships adds ten records and their changed blocks, not a full copy
+- Importing hashes the raw file bytes first and only parses files never seen
+  before; term diffs compare hashes and only open records that differ
+- Exporting a term rebuilds its files byte for byte in the on-disk format
+
+    python corpus_store.py import 2025-26                  # snapshot scholarship_json_files
+    python corpus_store.py diff 2024-25 2025-26
+    python corpus_store.py export 2024-25 /tmp/corpus-2024-25
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import corpus_storage
+import json_backend
+from improved_processor import SCHOLARSHIP_JSON_DIR, get_scholarship_files
+from schema_migrations import encode_json, write_text_atomic
+
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'derived_data', 'corpus_store')
+OBJECTS_DIR = 'objects'
+TERMS_DIR = 'terms'
+FILE_INDEX = 'file_index.json'
+# Record sections stored as their own blobs
+BLOCK_KEYS = ('hard_criteria', 'general_criteria', 'conditional_criteria', 'metadata')
+BLOB_REF = '$blob'
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def blob_text(value) -> str:
+    """
+    Compact JSON that keeps key order, so exported files come back byte for byte
+    """
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+class CorpusStore:
+    """
+    Blobs under objects/ab/cdef….json, one manifest per term under terms/
+    """
+
+    def __init__(self, store_dir: str = STORE_DIR):
+        self.store_dir = store_dir
+        os.makedirs(os.path.join(store_dir, OBJECTS_DIR), exist_ok=True)
+        os.makedirs(os.path.join(store_dir, TERMS_DIR), exist_ok=True)
+        # sha256 of raw file bytes → (record hash, metadata.source_file), so unchanged files are never parsed twice
+        index_path = os.path.join(store_dir, FILE_INDEX)
+        self.file_index: Dict[str, List] = {}
+        if os.path.exists(index_path):
+            with open(index_path, 'r', encoding='utf-8') as f:
+                self.file_index = json.load(f)
+
+    def blob_path(self, blob_hash: str) -> str:
+        return os.path.join(self.store_dir, OBJECTS_DIR, blob_hash[:2], f'{blob_hash[2:]}.json')
+
+    def put_blob(self, value) -> Tuple[str, bool]:
+        """
+        Store a value once; returns (hash, whether it was new)
+        """
+        text = blob_text(value)
+        blob_hash = content_hash(text)
+        path = self.blob_path(blob_hash)
+        if os.path.exists(path):
+            return blob_hash, False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_text_atomic(path, text)
+        return blob_hash, True
+
+    def get_blob(self, blob_hash: str):
+        with open(self.blob_path(blob_hash), 'r', encoding='utf-8') as f:
+            return json_backend.loads(f.read())
+
+    def put_record(self, scholarship: Dict) -> Tuple[str, int]:
+        """
+        Split a scholarship into block blobs plus a record blob; returns (record hash, new blobs)
+        """
+        record = {}
+        new_blobs = 0
+        for key, value in scholarship.items():
+            if key in BLOCK_KEYS:
+                block_hash, new = self.put_blob(value)
+                record[key] = {BLOB_REF: block_hash}
+                new_blobs += new
+            else:
+                record[key] = value
+        record_hash, new = self.put_blob(record)
+        return record_hash, new_blobs + new
+
+    def get_record(self, record_hash: str, expand: bool = True) -> Dict:
+        record = self.get_blob(record_hash)
+        if expand:
+            for key, value in record.items():
+                if isinstance(value, dict) and BLOB_REF in value:
+                    record[key] = self.get_blob(value[BLOB_REF])
+        return record
+
+    def manifest_path(self, term: str) -> str:
+        return os.path.join(self.store_dir, TERMS_DIR, f'{term}.json')
+
+    def terms(self) -> List[str]:
+        return sorted(name[:-len('.json')] for name in os.listdir(os.path.join(self.store_dir, TERMS_DIR))
+                      if name.endswith('.json'))
+
+    def load_manifest(self, term: str) -> Dict:
+        path = self.manifest_path(term)
+        if not os.path.exists(path):
+            raise ValueError(f"No term {term!r} in {self.store_dir}")
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def import_term(self, term: str, json_dir: str = SCHOLARSHIP_JSON_DIR) -> Dict:
+        """
+        Snapshot a corpus directory as a term; only files not seen in any term are parsed
+        """
+        records: Dict[str, str] = {}
+        source_files = Counter()
+        parsed = new_blobs = 0
+        json_files = get_scholarship_files(json_dir)
+        # Hash the decoded JSON, so a term imported from a compressed corpus matches a plain one
+        for json_file, raw in zip(json_files, corpus_storage.map_files(corpus_storage.read_bytes, json_files)):
+            file_hash = hashlib.sha256(raw).hexdigest()
+            entry = self.file_index.get(file_hash)
+            if entry is None:
+                scholarship = json_backend.loads(raw)
+                record_hash, new = self.put_record(scholarship)
+                entry = [record_hash, (scholarship.get('metadata') or {}).get('source_file')]
+                self.file_index[file_hash] = entry
+                parsed += 1
+                new_blobs += new
+            records[corpus_storage.logical_name(json_file)] = entry[0]
+            source_files[entry[1]] += 1
+
+        manifest = {'term': term, 'imported_at': datetime.now().isoformat(timespec='seconds'),
+                    'json_dir': os.path.abspath(json_dir), 'source_files': dict(source_files), 'records': records}
+        write_text_atomic(self.manifest_path(term), json.dumps(manifest, indent=2, ensure_ascii=False))
+        write_text_atomic(os.path.join(self.store_dir, FILE_INDEX), json.dumps(self.file_index))
+        return {'term': term, 'files': len(records), 'parsed': parsed, 'new_blobs': new_blobs}
+
+    def diff_terms(self, old_term: str, new_term: str) -> Dict:
+        """
+        Files added, removed and changed between two terms; changed files list the
+        record fields and blocks whose hashes differ
+        """
+        old = self.load_manifest(old_term)['records']
+        new = self.load_manifest(new_term)['records']
+        changed = {}
+        for file_name in sorted(set(old) & set(new)):
+            if old[file_name] == new[file_name]:
+                continue
+            old_record = self.get_record(old[file_name], expand=False)
+            new_record = self.get_record(new[file_name], expand=False)
+            changed[file_name] = sorted(key for key in set(old_record) | set(new_record)
+                                        if old_record.get(key) != new_record.get(key))
+        return {
+            'old_term': old_term,
+            'new_term': new_term,
+            'added': sorted(set(new) - set(old)),
+            'removed': sorted(set(old) - set(new)),
+            'changed': changed,
+            'unchanged': sum(1 for file_name in set(old) & set(new) if old[file_name] == new[file_name])
+        }
+
+    def export_term(self, term: str, output_dir: str) -> Dict[str, int]:
+        """
+        Rebuild a term's scholarship files; files already holding the right bytes are left alone
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        counts = {'written': 0, 'unchanged': 0}
+        for file_name, record_hash in sorted(self.load_manifest(term)['records'].items()):
+            text = encode_json(self.get_record(record_hash))
+            path = os.path.join(output_dir, file_name)
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    if f.read() == text:
+                        counts['unchanged'] += 1
+                        continue
+            write_text_atomic(path, text)
+            counts['written'] += 1
+        return counts
+
+    def storage(self) -> Dict[str, int]:
+        blobs = size = 0
+        objects_dir = os.path.join(self.store_dir, OBJECTS_DIR)
+        for directory, _, file_names in os.walk(objects_dir):
+            for file_name in file_names:
+                blobs += 1
+                size += os.path.getsize(os.path.join(directory, file_name))
+        return {'blobs': blobs, 'bytes': size}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Content-addressed multi-term scholarship corpus store")
+    parser.add_argument('--store', default=STORE_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_parser = commands.add_parser('import', help="Snapshot a corpus directory as a term")
+    import_parser.add_argument('term')
+    import_parser.add_argument('--json-dir', default=SCHOLARSHIP_JSON_DIR)
+    diff_parser = commands.add_parser('diff', help="Compare two terms by hash")
+    diff_parser.add_argument('old_term')
+    diff_parser.add_argument('new_term')
+    export_parser = commands.add_parser('export', help="Rebuild a term's scholarship files")
+    export_parser.add_argument('term')
+    export_parser.add_argument('output_dir')
+    commands.add_parser('list', help="List stored terms")
+    args = parser.parse_args()
+
+    store = CorpusStore(args.store)
+    start = time.perf_counter()
+    try:
+        if args.command == 'import':
+            result = store.import_term(args.term, args.json_dir)
+            storage = store.storage()
+            print(f"Imported {result['term']}: {result['files']} files, {result['parsed']} new or changed, "
+                  f"{result['new_blobs']} new blobs in {time.perf_counter() - start:.2f} s")
+            print(f"  store: {storage['blobs']} blobs, {storage['bytes'] / 1e6:.1f} MB")
+        elif args.command == 'diff':
+            diff = store.diff_terms(args.old_term, args.new_term)
+            print(f"{diff['old_term']} → {diff['new_term']}: {len(diff['added'])} added, {len(diff['removed'])} removed, "
+                  f"{len(diff['changed'])} changed, {diff['unchanged']} unchanged "
+                  f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+            for file_name in diff['added']:
+                print(f"  + {file_name}")
+            for file_name in diff['removed']:
+                print(f"  - {file_name}")
+            for file_name, keys in diff['changed'].items():
+                print(f"  ~ {file_name}: {', '.join(keys)}")
+        elif args.command == 'export':
+            counts = store.export_term(args.term, args.output_dir)
+            print(f"Exported {args.term} to {args.output_dir}: {counts['written']} written, "
+                  f"{counts['unchanged']} already current")
+        else:
+            for term in store.terms():
+                manifest = store.load_manifest(term)
+                print(f"  {term}: {len(manifest['records'])} scholarships from {', '.join(map(str, manifest['source_files']))}")
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
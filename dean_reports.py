@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Dean Eligibility Verification Reports
+Generates one workbook per college from the eligibility engine instead of by hand:
+- "Eligible Students" lists every eligible student per scholarship with the Banner
+  columns that justified each criterion (the first matching column of each OR), and
+  "Scholarships" the eligible count and manual-review criteria per scholarship
+- Colleges are written in parallel worker processes, each streaming its workbook
+  row by row (xlsx_writer), so memory does not grow with the roster
+- Every export records a fingerprint of each row; --mark-verified accepts the last
+  export as verified, and --delta writes only rows added, changed or removed since
+  the last verified export
+
+    python dean_reports.py roster.csv                  # full reports → derived_data/dean_reports
+    python dean_reports.py --mark-verified             # deans signed off on the last export
+    python dean_reports.py next_roster.csv --delta     # only what changed since then
+"""
+
+import argparse
+import json
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from banner_roster import read_roster
+from bitsets import bit_positions
+from derived_artifacts import DERIVED_DIR
+from eligibility_engine import Predicate, RosterIndex, ScholarshipPlan, compile_corpus, derive_columns, evaluate_plan
+from improved_processor import get_scholarship_files
+from schema_migrations import write_text_atomic
+from xlsx_writer import StreamingWorkbook
+
+DEAN_REPORTS_DIR = os.path.join(DERIVED_DIR, 'dean_reports')
+STATE_DIR = 'state'
+EXPORTED_SUFFIX = '.exported.json'
+VERIFIED_SUFFIX = '.verified.json'
+STUDENT_ID_COLUMN = 'ID'
+
+STUDENT_HEADER = ['Scholarship ID', 'Scholarship', 'Student ID', 'First Name', 'Last Name', 'Banner Evidence',
+                  'Manual Criteria']
+STUDENT_WIDTHS = [14, 48, 14, 16, 18, 90, 16]
+SCHOLARSHIP_HEADER = ['Scholarship ID', 'Scholarship', 'Banner Criteria', 'Manual Criteria', 'Eligible Students']
+SCHOLARSHIP_WIDTHS = [14, 60, 16, 16, 18]
+CHANGE_HEADER = ['Added', 'Changed', 'Removed']
+
+def report_path(output_dir: str, college_code: str) -> str:
+    return os.path.join(output_dir, f"{college_code}_Eligibility_Verification.xlsx")
+
+def state_path(output_dir: str, college_code: str, suffix: str) -> str:
+    return os.path.join(output_dir, STATE_DIR, college_code + suffix)
+
+def row_fingerprint(row: Tuple) -> int:
+    return zlib.crc32('\t'.join(map(str, row)).encode('utf-8'))
+
+def load_fingerprints(path: str) -> Dict[str, Dict[str, int]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# Worker process state: the roster, its index and derived columns, and a per-column mask cache
+ROSTER: Dict[str, object] = {}
+
+def init_worker(roster_path: str):
+    rows = read_roster(roster_path)
+    ROSTER['rows'] = rows
+    ROSTER['derived'] = [derive_columns(row) for row in rows]
+    ROSTER['index'] = RosterIndex(rows)
+    ROSTER['ranks'] = {row.get(STUDENT_ID_COLUMN, ''): rank for rank, row in enumerate(rows)}
+    ROSTER['column_masks'] = {}
+
+def column_mask(predicate: Predicate, column: str) -> int:
+    key = (predicate, column)
+    mask = ROSTER['column_masks'].get(key)
+    if mask is None:
+        mask = ROSTER['column_masks'][key] = ROSTER['index'].column_mask(predicate, column)
+    return mask
+
+def evidence_text(predicate: Predicate, column: str, rank: int) -> str:
+    row = ROSTER['rows'][rank]
+    value = row[column] if column in row else ROSTER['derived'][rank][column]
+    if predicate.kind == 'number':
+        return f"{column} = {value} ({predicate.op} {predicate.value:g})"
+    return f"{column} = {value}"
+
+def eligibility_evidence(plan: ScholarshipPlan, eligible: int) -> Dict[int, str]:
+    """
+    Per eligible student, the column and value that satisfied each criterion; columns are
+    matched as whole-roster masks, so only eligible pairs are ever visited
+    """
+    parts: Dict[int, List[str]] = {rank: [] for rank in bit_positions(eligible)}
+    for criterion in plan.criteria:
+        remaining = eligible
+        for predicate in criterion.predicates:
+            for column in predicate.columns:
+                matched = column_mask(predicate, column) & remaining
+                if not matched:
+                    continue
+                remaining &= ~matched
+                for rank in bit_positions(matched):
+                    parts[rank].append(evidence_text(predicate, column, rank))
+            if not remaining:
+                break
+    return {rank: '; '.join(texts) for rank, texts in parts.items()}
+
+def student_rows(plan: ScholarshipPlan, eligible: int) -> Iterator[Tuple]:
+    rows = ROSTER['rows']
+    manual = len(plan.unevaluated)
+    for rank, evidence in eligibility_evidence(plan, eligible).items():
+        row = rows[rank]
+        yield (plan.scholarship_id, plan.name, row.get(STUDENT_ID_COLUMN, ''), row.get('First Name', ''),
+               row.get('Last Name', ''), evidence, manual)
+
+def write_college_report(college_code: str, plans: List[ScholarshipPlan], output_dir: str, delta: bool) -> Dict:
+    """
+    Worker task: stream one college workbook and record the fingerprints of its rows
+    """
+    start = time.perf_counter()
+    plans = sorted(plans, key=lambda plan: (plan.name, plan.scholarship_id))
+    eligible = {plan.scholarship_id: evaluate_plan(plan, ROSTER['index']) for plan in plans}
+    verified = load_fingerprints(state_path(output_dir, college_code, VERIFIED_SUFFIX)) if delta else {}
+    fingerprints: Dict[str, Dict[str, int]] = {}
+    changes = {plan.scholarship_id: {'Added': 0, 'Changed': 0, 'Removed': 0} for plan in plans}
+
+    def report_rows() -> Iterator[Tuple]:
+        for plan in plans:
+            scholarship_fingerprints = fingerprints.setdefault(str(plan.scholarship_id), {})
+            previous = verified.get(str(plan.scholarship_id), {})
+            for row in student_rows(plan, eligible[plan.scholarship_id]):
+                fingerprint = row_fingerprint(row)
+                scholarship_fingerprints[row[2]] = fingerprint
+                if not delta:
+                    yield row
+                    continue
+                old = previous.get(row[2])
+                if old == fingerprint:
+                    continue
+                change = 'Added' if old is None else 'Changed'
+                changes[plan.scholarship_id][change] += 1
+                yield (change,) + row
+            if delta:
+                yield from removed_rows(plan, previous, scholarship_fingerprints, changes[plan.scholarship_id])
+
+    path = report_path(output_dir, college_code)
+    with StreamingWorkbook(path) as workbook:
+        if delta:
+            student_count = workbook.write_sheet('Changed Students', ['Change'] + STUDENT_HEADER, report_rows(),
+                                                 [10] + STUDENT_WIDTHS)
+        else:
+            student_count = workbook.write_sheet('Eligible Students', STUDENT_HEADER, report_rows(), STUDENT_WIDTHS)
+        header = SCHOLARSHIP_HEADER + (CHANGE_HEADER if delta else [])
+        workbook.write_sheet('Scholarships', header, (
+            (plan.scholarship_id, plan.name, len(plan.criteria), len(plan.unevaluated),
+             eligible[plan.scholarship_id].bit_count())
+            + (tuple(changes[plan.scholarship_id][change] for change in CHANGE_HEADER) if delta else ())
+            for plan in plans), SCHOLARSHIP_WIDTHS + ([10] * len(CHANGE_HEADER) if delta else []))
+
+    os.makedirs(os.path.join(output_dir, STATE_DIR), exist_ok=True)
+    write_text_atomic(state_path(output_dir, college_code, EXPORTED_SUFFIX),
+                      json.dumps(fingerprints, separators=(',', ':')))
+    return {'college_code': college_code, 'path': path, 'rows': student_count, 'scholarships': len(plans),
+            'seconds': time.perf_counter() - start}
+
+def removed_rows(plan: ScholarshipPlan, previous: Dict[str, int], current: Dict[str, int],
+                 counts: Dict[str, int]) -> Iterator[Tuple]:
+    """
+    Delta rows for students verified as eligible last time but not any more
+    """
+    rows = ROSTER['rows']
+    for student_id in previous:
+        if student_id in current:
+            continue
+        counts['Removed'] += 1
+        rank = ROSTER['ranks'].get(student_id)
+        row = rows[rank] if rank is not None else {}
+        yield ('Removed', plan.scholarship_id, plan.name, student_id, row.get('First Name', ''),
+               row.get('Last Name', ''), '', len(plan.unevaluated))
+
+def generate_reports(roster_path: str, output_dir: str = DEAN_REPORTS_DIR, delta: bool = False,
+                     workers: Optional[int] = None, colleges: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Write every college's workbook, one worker process per college at a time
+    """
+    by_college: Dict[str, List[ScholarshipPlan]] = {}
+    for plan in compile_corpus(get_scholarship_files()):
+        if plan.criteria and (not colleges or plan.college_code in colleges):
+            by_college.setdefault(plan.college_code, []).append(plan)
+    os.makedirs(output_dir, exist_ok=True)
+
+    tasks = sorted(by_college.items(), key=lambda item: -len(item[1]))
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        init_worker(roster_path)
+        return [write_college_report(college, plans, output_dir, delta) for college, plans in tasks]
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(roster_path,)) as executor:
+        futures = [executor.submit(write_college_report, college, plans, output_dir, delta)
+                   for college, plans in tasks]
+        return [future.result() for future in futures]
+
+def mark_verified(output_dir: str = DEAN_REPORTS_DIR) -> List[str]:
+    """
+    Accept the last export of every college as the baseline for the next --delta run
+    """
+    state_dir = os.path.join(output_dir, STATE_DIR)
+    verified = []
+    for file_name in sorted(os.listdir(state_dir)) if os.path.isdir(state_dir) else []:
+        if file_name.endswith(EXPORTED_SUFFIX):
+            college_code = file_name[:-len(EXPORTED_SUFFIX)]
+            os.replace(os.path.join(state_dir, file_name), state_path(output_dir, college_code, VERIFIED_SUFFIX))
+            verified.append(college_code)
+    return verified
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate dean eligibility verification workbooks per college")
+    parser.add_argument('roster', nargs='?', help="Banner extract CSV")
+    parser.add_argument('--output', default=DEAN_REPORTS_DIR)
+    parser.add_argument('--delta', action='store_true', help="Only rows changed since the last verified export")
+    parser.add_argument('--mark-verified', action='store_true', help="Accept the last export as verified")
+    parser.add_argument('--college', action='append', help="Limit to these college codes (repeatable)")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if args.mark_verified:
+        colleges = mark_verified(args.output)
+        print(f"Marked the last export verified for {', '.join(colleges) if colleges else 'no colleges'}")
+    elif not args.roster:
+        parser.error("a roster CSV is required unless --mark-verified is given")
+    else:
+        start = time.perf_counter()
+        results = generate_reports(args.roster, args.output, args.delta, args.workers, args.college)
+        kind = 'changed rows' if args.delta else 'eligible students'
+        for result in sorted(results, key=lambda result: result['college_code']):
+            print(f"  {result['college_code']:<8} {result['rows']:>9,} {kind} in {result['scholarships']} scholarships "
+                  f"({result['seconds']:.1f} s) → {result['path']}")
+        print(f"Wrote {len(results)} dean reports in {time.perf_counter() - start:.1f} s")
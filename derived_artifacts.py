@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Derived Artifacts Builder
+Maintains the files generated from scholarship_json_files:
+- file-list.json manifest used by the website
+- Per-scholarship index (derived_data/scholarship_index.json)
+- Per-college bundles with content-hashed names (derived_data/bundles/)
+- Corpus summary aggregated from the index (derived_data/corpus_summary.json)
+- Automation view: each scholarship's automation class, the Banner fields it needs
+  and its automation percentage (derived_data/automation_view.json), read by the
+  automation reports and /api/scholarships/automatable instead of rescanning files
+Artifacts can be rebuilt from scratch or updated for a handful of changed files;
+scholarship files are read through the corpus_storage thread pool.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+import corpus_storage
+import json_backend
+from improved_processor import SCHOLARSHIP_JSON_DIR, get_scholarship_files
+from schema_migrations import write_json_atomic
+
+DERIVED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'derived_data')
+INDEX_FILE = 'scholarship_index.json'
+SUMMARY_FILE = 'corpus_summary.json'
+BUNDLE_DIR = 'bundles'
+BUNDLE_MANIFEST = 'manifest.json'
+MANIFEST_FILE = corpus_storage.MANIFEST_FILE
+AUTOMATION_VIEW_FILE = 'automation_view.json'
+AUTOMATION_CLASSES = ('fully', 'partially', 'manual_only')
+
+# Description substring → Banner field a criterion needs, in report order
+BANNER_FIELDS = (
+    ('SIS_Major', 'Major'),
+    ('SIS_Minor', 'Minor'),
+    ('SIS_Classification', 'Classification'),
+    ('SIS_CumGPA', 'GPA'),
+    ('SIS_College', 'College'),
+    ('SIS_Resident', 'Residency'),
+    ('SIS_Hours', 'Credit Hours'),
+    ('SIS_Gender', 'Gender'),
+    ('SIS_Hispanic', 'Hispanic/Latino'),
+    ('SIS_Level', 'Academic Level'),
+)
+
+def build_index_entry(scholarship_data: Dict, file_name: str) -> Dict:
+    """
+    Compact per-scholarship record used by the index, bundles and summary
+    """
+    basic_info = scholarship_data.get('basic_information', {})
+    hard_criteria = scholarship_data.get('hard_criteria', {})
+    general_criteria = scholarship_data.get('general_criteria', {})
+
+    criteria_types = Counter()
+    accessibility = Counter()
+    for section in (hard_criteria, general_criteria):
+        for criteria in section.get('criteria', []):
+            criteria_types[criteria.get('type', 'unknown')] += 1
+            accessibility[criteria.get('banner_accessibility', 'unknown')] += 1
+
+    return {
+        'id': basic_info.get('scholarship_id'),
+        'file': file_name,
+        'name': basic_info.get('scholarship_name', ''),
+        'code': basic_info.get('scholarship_code', ''),
+        'college_code': basic_info.get('college_code') or 'GENERAL',
+        'committee': basic_info.get('committee_name', ''),
+        'candidate_count': basic_info.get('candidate_count', 0),
+        'renewable': scholarship_data.get('renewable_information', {}).get('is_renewable', False),
+        'progress_status': scholarship_data.get('progress_status', 'not-processed'),
+        'hard_criteria_count': len(hard_criteria.get('criteria', [])),
+        'general_criteria_count': len(general_criteria.get('criteria', [])),
+        'criteria_types': dict(criteria_types),
+        'banner_accessibility': dict(accessibility),
+    }
+
+def requirement_labels(description: str) -> List[str]:
+    """
+    Requirement groups of the Banner field usage report a banner-accessible criterion counts towards
+    """
+    labels = []
+    if 'SIS_Major' in description:
+        labels.append('Major Requirements')
+    if 'SIS_Minor' in description:
+        labels.append('Minor Requirements')
+    if 'SIS_Classification' in description:
+        labels.append('Classification Requirements')
+    if 'SIS_CumGPA' in description:
+        labels.append('Cumulative GPA Requirements')
+    if 'SIS_MajorGPA' in description:
+        labels.append('Major GPA Requirements')
+    if 'SIS_Enrolled HRS' in description or 'SIS_Enrolled_HRS' in description:
+        labels.append('Enrolled Hours Requirements')
+    if 'SIS_College' in description:
+        labels.append('College Requirements')
+    if 'SIS_Resident' in description:
+        labels.append('Residency Requirements')
+    if 'SIS_Hours' in description and 'Enrolled' not in description:
+        labels.append('Credit Hours Requirements')
+    if 'SIS_Level' in description:
+        labels.append('Academic Level Requirements')
+    return labels
+
+def build_automation_entry(scholarship_data: Dict, file_name: str) -> Dict:
+    """
+    Automation view record: the fully/partially/manual-only class over hard and general
+    criteria, plus the Banner fields and criteria a hard-criteria-only integration needs
+    """
+    basic_info = scholarship_data.get('basic_information', {})
+    hard = scholarship_data.get('hard_criteria', {}).get('criteria', [])
+    general = scholarship_data.get('general_criteria', {}).get('criteria', [])
+
+    counts = Counter()
+    field_usage = Counter()
+    for criteria in hard + general:
+        accessibility = criteria.get('banner_accessibility', 'manual_review')
+        counts[accessibility if accessibility in ('banner_accessible', 'application_required') else 'manual_review'] += 1
+        if accessibility == 'banner_accessible':
+            field_usage.update(requirement_labels(criteria.get('description', '')))
+
+    total = len(hard) + len(general)
+    banner_count = counts['banner_accessible']
+    if not total:
+        automation_class = None
+    elif banner_count == total:
+        automation_class = 'fully'
+    elif banner_count:
+        automation_class = 'partially'
+    else:
+        automation_class = 'manual_only'
+
+    hard_automatable = bool(hard) and all(criteria.get('banner_accessibility') == 'banner_accessible'
+                                          for criteria in hard)
+    needed = set()
+    for criteria in hard:
+        if criteria.get('banner_accessibility') == 'banner_accessible':
+            description = criteria.get('description', '')
+            needed.update(field for marker, field in BANNER_FIELDS if marker in description)
+
+    return {
+        'id': basic_info.get('scholarship_id'),
+        'file': file_name,
+        'name': basic_info.get('scholarship_name', ''),
+        'code': basic_info.get('scholarship_code', ''),
+        'donor': basic_info.get('donor_name', ''),
+        'committee': basic_info.get('committee_name', ''),
+        'college_code': basic_info.get('college_code') or 'GENERAL',
+        'candidate_count': basic_info.get('candidate_count', 0),
+        'renewable': scholarship_data.get('renewable_information', {}).get('is_renewable', False),
+        'automation_class': automation_class,
+        'automation_percentage': banner_count / total * 100 if total else 0.0,
+        'total_criteria': total,
+        'banner_accessible': banner_count,
+        'application_required': counts['application_required'],
+        'manual_review': counts['manual_review'],
+        'banner_field_usage': dict(field_usage),
+        'hard_criteria_count': len(hard),
+        'hard_criteria_automatable': hard_automatable,
+        'banner_fields': [field for _, field in BANNER_FIELDS if field in needed],
+        # Kept only where the detailed integration report needs them
+        'criteria_details': [{
+            'number': number,
+            'type': criteria.get('type', 'unknown'),
+            'description': criteria.get('clean_description') or criteria.get('description', ''),
+            'banner_field': ' '.join(criteria.get('description', '').split()[:1]),
+            'parsed_sis': criteria.get('parsed_sis', {})
+        } for number, criteria in enumerate(hard, 1)] if hard_automatable else []
+    }
+
+def load_json(path: str, default=None):
+    """
+    Load a JSON file, returning default when it does not exist
+    """
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_manifest(json_dir: str, file_names: List[str]) -> bool:
+    """
+    Write file-list.json if the set of files changed. Returns True if written.
+    """
+    manifest_path = os.path.join(json_dir, MANIFEST_FILE)
+    file_names = sorted(file_names)
+    existing = load_json(manifest_path, {})
+    if existing.get('files') == file_names:
+        return False
+
+    write_json_atomic(manifest_path, {
+        'files': file_names,
+        'count': len(file_names),
+        'last_updated': date.today().isoformat()
+    })
+    return True
+
+def build_summary(index: Dict[str, Dict]) -> Dict:
+    """
+    Aggregate corpus-level counts from index entries (no scholarship files are read)
+    """
+    colleges = Counter()
+    progress = Counter()
+    criteria_types = Counter()
+    accessibility = Counter()
+    total_criteria = 0
+
+    for entry in index.values():
+        colleges[entry['college_code']] += 1
+        progress[entry['progress_status']] += 1
+        criteria_types.update(entry['criteria_types'])
+        accessibility.update(entry['banner_accessibility'])
+        total_criteria += entry['hard_criteria_count'] + entry['general_criteria_count']
+
+    total = len(index)
+    return {
+        'totals': {
+            'scholarships': total,
+            'renewable': sum(1 for entry in index.values() if entry['renewable']),
+            'total_criteria': total_criteria,
+            'avg_criteria_per_scholarship': total_criteria / total if total else 0
+        },
+        'college_counts': dict(sorted(colleges.items())),
+        'progress_status_counts': dict(sorted(progress.items())),
+        'criterion_type_counts': criteria_types.most_common(),
+        'banner_accessibility_counts': dict(accessibility.most_common())
+    }
+
+def write_bundle(derived_dir: str, college_code: str, records: List[Dict]) -> str:
+    """
+    Write one college bundle under a content-hashed name. Returns the file name.
+    """
+    records = sorted(records, key=lambda record: record['basic_information']['scholarship_id'])
+    payload = json.dumps({'college_code': college_code, 'scholarships': records},
+                         ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    digest = hashlib.sha256(payload).hexdigest()[:12]
+    file_name = f"{college_code}-{digest}.json"
+
+    bundle_path = os.path.join(derived_dir, BUNDLE_DIR, file_name)
+    if not os.path.exists(bundle_path):
+        corpus_storage.write_bytes_atomic(bundle_path, payload)
+    return file_name
+
+def write_bundle_manifest(derived_dir: str, bundles: Dict[str, str]):
+    """
+    Record the current bundle name for each college and remove superseded bundles
+    """
+    bundle_dir = os.path.join(derived_dir, BUNDLE_DIR)
+    write_json_atomic(os.path.join(bundle_dir, BUNDLE_MANIFEST), dict(sorted(bundles.items())))
+
+    current = set(bundles.values()) | {BUNDLE_MANIFEST}
+    for file_name in os.listdir(bundle_dir):
+        # Another writer's temporary file is not a bundle yet
+        if file_name.startswith('.'):
+            continue
+        # Precompressed .gz/.br siblings go with the bundle they were built from
+        base_name = re.sub(r'\.(gz|br)$', '', file_name)
+        if base_name.endswith('.json') and base_name not in current:
+            os.remove(os.path.join(bundle_dir, file_name))
+
+def load_scholarship(json_file: str) -> Optional[Dict]:
+    """
+    Read one scholarship file, returning None if it cannot be parsed
+    """
+    try:
+        return json_backend.loads(corpus_storage.read_text(json_file))
+    except Exception as e:
+        print(f"Error reading {json_file}: {e}")
+        return None
+
+def load_scholarships(json_files: Iterable[str]) -> List[Optional[Dict]]:
+    """
+    load_scholarship for many files at once, read concurrently, in input order
+    """
+    return corpus_storage.map_files(load_scholarship, json_files)
+
+def rebuild_all(json_dir: str = SCHOLARSHIP_JSON_DIR, derived_dir: str = DERIVED_DIR) -> Dict:
+    """
+    Build every derived artifact from scratch
+    """
+    os.makedirs(os.path.join(derived_dir, BUNDLE_DIR), exist_ok=True)
+
+    json_files = get_scholarship_files(json_dir)
+    index = {}
+    automation_view = {}
+    college_records = {}
+    for json_file, scholarship_data in zip(json_files, load_scholarships(json_files)):
+        if scholarship_data is None:
+            continue
+        entry = build_index_entry(scholarship_data, corpus_storage.logical_name(json_file))
+        index[str(entry['id'])] = entry
+        automation_view[str(entry['id'])] = build_automation_entry(scholarship_data, entry['file'])
+        college_records.setdefault(entry['college_code'], []).append(scholarship_data)
+
+    write_manifest(json_dir, [corpus_storage.logical_name(f) for f in json_files])
+    write_json_atomic(os.path.join(derived_dir, INDEX_FILE), index)
+    write_json_atomic(os.path.join(derived_dir, AUTOMATION_VIEW_FILE), automation_view)
+    write_json_atomic(os.path.join(derived_dir, SUMMARY_FILE), build_summary(index))
+
+    bundles = {college: write_bundle(derived_dir, college, records)
+               for college, records in college_records.items()}
+    write_bundle_manifest(derived_dir, bundles)
+
+    return {'scholarships': len(index), 'bundles_written': len(bundles), 'manifest_files': len(json_files)}
+
+def update_artifacts(changed_files: Iterable[str], removed_files: Iterable[str] = (),
+                     json_dir: str = SCHOLARSHIP_JSON_DIR, derived_dir: str = DERIVED_DIR) -> Dict:
+    """
+    Update derived artifacts for changed and removed scholarship files only.
+    Falls back to a full rebuild when no previous index exists.
+    """
+    index = load_json(os.path.join(derived_dir, INDEX_FILE))
+    bundles = load_json(os.path.join(derived_dir, BUNDLE_DIR, BUNDLE_MANIFEST))
+    automation_view = load_json(os.path.join(derived_dir, AUTOMATION_VIEW_FILE))
+    if index is None or bundles is None or automation_view is None:
+        return rebuild_all(json_dir, derived_dir)
+
+    by_file = {entry['file']: scholarship_id for scholarship_id, entry in index.items()}
+    updated_records = {}
+    removed_ids = set()
+    affected_colleges = set()
+
+    for json_file in removed_files:
+        scholarship_id = by_file.get(corpus_storage.logical_name(json_file))
+        if scholarship_id is not None:
+            affected_colleges.add(index.pop(scholarship_id)['college_code'])
+            automation_view.pop(scholarship_id, None)
+            removed_ids.add(scholarship_id)
+
+    changed_files = list(changed_files)
+    for json_file, scholarship_data in zip(changed_files, load_scholarships(changed_files)):
+        if scholarship_data is None:
+            continue
+        entry = build_index_entry(scholarship_data, corpus_storage.logical_name(json_file))
+        scholarship_id = str(entry['id'])
+        previous = index.get(scholarship_id)
+        if previous is not None:
+            affected_colleges.add(previous['college_code'])
+        affected_colleges.add(entry['college_code'])
+        index[scholarship_id] = entry
+        automation_view[scholarship_id] = build_automation_entry(scholarship_data, entry['file'])
+        updated_records[scholarship_id] = scholarship_data
+
+    # Rewrite only the bundles of colleges that gained, lost or changed a scholarship
+    for college in affected_colleges:
+        records = {}
+        if college in bundles:
+            bundle = load_json(os.path.join(derived_dir, BUNDLE_DIR, bundles[college]), {})
+            for record in bundle.get('scholarships', []):
+                records[str(record['basic_information']['scholarship_id'])] = record
+        for scholarship_id in list(records):
+            if scholarship_id in removed_ids or scholarship_id in updated_records:
+                del records[scholarship_id]
+        for scholarship_id, record in updated_records.items():
+            if index[scholarship_id]['college_code'] == college:
+                records[scholarship_id] = record
+
+        if records:
+            bundles[college] = write_bundle(derived_dir, college, list(records.values()))
+        else:
+            bundles.pop(college, None)
+
+    manifest_written = write_manifest(json_dir, [corpus_storage.logical_name(f) for f in get_scholarship_files(json_dir)])
+    write_json_atomic(os.path.join(derived_dir, INDEX_FILE), index)
+    write_json_atomic(os.path.join(derived_dir, AUTOMATION_VIEW_FILE), automation_view)
+    write_json_atomic(os.path.join(derived_dir, SUMMARY_FILE), build_summary(index))
+    write_bundle_manifest(derived_dir, bundles)
+
+    return {
+        'scholarships': len(updated_records) + len(removed_ids),
+        'bundles_written': len(affected_colleges),
+        'manifest_written': manifest_written
+    }
+
+def load_automation_view(json_dir: str = SCHOLARSHIP_JSON_DIR, derived_dir: str = DERIVED_DIR) -> Dict[str, Dict]:
+    """
+    Automation view keyed by scholarship id; built with the other artifacts on first use
+    """
+    path = os.path.join(derived_dir, AUTOMATION_VIEW_FILE)
+    automation_view = load_json(path)
+    if automation_view is None:
+        rebuild_all(json_dir, derived_dir)
+        automation_view = load_json(path, {})
+    return automation_view
+
+if __name__ == "__main__":
+    result = rebuild_all()
+    print(f"Indexed {result['scholarships']} scholarships into {result['bundles_written']} college bundles")
+    print(f"Derived artifacts written to {DERIVED_DIR}")
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Eligibility Request Batcher
+Coalesces concurrent eligibility lookups into one roster evaluation:
+- Callers submit their student rows and wait on a Future
+- A worker thread collects requests for up to max_wait seconds (or max_students
+  rows), indexes them as one roster, evaluates every plan once and fans the
+  per-student results back out
+- A lone request waits at most max_wait, so latency stays bounded under light load,
+  while bursts share one pass over the 670 plans
+
+    python eligibility_batcher.py roster.csv     # compare direct and batched throughput
+"""
+
+import queue
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import Future, InvalidStateError
+from typing import Callable, Dict, List, Optional
+
+from eligibility_engine import RosterIndex, eligible_by_student, evaluate_roster
+from eligibility_service import CorpusSnapshot
+
+DEFAULT_MAX_WAIT = 0.003
+DEFAULT_MAX_STUDENTS = 512
+
+def evaluate_students(snapshot: CorpusSnapshot, students: List[Dict[str, str]]) -> Dict:
+    """
+    Eligible scholarship ids for each student row, evaluated against one snapshot
+    """
+    roster = RosterIndex(students)
+    by_student = eligible_by_student(evaluate_roster(snapshot.plans, roster), roster)
+    return {
+        'snapshot_version': snapshot.version,
+        'results': [{'student_id': student_id, 'eligible': sorted(eligible)}
+                    for student_id, eligible in zip(roster.student_ids, by_student)],
+        # Predicates shared between plans are matched against the roster once
+        'predicate_cache': {'hits': roster.cache_hits, 'misses': roster.cache_misses}
+    }
+
+class EligibilityBatcher:
+    """
+    Request coalescer in front of the eligibility engine
+    """
+
+    def __init__(self, snapshot_provider: Callable[[], CorpusSnapshot], max_wait: float = DEFAULT_MAX_WAIT,
+                 max_students: int = DEFAULT_MAX_STUDENTS,
+                 on_batch: Optional[Callable[[int, float], None]] = None):
+        self.snapshot_provider = snapshot_provider
+        self.max_wait = max_wait
+        self.max_students = max_students
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.students = 0
+        self.batch_seconds = 0.0
+        self.predicate_cache_hits = 0
+        self.predicate_cache_misses = 0
+        self.failed_batches = 0
+        self.last_error = None
+        # Called with (students, seconds) after every evaluated batch, e.g. to feed a histogram
+        self.on_batch = on_batch
+
+    def evaluate(self, students: List[Dict[str, str]], timeout: float = 30.0) -> Dict:
+        """
+        Blocking lookup for one caller's students
+        """
+        return self.submit(students).result(timeout)
+
+    def submit(self, students: List[Dict[str, str]]) -> Future:
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((students, future))
+        return future
+
+    def _ensure_worker(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='eligibility-batcher', daemon=True)
+                    self._thread.start()
+
+    def _collect(self) -> List:
+        """
+        Block for the first request, then gather more until the wait or size limit is hit
+        """
+        batch = [self._queue.get()]
+        student_count = len(batch[0][0])
+        deadline = time.perf_counter() + self.max_wait
+        while student_count < self.max_students:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+            student_count += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                self._process(batch)
+            except Exception as e:
+                # The worker outlives any failure: callers get the error instead of a timeout
+                self.failed_batches += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                traceback.print_exc()
+                for _, future in batch:
+                    try:
+                        future.set_exception(e)
+                    except InvalidStateError:
+                        # Already answered, or cancelled by its caller
+                        pass
+
+    def _process(self, batch: List):
+        start = time.perf_counter()
+        students = [row for rows, _ in batch for row in rows]
+        result = evaluate_students(self.snapshot_provider(), students)
+
+        # Fan the combined results back out in submission order
+        offset = 0
+        for rows, future in batch:
+            if not future.done():
+                future.set_result({'snapshot_version': result['snapshot_version'],
+                                   'results': result['results'][offset:offset + len(rows)]})
+            offset += len(rows)
+
+        seconds = time.perf_counter() - start
+        self.batches += 1
+        self.requests += len(batch)
+        self.students += len(students)
+        self.batch_seconds += seconds
+        self.predicate_cache_hits += result['predicate_cache']['hits']
+        self.predicate_cache_misses += result['predicate_cache']['misses']
+        if self.on_batch is not None:
+            self.on_batch(len(students), seconds)
+
+    def metrics(self) -> Dict:
+        return {
+            'batches': self.batches,
+            'requests': self.requests,
+            'students': self.students,
+            'mean_batch_students': round(self.students / self.batches, 2) if self.batches else 0,
+            'batch_seconds_total': round(self.batch_seconds, 4),
+            'predicate_cache_hits': self.predicate_cache_hits,
+            'predicate_cache_misses': self.predicate_cache_misses,
+            'failed_batches': self.failed_batches
+        }
+
+def run_load(lookup: Callable[[List[Dict]], Dict], rows: List[Dict], clients: int) -> float:
+    """
+    Seconds for `clients` threads to look up every row one student at a time
+    """
+    def client(index: int):
+        for row in rows[index::clients]:
+            lookup([row])
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python eligibility_batcher.py ROSTER.csv [CLIENTS]")
+        sys.exit(1)
+
+    from banner_roster import read_roster
+    from eligibility_service import SnapshotManager
+
+    rows = read_roster(sys.argv[1])[:2000]
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    manager = SnapshotManager()
+    snapshot = manager.current()
+    batcher = EligibilityBatcher(manager.current)
+
+    direct = run_load(lambda students: evaluate_students(snapshot, students), rows, clients)
+    batched = run_load(batcher.evaluate, rows, clients)
+    print(f"{len(rows)} single-student lookups from {clients} clients")
+    print(f"  direct:  {direct:6.2f} s  ({len(rows) / direct:8.0f} lookups/s)")
+    print(f"  batched: {batched:6.2f} s  ({len(rows) / batched:8.0f} lookups/s)  {batcher.metrics()}")
+
+    single = []
+    for row in rows[:50]:
+        start = time.perf_counter()
+        batcher.evaluate([row])
+        single.append(time.perf_counter() - start)
+    print(f"  light-load latency: median {sorted(single)[len(single) // 2] * 1000:.1f} ms, "
+          f"max {max(single) * 1000:.1f} ms")
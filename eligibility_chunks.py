@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Out-of-Core Eligibility
+Evaluates rosters too large for one in-memory index (several years of Banner
+history, large synthetic rosters) in fixed-size chunks and streams the eligible
+pairs to disk:
+- The extract is read as a stream and each chunk of rows is indexed and evaluated
+  on its own, so peak memory follows the chunk size, not the roster size
+- Each chunk becomes one binary pair file: the chunk's student IDs, then per
+  scholarship the row offsets of its eligible students as little-endian uint32,
+  grouped by scholarship like a Parquet row group
+- A manifest is checkpointed after every chunk; an interrupted run resumes after the
+  last finished chunk as long as the roster, the corpus and the chunk size are unchanged
+
+    python eligibility_chunks.py roster.csv --chunk-size 50000
+    python eligibility_chunks.py roster.csv --restart      # discard checkpoints and start over
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from banner_roster import iter_roster
+from bitsets import bit_positions
+from corpus_storage import write_bytes_atomic
+from eligibility_delta import ELIGIBILITY_DIR, plan_signature, project_row
+from eligibility_engine import RosterIndex, ScholarshipPlan, compile_corpus, evaluate_plan
+from improved_processor import get_scholarship_files
+from schema_migrations import iter_batches, write_text_atomic
+
+CHUNKS_DIR = os.path.join(ELIGIBILITY_DIR, 'chunks')
+MANIFEST_FILE = 'manifest.json'
+DEFAULT_CHUNK_SIZE = 50000
+
+# Pair file layout: header, student IDs block, scholarship count, then per scholarship
+# (scholarship id, eligible count) followed by that many uint32 row offsets
+CHUNK_MAGIC = b'SCEP'
+CHUNK_VERSION = 1
+CHUNK_HEADER = struct.Struct('<4sHIQI')  # magic, version, chunk index, first row, rows
+CHUNK_COUNT = struct.Struct('<I')
+CHUNK_GROUP = struct.Struct('<II')
+
+class ChunkPairs(NamedTuple):
+    index: int
+    first_row: int
+    student_ids: List[str]
+    # Scholarship id → offsets (within the chunk) of its eligible students
+    eligible: Dict[int, array]
+
+def roster_signature(csv_path: str) -> str:
+    stat = os.stat(csv_path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+def corpus_signature(plans: Iterable[ScholarshipPlan]) -> str:
+    """
+    Changes whenever a scholarship is added, removed or has its compiled criteria changed
+    """
+    text = '\n'.join(f"{plan.scholarship_id}:{plan_signature(plan)}"
+                     for plan in sorted(plans, key=lambda plan: plan.scholarship_id))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+def chunk_file_name(index: int) -> str:
+    return f"pairs-{index:06d}.bin"
+
+def uint32_bytes(values: Iterable[int]) -> bytes:
+    values = array('I', values)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+def encode_chunk(index: int, first_row: int, student_ids: List[str], results: Dict[int, int]) -> bytes:
+    ids_block = '\n'.join(student_ids).encode('utf-8')
+    parts = [CHUNK_HEADER.pack(CHUNK_MAGIC, CHUNK_VERSION, index, first_row, len(student_ids)),
+             CHUNK_COUNT.pack(len(ids_block)), ids_block,
+             CHUNK_COUNT.pack(sum(1 for mask in results.values() if mask))]
+    for scholarship_id, mask in results.items():
+        if not mask:
+            continue
+        offsets = bit_positions(mask)
+        parts.append(CHUNK_GROUP.pack(scholarship_id, len(offsets)))
+        parts.append(uint32_bytes(offsets))
+    return b''.join(parts)
+
+def decode_chunk(data: bytes) -> ChunkPairs:
+    magic, version, index, first_row, rows = CHUNK_HEADER.unpack_from(data, 0)
+    if magic != CHUNK_MAGIC or version != CHUNK_VERSION:
+        raise ValueError(f"Not a version {CHUNK_VERSION} eligibility pair file")
+    offset = CHUNK_HEADER.size
+    (ids_length,) = CHUNK_COUNT.unpack_from(data, offset)
+    offset += CHUNK_COUNT.size
+    student_ids = data[offset:offset + ids_length].decode('utf-8').split('\n') if rows else []
+    offset += ids_length
+    (groups,) = CHUNK_COUNT.unpack_from(data, offset)
+    offset += CHUNK_COUNT.size
+    eligible = {}
+    for _ in range(groups):
+        scholarship_id, count = CHUNK_GROUP.unpack_from(data, offset)
+        offset += CHUNK_GROUP.size
+        offsets = array('I')
+        offsets.frombytes(data[offset:offset + count * 4])
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+        eligible[scholarship_id] = offsets
+        offset += count * 4
+    return ChunkPairs(index, first_row, student_ids, eligible)
+
+def read_chunk(path: str) -> ChunkPairs:
+    with open(path, 'rb') as f:
+        return decode_chunk(f.read())
+
+def load_manifest(output_dir: str) -> Optional[Dict]:
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_manifest(output_dir: str, manifest: Dict):
+    manifest['updated_at'] = datetime.now().isoformat(timespec='seconds')
+    write_text_atomic(os.path.join(output_dir, MANIFEST_FILE), json.dumps(manifest, indent=2))
+
+def clear_chunks(output_dir: str):
+    for name in os.listdir(output_dir):
+        if name == MANIFEST_FILE or (name.startswith('pairs-') and name.endswith('.bin')):
+            os.remove(os.path.join(output_dir, name))
+
+def resume_manifest(output_dir: str, expected: Dict, restart: bool) -> Dict:
+    """
+    The stored manifest if it was written for the same roster, corpus and chunk size;
+    otherwise a fresh one (with restart) or an error, so checkpoints are never mixed
+    """
+    manifest = None if restart else load_manifest(output_dir)
+    if manifest is not None:
+        mismatched = [key for key, value in expected.items() if manifest.get(key) != value]
+        if mismatched:
+            raise ValueError(f"Checkpoints in {output_dir} were written with a different "
+                             f"{', '.join(mismatched)}; rerun with --restart")
+        # A chunk file written after the last checkpoint is simply rewritten
+        return manifest
+    clear_chunks(output_dir)
+    return dict(expected, chunks=[], complete=False)
+
+def evaluate_out_of_core(csv_path: str, plans: List[ScholarshipPlan], output_dir: str = CHUNKS_DIR,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE, restart: bool = False) -> Dict:
+    """
+    Evaluate a roster chunk by chunk into pair files under output_dir, resuming from
+    the last checkpoint; returns the manifest
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = resume_manifest(output_dir, {
+        'format_version': CHUNK_VERSION,
+        'roster': os.path.abspath(csv_path),
+        'roster_signature': roster_signature(csv_path),
+        'corpus_signature': corpus_signature(plans),
+        'chunk_size': chunk_size,
+    }, restart)
+    if manifest['complete']:
+        return manifest
+
+    first_row = sum(chunk['rows'] for chunk in manifest['chunks'])
+    rows = islice(iter_roster(csv_path), first_row, None)
+    for index, batch in enumerate(iter_batches(rows, chunk_size), len(manifest['chunks'])):
+        roster = RosterIndex([project_row(row) for row in batch])
+        results = {plan.scholarship_id: evaluate_plan(plan, roster) for plan in plans}
+        file_name = chunk_file_name(index)
+        write_bytes_atomic(os.path.join(output_dir, file_name),
+                           encode_chunk(index, first_row, roster.student_ids, results))
+        manifest['chunks'].append({'index': index, 'file': file_name, 'first_row': first_row, 'rows': roster.size,
+                                   'pairs': sum(mask.bit_count() for mask in results.values())})
+        save_manifest(output_dir, manifest)
+        first_row += roster.size
+
+    manifest['complete'] = True
+    save_manifest(output_dir, manifest)
+    return manifest
+
+def iter_pairs(output_dir: str = CHUNKS_DIR) -> Iterator[Tuple[str, int]]:
+    """
+    Stream (student id, scholarship id) for every eligible pair, one chunk in memory at a time
+    """
+    manifest = load_manifest(output_dir)
+    if manifest is None:
+        return
+    for chunk in manifest['chunks']:
+        pairs = read_chunk(os.path.join(output_dir, chunk['file']))
+        for scholarship_id, offsets in pairs.eligible.items():
+            for offset in offsets:
+                yield pairs.student_ids[offset], scholarship_id
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate a large Banner extract in chunks, streaming pairs to disk")
+    parser.add_argument('roster', help="Banner extract CSV")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Students indexed at a time")
+    parser.add_argument('--output', default=CHUNKS_DIR)
+    parser.add_argument('--restart', action='store_true', help="Discard checkpoints and evaluate from the first row")
+    args = parser.parse_args()
+
+    plans = compile_corpus(get_scholarship_files())
+    start = time.perf_counter()
+    previous = None if args.restart else load_manifest(args.output)
+    resumed_from = len(previous['chunks']) if previous and not previous['complete'] else 0
+    try:
+        manifest = evaluate_out_of_core(args.roster, plans, args.output, args.chunk_size, args.restart)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    students = sum(chunk['rows'] for chunk in manifest['chunks'])
+    pairs = sum(chunk['pairs'] for chunk in manifest['chunks'])
+    size = sum(os.path.getsize(os.path.join(args.output, chunk['file'])) for chunk in manifest['chunks'])
+    if resumed_from:
+        print(f"Resumed after {resumed_from} checkpointed chunks")
+    print(f"Evaluated {students:,} students × {len(plans)} scholarships in {len(manifest['chunks'])} chunks "
+          f"of {args.chunk_size:,} in {elapsed:.2f} s")
+    print(f"  {pairs:,} eligible pairs, {size / 1e6:.1f} MB of pair files → {args.output}")
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Delta Eligibility Recomputation
+Keeps the student × scholarship eligibility matrix from the last Banner extract and
+updates it in place when a new extract arrives:
+- Students are diffed by ID on the columns the SIS predicates read
+- Only added or changed students are re-evaluated, and only against scholarships
+  whose predicates read one of the changed columns
+- Scholarships whose compiled criteria changed since the last run are re-evaluated
+  for the whole roster; removed students and scholarships are dropped
+- Every flip is written to a change log of newly eligible / newly ineligible pairs
+
+Reading the new extract is linear in the roster; evaluation and the change log are
+proportional to what changed.
+
+    python eligibility_delta.py roster.csv              # first run: full evaluation
+    python eligibility_delta.py next_roster.csv         # later runs: delta + change log
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from banner_roster import read_roster
+from bitsets import bit_positions
+from derived_artifacts import DERIVED_DIR
+from eligibility_engine import (SIS_FIELD_COLUMNS, RosterIndex, ScholarshipPlan, compile_corpus, evaluate_plan,
+                                plan_source_columns, source_columns)
+from improved_processor import get_scholarship_files
+from schema_migrations import write_text_atomic
+
+ELIGIBILITY_DIR = os.path.join(DERIVED_DIR, 'eligibility')
+STATE_FILE = 'state.json'
+STUDENT_ID_COLUMN = 'ID'
+
+# The student ID plus every Banner column any SIS predicate can read
+PREDICATE_COLUMNS = [STUDENT_ID_COLUMN] + sorted(
+    source_columns(column for _, columns in SIS_FIELD_COLUMNS.values() for column in columns))
+
+def plan_signature(plan: ScholarshipPlan) -> str:
+    """
+    Changes whenever a scholarship's compiled predicates change
+    """
+    text = '\n'.join(repr(criterion.predicates) for criterion in plan.criteria)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+def project_row(row: Dict[str, str]) -> Dict[str, str]:
+    return {column: row.get(column, '') for column in PREDICATE_COLUMNS}
+
+def get_bit(bitmap: bytearray, position: int) -> bool:
+    index = position >> 3
+    return index < len(bitmap) and bool(bitmap[index] & (1 << (position & 7)))
+
+def set_bit(bitmap: bytearray, position: int, value: bool):
+    index = position >> 3
+    if index >= len(bitmap):
+        if not value:
+            return
+        bitmap.extend(bytes(index + 1 - len(bitmap)))
+    if value:
+        bitmap[index] |= 1 << (position & 7)
+    else:
+        bitmap[index] &= ~(1 << (position & 7)) & 0xFF
+
+class EligibilityState:
+    """
+    Eligibility matrix with one mutable bitmap per scholarship over stable student positions
+    """
+
+    def __init__(self):
+        self.students: List[Optional[str]] = []
+        self.free_positions: List[int] = []
+        self.positions: Dict[str, int] = {}
+        self.rows: Dict[str, Dict[str, str]] = {}
+        self.matrix: Dict[int, bytearray] = {}
+        self.plan_signatures: Dict[int, str] = {}
+        self.updated_at = None
+
+    def add_student(self, student_id: str, row: Dict[str, str]) -> int:
+        # Reuse a position freed by a removed student before growing the bitmaps
+        if self.free_positions:
+            position = self.free_positions.pop()
+            self.students[position] = student_id
+        else:
+            position = len(self.students)
+            self.students.append(student_id)
+        self.positions[student_id] = position
+        self.rows[student_id] = row
+        return position
+
+    def remove_student(self, student_id: str) -> int:
+        position = self.positions.pop(student_id)
+        self.students[position] = None
+        self.free_positions.append(position)
+        del self.rows[student_id]
+        return position
+
+    def eligible_students(self, scholarship_id: int) -> List[str]:
+        bitmap = self.matrix.get(scholarship_id, bytearray())
+        return [self.students[position] for position in bit_positions(int.from_bytes(bitmap, 'little'))]
+
+    def to_dict(self) -> Dict:
+        return {
+            'updated_at': self.updated_at,
+            'columns': PREDICATE_COLUMNS,
+            'students': self.students,
+            'rows': {student_id: [row[column] for column in PREDICATE_COLUMNS] for student_id, row in self.rows.items()},
+            'plan_signatures': {str(sid): signature for sid, signature in self.plan_signatures.items()},
+            'matrix': {str(sid): bitmap.hex() for sid, bitmap in self.matrix.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'EligibilityState':
+        state = cls()
+        if data.get('columns') != PREDICATE_COLUMNS:
+            raise ValueError("Stored state uses different predicate columns; run a full evaluation")
+        state.updated_at = data.get('updated_at')
+        state.students = data['students']
+        state.positions = {student_id: position for position, student_id in enumerate(state.students)
+                           if student_id is not None}
+        state.free_positions = [position for position, student_id in enumerate(state.students) if student_id is None]
+        state.rows = {student_id: dict(zip(PREDICATE_COLUMNS, values)) for student_id, values in data['rows'].items()}
+        state.plan_signatures = {int(sid): signature for sid, signature in data['plan_signatures'].items()}
+        state.matrix = {int(sid): bytearray.fromhex(bitmap) for sid, bitmap in data['matrix'].items()}
+        return state
+
+def load_state(path: str) -> Optional[EligibilityState]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return EligibilityState.from_dict(json.load(f))
+
+def save_state(state: EligibilityState, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    state.updated_at = datetime.now().isoformat(timespec='seconds')
+    write_text_atomic(path, json.dumps(state.to_dict(), separators=(',', ':')))
+
+def full_evaluation(plans: List[ScholarshipPlan], rows: List[Dict[str, str]]) -> EligibilityState:
+    """
+    Build the state from scratch for one roster
+    """
+    state = EligibilityState()
+    projected = [project_row(row) for row in rows]
+    for row in projected:
+        state.add_student(row[STUDENT_ID_COLUMN], row)
+    roster = RosterIndex(projected)
+    byte_length = (roster.size + 7) // 8
+    for plan in plans:
+        state.matrix[plan.scholarship_id] = bytearray(evaluate_plan(plan, roster).to_bytes(byte_length, 'little'))
+        state.plan_signatures[plan.scholarship_id] = plan_signature(plan)
+    return state
+
+def apply_results(state: EligibilityState, plan: ScholarshipPlan, roster: RosterIndex, student_ids: List[str],
+                  changes: List[Dict], reason: str):
+    """
+    Write one plan's results for the evaluated students into the matrix, logging flips
+    """
+    eligible_ranks = set(bit_positions(evaluate_plan(plan, roster)))
+    bitmap = state.matrix.setdefault(plan.scholarship_id, bytearray())
+    for rank, student_id in enumerate(student_ids):
+        eligible = rank in eligible_ranks
+        position = state.positions[student_id]
+        if get_bit(bitmap, position) != eligible:
+            set_bit(bitmap, position, eligible)
+            changes.append({'student_id': student_id, 'scholarship_id': plan.scholarship_id,
+                            'change': 'newly_eligible' if eligible else 'newly_ineligible', 'reason': reason})
+
+def apply_delta(state: EligibilityState, plans: List[ScholarshipPlan], rows: Iterable[Dict[str, str]]) -> Dict:
+    """
+    Update state in place for a new roster and return the change log plus counts
+    """
+    changes: List[Dict] = []
+    plans_by_id = {plan.scholarship_id: plan for plan in plans}
+    plan_columns = {plan.scholarship_id: plan_source_columns(plan) for plan in plans}
+
+    # Scholarships that were removed or whose predicates changed
+    for scholarship_id in [sid for sid in state.matrix if sid not in plans_by_id]:
+        for student_id in state.eligible_students(scholarship_id):
+            changes.append({'student_id': student_id, 'scholarship_id': scholarship_id,
+                            'change': 'newly_ineligible', 'reason': 'scholarship_removed'})
+        del state.matrix[scholarship_id]
+        state.plan_signatures.pop(scholarship_id, None)
+    changed_plans = [plan for plan in plans if state.plan_signatures.get(plan.scholarship_id) != plan_signature(plan)]
+
+    # Diff students by ID on the predicate columns
+    new_rows = {}
+    for row in rows:
+        projected = project_row(row)
+        new_rows[projected[STUDENT_ID_COLUMN]] = projected
+    removed = [student_id for student_id in state.rows if student_id not in new_rows]
+    added = [student_id for student_id in new_rows if student_id not in state.rows]
+    changed_columns: Dict[str, Set[str]] = {}
+    for student_id, row in new_rows.items():
+        previous = state.rows.get(student_id)
+        if previous is not None and previous != row:
+            changed_columns[student_id] = {column for column in PREDICATE_COLUMNS if previous[column] != row[column]}
+
+    for student_id in removed:
+        position = state.remove_student(student_id)
+        for scholarship_id, bitmap in state.matrix.items():
+            if get_bit(bitmap, position):
+                set_bit(bitmap, position, False)
+                changes.append({'student_id': student_id, 'scholarship_id': scholarship_id,
+                                'change': 'newly_ineligible', 'reason': 'student_removed'})
+    for student_id in added:
+        state.add_student(student_id, new_rows[student_id])
+    for student_id in changed_columns:
+        state.rows[student_id] = new_rows[student_id]
+
+    # Changed scholarships: every current student
+    if changed_plans:
+        student_ids = list(state.rows)
+        roster = RosterIndex([state.rows[student_id] for student_id in student_ids])
+        for plan in changed_plans:
+            apply_results(state, plan, roster, student_ids, changes, 'criteria_changed')
+            state.plan_signatures[plan.scholarship_id] = plan_signature(plan)
+    changed_plan_ids = {plan.scholarship_id for plan in changed_plans}
+
+    # Changed students: only the scholarships that read one of their changed columns
+    affected_students: Dict[int, List[str]] = {}
+    for student_id, columns in changed_columns.items():
+        for scholarship_id, plan_cols in plan_columns.items():
+            if scholarship_id not in changed_plan_ids and plan_cols & columns:
+                affected_students.setdefault(scholarship_id, []).append(student_id)
+    for student_id in added:
+        for scholarship_id in plan_columns:
+            if scholarship_id not in changed_plan_ids:
+                affected_students.setdefault(scholarship_id, []).append(student_id)
+
+    evaluated_students = sorted({student_id for ids in affected_students.values() for student_id in ids})
+    if evaluated_students:
+        rank_of = {student_id: rank for rank, student_id in enumerate(evaluated_students)}
+        roster = RosterIndex([state.rows[student_id] for student_id in evaluated_students])
+        for scholarship_id, student_ids in affected_students.items():
+            plan = plans_by_id[scholarship_id]
+            eligible_ranks = set(bit_positions(evaluate_plan(plan, roster)))
+            bitmap = state.matrix.setdefault(scholarship_id, bytearray())
+            for student_id in student_ids:
+                eligible = rank_of[student_id] in eligible_ranks
+                position = state.positions[student_id]
+                if get_bit(bitmap, position) != eligible:
+                    set_bit(bitmap, position, eligible)
+                    reason = 'student_added' if student_id not in changed_columns else \
+                        'changed:' + '|'.join(sorted(changed_columns[student_id] & plan_columns[scholarship_id]))
+                    changes.append({'student_id': student_id, 'scholarship_id': scholarship_id,
+                                    'change': 'newly_eligible' if eligible else 'newly_ineligible', 'reason': reason})
+
+    return {
+        'changes': changes,
+        'students_added': len(added),
+        'students_removed': len(removed),
+        'students_changed': len(changed_columns),
+        'scholarships_changed': len(changed_plans),
+        'pairs_evaluated': sum(len(ids) for ids in affected_students.values()) + len(changed_plans) * len(state.rows)
+    }
+
+def write_change_log(changes: List[Dict], path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['student_id', 'scholarship_id', 'change', 'reason'])
+        writer.writeheader()
+        writer.writerows(changes)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update the eligibility matrix for a new Banner extract")
+    parser.add_argument('roster', help="Banner extract CSV")
+    parser.add_argument('--state', default=os.path.join(ELIGIBILITY_DIR, STATE_FILE))
+    parser.add_argument('--full', action='store_true', help="Ignore the stored state and evaluate everything")
+    args = parser.parse_args()
+
+    plans = compile_corpus(get_scholarship_files())
+    start = time.perf_counter()
+    rows = read_roster(args.roster)
+    read_seconds = time.perf_counter() - start
+
+    state = None if args.full else load_state(args.state)
+    start = time.perf_counter()
+    if state is None:
+        state = full_evaluation(plans, rows)
+        print(f"Full evaluation of {len(rows)} students × {len(plans)} scholarships in "
+              f"{time.perf_counter() - start:.2f} s")
+    else:
+        result = apply_delta(state, plans, rows)
+        elapsed = time.perf_counter() - start
+        changes = result.pop('changes')
+        log_path = os.path.join(os.path.dirname(args.state),
+                                f"changes_{datetime.now().strftime('%Y%m%dT%H%M%S')}.csv")
+        write_change_log(changes, log_path)
+        newly_eligible = sum(1 for change in changes if change['change'] == 'newly_eligible')
+        print(f"Delta in {elapsed:.3f} s (roster read {read_seconds:.2f} s): {result}")
+        print(f"{newly_eligible} newly eligible, {len(changes) - newly_eligible} newly ineligible → {log_path}")
+
+    save_state(state, args.state)
+    print(f"State saved to {args.state}")
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Eligibility Engine
+Compiles each scholarship's hard criteria into SIS predicates over Banner roster
+columns and evaluates them for a whole roster at once:
+- Each criterion is an OR of SIS conditions; a scholarship ANDs its criteria
+- The roster is indexed once (value → student bitset for text columns, sorted
+  values for numeric columns), so a predicate costs one lookup or one bisect and
+  a criterion/scholarship is a handful of int & | operations over all students
+- Major, minor and college slots are exploded into dictionary-encoded long tables
+  (banner_slots.py), so an SIS_Major* condition is one lookup across all slots and
+  the SIS variants naming the same slots and value share one mask
+- Criteria that Banner cannot answer (applications, essays, unmapped SIS fields)
+  are kept on the plan as `unevaluated` for manual review
+
+    python eligibility_engine.py roster.csv
+"""
+
+import operator
+import re
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from banner_roster import read_roster
+from banner_slots import SLOT_COLUMNS, SLOT_VARIANT_BITS, SLOT_VARIANTS, SlotIndex, explode_slots, student_slots, variant_columns
+from bitsets import bit_positions, mask_from_ranks
+from derived_artifacts import load_scholarships
+from improved_processor import get_scholarship_files
+
+# SIS field → (kind, roster columns checked). Multi-slot fields match if any slot matches.
+SIS_FIELD_COLUMNS = {
+    **{field: ('text', variant_columns(field)) for field in SLOT_VARIANTS},
+    'SIS_Classification': ('text', ('Classification',)),
+    'SIS_Level': ('text', ('Level',)),
+    'SIS_Enrolled_Status': ('text', ('Enrolled Status',)),
+    'SIS_Gender': ('text', ('Gender Description',)),
+    'SIS_High_School_Name': ('text', ('High School',)),
+    'SIS_OKResidency': ('text', ('OK Resident',)),
+    'SIS_Athlete': ('text', ('Athlete',)),
+    'SIS_CumGPA': ('number', ('Cumulative GPA',)),
+    'SIS_Enrolled HRS': ('number', ('Term Hours Enrolled',)),
+    'SIS_Overall_Hours': ('number', ('Cumulative Hours',)),
+    'SIS_UCO_Completed_Hours': ('number', ('UCO Completed Hours',)),
+    'SIS_Transfer_Hours': ('number', ('Transfer Hours',)),
+}
+
+FULL_TIME_HOURS = 12
+GENDER_DESCRIPTIONS = {'F': 'Female', 'M': 'Male'}
+
+# Numeric predicate operators, for checking one student without a roster index
+COMPARISONS = {'>=': operator.ge, '>': operator.gt, '<=': operator.le, '<': operator.lt, '=': operator.eq}
+
+CONDITION_PATTERN = re.compile(r'^(SIS_[A-Za-z0-9_ ]+?)\s*(>=|<=|=|>|<|is)\s*(.+?)\s*$')
+CONDITION_SPLIT = re.compile(r'\s+or\s+(?=SIS_)')
+
+class Predicate(NamedTuple):
+    field: str
+    op: str
+    value: object
+    kind: str
+    columns: Tuple[str, ...]
+
+class CompiledCriterion(NamedTuple):
+    criteria_id: Optional[int]
+    description: str
+    predicates: Tuple[Predicate, ...]
+
+class ScholarshipPlan(NamedTuple):
+    scholarship_id: int
+    name: str
+    college_code: str
+    criteria: Tuple[CompiledCriterion, ...]
+    unevaluated: Tuple[str, ...]
+
+def normalize_text(value: str) -> str:
+    return ' '.join(str(value).split()).casefold()
+
+def parse_number(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def compile_predicate(condition: str) -> Optional[Predicate]:
+    """
+    One "SIS_Field op value" condition, or None if Banner cannot answer it
+    """
+    match = CONDITION_PATTERN.match(condition.strip())
+    if not match or match.group(1) not in SIS_FIELD_COLUMNS:
+        return None
+    field, op, raw_value = match.groups()
+    kind, columns = SIS_FIELD_COLUMNS[field]
+
+    if kind == 'number':
+        value = parse_number(raw_value)
+        if value is None or op == 'is':
+            return None
+        return Predicate(field, op, value, kind, columns)
+    if op not in ('is', '='):
+        return None
+    return Predicate(field, '=', normalize_text(raw_value), kind, columns)
+
+def compile_criterion(criteria: Dict) -> Optional[CompiledCriterion]:
+    """
+    A criterion is compiled only if every OR'd condition is a Banner predicate
+    """
+    description = criteria.get('description', '')
+    if 'SIS_' not in description:
+        return None
+    predicates = []
+    for condition in CONDITION_SPLIT.split(description.strip()):
+        predicate = compile_predicate(condition)
+        if predicate is None:
+            return None
+        predicates.append(predicate)
+    return CompiledCriterion(criteria.get('id'), description, tuple(dict.fromkeys(predicates)))
+
+def compile_scholarship(scholarship: Dict) -> ScholarshipPlan:
+    basic_info = scholarship.get('basic_information', {})
+    compiled = []
+    unevaluated = []
+    for criteria in scholarship.get('hard_criteria', {}).get('criteria', []):
+        criterion = compile_criterion(criteria)
+        if criterion is None:
+            unevaluated.append(criteria.get('description', ''))
+        else:
+            compiled.append(criterion)
+    return ScholarshipPlan(basic_info.get('scholarship_id'), basic_info.get('scholarship_name', ''),
+                           basic_info.get('college_code') or 'GENERAL', tuple(compiled), tuple(unevaluated))
+
+def compile_corpus(json_files: Iterable[str]) -> List[ScholarshipPlan]:
+    return [compile_scholarship(scholarship) for scholarship in load_scholarships(json_files)
+            if scholarship is not None]
+
+# Banner columns each derived column is computed from
+DERIVED_COLUMN_SOURCES = {
+    'Enrolled Status': ('Term Hours Enrolled',),
+    'Gender Description': ('Gender',),
+    'OK Resident': ('Residency',),
+    'Athlete': ('Sport Code',),
+    'UCO Completed Hours': ('Cumulative Hours', 'Transfer Hours'),
+}
+
+def source_columns(columns: Iterable[str]) -> set:
+    """
+    Banner columns behind a set of roster/derived columns
+    """
+    return {source for column in columns for source in DERIVED_COLUMN_SOURCES.get(column, (column,))}
+
+def plan_source_columns(plan: 'ScholarshipPlan') -> set:
+    return source_columns(column for criterion in plan.criteria
+                          for predicate in criterion.predicates for column in predicate.columns)
+
+def derive_columns(row: Dict[str, str]) -> Dict[str, object]:
+    """
+    Roster columns the SIS fields need that Banner does not export directly
+    """
+    enrolled_hours = parse_number(row.get('Term Hours Enrolled'))
+    cumulative_hours = parse_number(row.get('Cumulative Hours'))
+    transfer_hours = parse_number(row.get('Transfer Hours')) or 0.0
+    return {
+        'Enrolled Status': '' if enrolled_hours is None else
+                           ('Full Time' if enrolled_hours >= FULL_TIME_HOURS else 'Part Time'),
+        'Gender Description': GENDER_DESCRIPTIONS.get(row.get('Gender', ''), row.get('Gender', '')),
+        'OK Resident': 'Yes' if row.get('Residency') == 'Resident' else 'No',
+        'Athlete': 'Yes' if row.get('Sport Code') else 'No',
+        'UCO Completed Hours': None if cumulative_hours is None else max(0.0, cumulative_hours - transfer_hours),
+    }
+
+class RosterIndex:
+    """
+    Column indexes over one roster; bit i of every mask is the i-th student
+    """
+
+    def __init__(self, rows: List[Dict[str, str]]):
+        self.student_ids = [row.get('ID', '') for row in rows]
+        self.size = len(rows)
+        self.all_mask = (1 << self.size) - 1
+        self._mask_cache: Dict[Tuple, int] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        text_columns = {column for kind, columns in SIS_FIELD_COLUMNS.values() if kind == 'text'
+                        for column in columns if column not in SLOT_COLUMNS}
+        number_columns = {column for kind, columns in SIS_FIELD_COLUMNS.values() if kind == 'number' for column in columns}
+
+        text_ranks: Dict[str, Dict[str, List[int]]] = {column: {} for column in text_columns}
+        number_values: Dict[str, List[Tuple[float, int]]] = {column: [] for column in number_columns}
+        for rank, row in enumerate(rows):
+            derived = derive_columns(row)
+            for column in text_columns:
+                value = derived[column] if column in derived else row.get(column)
+                if value:
+                    text_ranks[column].setdefault(normalize_text(value), []).append(rank)
+            for column in number_columns:
+                value = derived[column] if column in derived else parse_number(row.get(column))
+                if value is not None:
+                    number_values[column].append((value, rank))
+
+        self.text = {column: {value: mask_from_ranks(ranks, self.size) for value, ranks in values.items()}
+                     for column, values in text_ranks.items()}
+        self.numbers = {}
+        for column, pairs in number_values.items():
+            pairs.sort()
+            self.numbers[column] = ([value for value, _ in pairs], [rank for _, rank in pairs])
+
+        # Slot columns come from the long slot tables; the per-column maps share their masks
+        self.slots = {family: SlotIndex(table, self.size) for family, table in explode_slots(rows, normalize_text).items()}
+        for column, (family, slot) in SLOT_COLUMNS.items():
+            self.text[column] = self.slots[family].column_values(slot)
+
+    def predicate_mask(self, predicate: Predicate) -> int:
+        # Keyed without the field name, so SIS variants covering the same columns share one mask
+        key = predicate[1:]
+        mask = self._mask_cache.get(key)
+        if mask is not None:
+            self.cache_hits += 1
+            return mask
+
+        self.cache_misses += 1
+        slot_variant = SLOT_VARIANTS.get(predicate.field)
+        if slot_variant is not None:
+            mask = self.slots[slot_variant[0]].mask(predicate.value, slot_variant[1])
+        else:
+            mask = 0
+            for column in predicate.columns:
+                mask |= self.column_mask(predicate, column)
+
+        self._mask_cache[key] = mask
+        return mask
+
+    def column_mask(self, predicate: Predicate, column: str) -> int:
+        """
+        Students matching a predicate on one of its columns
+        """
+        if predicate.kind == 'text':
+            return self.text[column].get(predicate.value, 0)
+        values, ranks = self.numbers[column]
+        threshold = predicate.value
+        if predicate.op == '>=':
+            selected = ranks[bisect_left(values, threshold):]
+        elif predicate.op == '>':
+            selected = ranks[bisect_right(values, threshold):]
+        elif predicate.op == '<=':
+            selected = ranks[:bisect_right(values, threshold)]
+        elif predicate.op == '<':
+            selected = ranks[:bisect_left(values, threshold)]
+        else:
+            selected = ranks[bisect_left(values, threshold):bisect_right(values, threshold)]
+        return mask_from_ranks(selected, self.size)
+
+    def student_list(self, mask: int) -> List[str]:
+        return [self.student_ids[rank] for rank in bit_positions(mask)]
+
+def evaluate_plan(plan: ScholarshipPlan, roster: RosterIndex) -> int:
+    """
+    Bitset of students who meet every Banner-checkable hard criterion of one scholarship
+    """
+    mask = roster.all_mask
+    for criterion in plan.criteria:
+        criterion_mask = 0
+        for predicate in criterion.predicates:
+            criterion_mask |= roster.predicate_mask(predicate)
+        mask &= criterion_mask
+        if not mask:
+            break
+    return mask
+
+def student_record(row: Dict[str, str]) -> Dict[str, object]:
+    """
+    Every column the SIS predicates read for one student, normalized the way
+    RosterIndex indexes it (None when missing), plus per slot family the slots
+    holding each value
+    """
+    derived = derive_columns(row)
+    record: Dict[str, object] = student_slots(row, normalize_text)
+    for kind, columns in SIS_FIELD_COLUMNS.values():
+        for column in columns:
+            if column in record:
+                continue
+            value = derived[column] if column in derived else row.get(column)
+            if kind == 'text':
+                record[column] = normalize_text(value) if value else None
+            else:
+                record[column] = value if column in derived else parse_number(value)
+    return record
+
+def predicate_matches(predicate: Predicate, record: Dict[str, object]) -> bool:
+    slot_variant = SLOT_VARIANT_BITS.get(predicate.field)
+    if slot_variant is not None:
+        return bool(record[slot_variant[0]].get(predicate.value, 0) & slot_variant[1])
+    if predicate.kind == 'text':
+        for column in predicate.columns:
+            if record[column] == predicate.value:
+                return True
+        return False
+    compare = COMPARISONS[predicate.op]
+    for column in predicate.columns:
+        value = record[column]
+        if value is not None and compare(value, predicate.value):
+            return True
+    return False
+
+def student_eligible(plan: ScholarshipPlan, record: Dict[str, object]) -> bool:
+    """
+    Per-student check of one plan: criteria and their predicates are tried in plan
+    order and stop at the first failing criterion / first matching predicate
+    """
+    for criterion in plan.criteria:
+        for predicate in criterion.predicates:
+            if predicate_matches(predicate, record):
+                break
+        else:
+            return False
+    return True
+
+def evaluate_student(plans: Iterable[ScholarshipPlan], row: Dict[str, str]) -> List[int]:
+    """
+    Eligible scholarship ids of one student, without building a roster index
+    """
+    record = student_record(row)
+    return [plan.scholarship_id for plan in plans if student_eligible(plan, record)]
+
+def evaluate_roster(plans: Iterable[ScholarshipPlan], roster: RosterIndex) -> Dict[int, int]:
+    """
+    Eligible-student bitset per scholarship id
+    """
+    return {plan.scholarship_id: evaluate_plan(plan, roster) for plan in plans}
+
+def eligible_by_student(results: Dict[int, int], roster: RosterIndex) -> List[List[int]]:
+    """
+    Invert per-scholarship bitsets into the eligible scholarship ids of each student
+    """
+    by_student = [[] for _ in range(roster.size)]
+    for scholarship_id, mask in results.items():
+        for rank in bit_positions(mask):
+            by_student[rank].append(scholarship_id)
+    return by_student
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python eligibility_engine.py ROSTER.csv")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    plans = compile_corpus(get_scholarship_files())
+    compiled_at = time.perf_counter()
+    roster = RosterIndex(read_roster(sys.argv[1]))
+    indexed_at = time.perf_counter()
+    results = evaluate_roster(plans, roster)
+    evaluated_at = time.perf_counter()
+
+    pairs = sum(mask.bit_count() for mask in results.values())
+    fully_checked = sum(1 for plan in plans if not plan.unevaluated)
+    print(f"Compiled {len(plans)} scholarships ({fully_checked} fully Banner-checkable) in "
+          f"{(compiled_at - start) * 1000:.0f} ms")
+    print(f"Indexed {roster.size} students in {(indexed_at - compiled_at) * 1000:.0f} ms")
+    print(f"Evaluated {len(plans) * roster.size:,} student/scholarship pairs in "
+          f"{(evaluated_at - indexed_at) * 1000:.0f} ms: {pairs:,} eligible")
+    checked_plans = [plan for plan in plans if plan.criteria]
+    for plan in sorted(checked_plans, key=lambda p: -results[p.scholarship_id].bit_count())[:10]:
+        print(f"  {results[plan.scholarship_id].bit_count():>6}  {plan.scholarship_id}  {plan.name}")
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Eligibility Service Snapshots
+The API server answers catalog and eligibility requests from an immutable
+CorpusSnapshot (the loaded corpus, its catalog index and the compiled eligibility
+plans). When the scholarship files or file-list.json change, the next snapshot is
+built in a background thread and swapped in with one reference assignment:
+- Requests grab the current snapshot once and finish on it, even if a swap happens
+- A failed build keeps serving the previous snapshot and is reported in metrics
+- Change detection polls (mtime, size) like watch_mode.py; watchdog only wakes it early
+- Unchanged files reuse their parsed records from the previous snapshot, so a
+  rebuild only re-reads what changed before re-indexing
+- When predicate statistics have been collected (predicate_ordering.py), the
+  snapshot's plans are put in cost order so roster evaluation stops at the most
+  rejecting criterion first; new statistics are picked up by the next build
+
+    python eligibility_service.py            # build once and print the snapshot metrics
+"""
+
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from catalog_index import CatalogIndex, build_catalog_record
+from derived_artifacts import MANIFEST_FILE, load_scholarships
+from eligibility_engine import ScholarshipPlan, compile_scholarship
+from improved_processor import SCHOLARSHIP_JSON_DIR
+from predicate_ordering import STATS_FILE, PredicateStatistics, load_statistics, order_plan
+from watch_mode import FileSignature, scan_directory, start_change_notifier
+
+DEFAULT_POLL_INTERVAL = 2.0
+
+class CorpusSnapshot(NamedTuple):
+    version: int
+    fingerprint: str
+    built_at: str
+    build_seconds: float
+    catalog: CatalogIndex
+    plans: List[ScholarshipPlan]
+    plans_by_id: Dict[int, ScholarshipPlan]
+    # path → (signature, catalog record, plan) for reuse by the next build
+    files: Dict[str, Tuple[FileSignature, Dict, ScholarshipPlan]]
+    # Files taken unchanged from the previous snapshot instead of being re-read
+    reused_files: int
+    # Whether plans are in cost order (predicate statistics available) or file order
+    cost_ordered: bool = False
+
+def corpus_signatures(json_dir: str) -> Tuple[Dict[str, FileSignature], str]:
+    """
+    (mtime, size) of every scholarship file, and a fingerprint that also covers the manifest
+    """
+    signatures = scan_directory(json_dir)
+    manifest_path = os.path.join(json_dir, MANIFEST_FILE)
+    digest = hashlib.sha256()
+    if os.path.exists(manifest_path):
+        stat = os.stat(manifest_path)
+        digest.update(f"{MANIFEST_FILE}:{stat.st_mtime_ns}:{stat.st_size}\n".encode('utf-8'))
+    for path, (mtime_ns, size) in sorted(signatures.items()):
+        digest.update(f"{os.path.basename(path)}:{mtime_ns}:{size}\n".encode('utf-8'))
+    return signatures, digest.hexdigest()[:16]
+
+def build_snapshot(signatures: Dict[str, FileSignature], version: int, fingerprint: str,
+                   previous: Optional[CorpusSnapshot] = None,
+                   stats: Optional[PredicateStatistics] = None) -> CorpusSnapshot:
+    """
+    Build every index a request might need, re-reading only files that changed since previous;
+    with stats the plans are put in cost order (files keeps them in file order for reuse)
+    """
+    start = time.perf_counter()
+    files = {}
+    changed = []
+    for json_file in sorted(signatures):
+        reused = previous.files.get(json_file) if previous else None
+        if reused is not None and reused[0] == signatures[json_file]:
+            files[json_file] = reused
+        else:
+            changed.append(json_file)
+    reused_files = len(files)
+
+    for json_file, scholarship in zip(changed, load_scholarships(changed)):
+        reused = previous.files.get(json_file) if previous else None
+        if scholarship is not None:
+            files[json_file] = (signatures[json_file], build_catalog_record(scholarship),
+                                compile_scholarship(scholarship))
+        elif reused is not None:
+            # Unreadable mid-edit: keep serving the last good version of this scholarship
+            files[json_file] = reused
+
+    files = {json_file: files[json_file] for json_file in sorted(files)}
+    records = [record for _, record, _ in files.values()]
+    plans = [plan for _, _, plan in files.values()]
+    if stats is not None:
+        plans = [order_plan(plan, stats) for plan in plans]
+
+    catalog = CatalogIndex(records)
+    return CorpusSnapshot(
+        version=version,
+        fingerprint=fingerprint,
+        built_at=datetime.now().isoformat(timespec='seconds'),
+        build_seconds=time.perf_counter() - start,
+        catalog=catalog,
+        plans=plans,
+        plans_by_id={plan.scholarship_id: plan for plan in plans},
+        files=files,
+        reused_files=reused_files,
+        cost_ordered=stats is not None
+    )
+
+class SnapshotManager:
+    """
+    Holds the current CorpusSnapshot and replaces it when the corpus changes
+    """
+
+    def __init__(self, json_dir: str = SCHOLARSHIP_JSON_DIR, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 stats_path: Optional[str] = STATS_FILE):
+        self.json_dir = json_dir
+        self.stats_path = stats_path
+        self.poll_interval = poll_interval
+        self._snapshot: Optional[CorpusSnapshot] = None
+        self._build_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._observer = None
+        self.builds = 0
+        self.failed_builds = 0
+        self.last_error = None
+        self.files_reused = 0
+        self.files_loaded = 0
+
+    def current(self) -> CorpusSnapshot:
+        """
+        The snapshot to use for one request; built synchronously only the very first time
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.refresh()
+            snapshot = self._snapshot
+            if snapshot is None:
+                raise RuntimeError(f"No corpus snapshot available: {self.last_error}")
+        return snapshot
+
+    def refresh(self) -> bool:
+        """
+        Build and swap in a new snapshot if the corpus changed. Returns True on swap.
+        """
+        with self._build_lock:
+            signatures, fingerprint = corpus_signatures(self.json_dir)
+            previous = self._snapshot
+            if previous is not None and previous.fingerprint == fingerprint:
+                return False
+            try:
+                stats = load_statistics(self.stats_path) if self.stats_path else None
+                snapshot = build_snapshot(signatures, (previous.version if previous else 0) + 1, fingerprint, previous,
+                                          stats)
+            except Exception as e:
+                self.failed_builds += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                return False
+            # Single reference assignment: readers see either the old or the new snapshot
+            self._snapshot = snapshot
+            self.builds += 1
+            self.files_reused += snapshot.reused_files
+            self.files_loaded += len(snapshot.files) - snapshot.reused_files
+            self.last_error = None
+            return True
+
+    def start(self):
+        """
+        Watch the corpus in a background thread
+        """
+        if self._thread is not None:
+            return
+        self._observer = start_change_notifier(self.json_dir, self._wake)
+        self._thread = threading.Thread(target=self._run, name='snapshot-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._observer is not None:
+            self._observer.stop()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if not self._stop.is_set():
+                self.refresh()
+
+    def metrics(self) -> Dict:
+        snapshot = self._snapshot
+        return {
+            'version': snapshot.version if snapshot else 0,
+            'fingerprint': snapshot.fingerprint if snapshot else None,
+            'built_at': snapshot.built_at if snapshot else None,
+            'build_seconds': round(snapshot.build_seconds, 4) if snapshot else None,
+            'scholarships': len(snapshot.plans) if snapshot else 0,
+            'catalog_version': snapshot.catalog.version if snapshot else None,
+            'cost_ordered': snapshot.cost_ordered if snapshot else False,
+            'builds': self.builds,
+            'failed_builds': self.failed_builds,
+            'files_reused': self.files_reused,
+            'files_loaded': self.files_loaded,
+            'last_error': self.last_error
+        }
+
+if __name__ == "__main__":
+    manager = SnapshotManager()
+    manager.current()
+    for key, value in manager.metrics().items():
+        print(f"{key:>15}: {value}")
@@ -1,94 +1,37 @@
 #!/usr/bin/env python3
 """
 Fully Automatable Scholarships Analysis
-Detailed analysis of scholarships that can be 100% automated through Banner
+Detailed analysis of scholarships that can be 100% automated through Banner,
+read from the automation view in derived_data
 """
 
-import json
-import glob
-from collections import defaultdict
+from typing import List, Optional
 
-def analyze_fully_automatable_scholarships():
+from banner_automation_analysis import automation_entries
+
+def analyze_fully_automatable_scholarships(json_files: Optional[List[str]] = None):
     """
     Analyze scholarships that are 100% automatable through Banner
     """
-    json_files = glob.glob('/Users/Nayan/Documents/UCO-Foundation/Python/Scholarship_info_website/scholarship_json_files/*.json')
-    json_files = [f for f in json_files if not f.endswith('file-list.json')]
-    
     fully_automatable = []
     
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                scholarship = json.load(f)
-            
-            basic_info = scholarship.get('basic_information', {})
-            hard_criteria = scholarship.get('hard_criteria', {})
-            
-            if not hard_criteria.get('criteria'):
-                continue
-            
-            # Check if ALL criteria are banner_accessible
-            all_banner_accessible = True
-            banner_fields_used = []
-            
-            for criteria in hard_criteria['criteria']:
-                if criteria.get('banner_accessibility') != 'banner_accessible':
-                    all_banner_accessible = False
-                    break
-                
-                # Extract Banner fields used
-                description = criteria.get('description', '')
-                if 'SIS_Major' in description:
-                    banner_fields_used.append('Major')
-                if 'SIS_Minor' in description:
-                    banner_fields_used.append('Minor')
-                if 'SIS_Classification' in description:
-                    banner_fields_used.append('Classification')
-                if 'SIS_CumGPA' in description:
-                    banner_fields_used.append('GPA')
-                if 'SIS_College' in description:
-                    banner_fields_used.append('College')
-                if 'SIS_Resident' in description:
-                    banner_fields_used.append('Residency')
-                if 'SIS_Hours' in description:
-                    banner_fields_used.append('Credit Hours')
-                if 'SIS_Gender' in description:
-                    banner_fields_used.append('Gender')
-                if 'SIS_Hispanic' in description:
-                    banner_fields_used.append('Hispanic/Latino')
-                if 'SIS_Level' in description:
-                    banner_fields_used.append('Academic Level')
-            
-            if all_banner_accessible:
-                scholarship_info = {
-                    'id': basic_info.get('scholarship_id'),
-                    'name': basic_info.get('scholarship_name', ''),
-                    'code': basic_info.get('scholarship_code', ''),
-                    'donor': basic_info.get('donor_name', ''),
-                    'committee': basic_info.get('committee_name', ''),
-                    'candidate_count': basic_info.get('candidate_count', 0),
-                    'total_criteria': len(hard_criteria['criteria']),
-                    'banner_fields': list(set(banner_fields_used)),
-                    'criteria_details': [],
-                    'renewable': scholarship.get('renewable_information', {}).get('is_renewable', False)
-                }
-                
-                # Add detailed criteria information
-                for i, criteria in enumerate(hard_criteria['criteria'], 1):
-                    criteria_detail = {
-                        'number': i,
-                        'type': criteria.get('type', 'unknown'),
-                        'description': criteria.get('clean_description') or criteria.get('description', ''),
-                        'banner_field': criteria.get('description', '').split()[0] if criteria.get('description') else '',
-                        'parsed_sis': criteria.get('parsed_sis', {})
-                    }
-                    scholarship_info['criteria_details'].append(criteria_detail)
-                
-                fully_automatable.append(scholarship_info)
-                
-        except Exception as e:
-            print(f"Error processing {json_file}: {e}")
+    for entry in automation_entries(json_files):
+        # Check if ALL hard criteria are banner_accessible
+        if not entry['hard_criteria_automatable']:
+            continue
+        
+        fully_automatable.append({
+            'id': entry['id'],
+            'name': entry['name'],
+            'code': entry['code'],
+            'donor': entry['donor'],
+            'committee': entry['committee'],
+            'candidate_count': entry['candidate_count'],
+            'total_criteria': entry['hard_criteria_count'],
+            'banner_fields': entry['banner_fields'],
+            'criteria_details': entry['criteria_details'],
+            'renewable': entry['renewable']
+        })
     
     return fully_automatable
 
@@ -6,10 +6,27 @@ Improved Scholarship JSON Processor
 - Improves SIS field parsing to handle duplicates
 """
 
+import argparse
+import hashlib
 import json
-import glob
+import os
 import re
-from typing import Dict, List, Set
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import corpus_storage
+import json_backend
+from pipeline_metrics import PipelineMetrics, run_with_capture, write_report
+from schema_migrations import apply_migrations, encode_json, write_text_atomic
+
+SCHOLARSHIP_JSON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scholarship_json_files')
+
+def get_scholarship_files(json_dir: str = SCHOLARSHIP_JSON_DIR) -> List[str]:
+    """
+    List scholarship JSON files in a directory, excluding file-list.json; compressed
+    files (<id>.json.gz) are listed under their stored path
+    """
+    return corpus_storage.list_files(json_dir)
 
 def parse_sis_criteria(raw_text: str) -> Dict:
     """
@@ -74,93 +91,132 @@ def parse_sis_criteria(raw_text: str) -> Dict:
     
     return result
 
-def categorize_banner_accessibility(criteria_type: str, description: str) -> str:
+# Fields directly available from Banner
+BANNER_ACCESSIBLE_PATTERNS = [
+    # Academic information
+    'SIS_Major', 'SIS_Minor', 'SIS_Classification', 'SIS_College', 'SIS_Level',
+    'SIS_CumGPA', 'SIS_MajorGPA', 'SIS_Hours', 'SIS_Term_Hours', 'SIS_Cumulative_Hours',
+    'SIS_Enrolled HRS', 'SIS_Enrolled_HRS', 'SIS_UCO_Completed_Hours',
+
+    # Student demographics  
+    'SIS_Gender', 'SIS_Hispanic', 'SIS_Resident', 'SIS_Residency',
+
+    # Enrollment status
+    'SIS_Enrolled_Status', 'SIS_Term_Enrolled', 'SIS_Full_Time', 'SIS_Part_Time',
+
+    # Academic history
+    'SIS_Transfer_Hours', 'SIS_Admission_Type', 'SIS_Term_Admitted',
+    'SIS_High_School', 'SIS_High_School_Name',
+
+    # Financial aid (from Banner FAFSA integration)
+    'SIS_FAFSA', 'SIS_Unmet_Need', 'SIS_Financial_Need',
+
+    # Athletics (if Sport Code is tracked)
+    'SIS_Sport', 'SIS_Athletic'
+]
+
+# Requirements that need application materials
+APPLICATION_PATTERNS = [
+    'Complete Attachment', 'Complete Essay', 'Upload', 'Submit',
+    'Provide', 'Must provide', 'statement', 'essay', 'attachment',
+    'portfolio', 'writing sample', 'recommendation', 'letter',
+    'transcript', 'resume', 'interview'
+]
+
+# Special cases that might need manual review despite being in Banner
+MANUAL_REVIEW_PATTERNS = [
+    'demonstrated financial need', 'extracurricular activities',
+    'community service', 'leadership', 'volunteer', 'employment',
+    'family income', 'hardship', 'circumstances'
+]
+
+# Version of the rule set above; changes whenever any pattern list changes
+RULESET_VERSION = hashlib.sha256(json.dumps(
+    [BANNER_ACCESSIBLE_PATTERNS, APPLICATION_PATTERNS, MANUAL_REVIEW_PATTERNS]
+).encode('utf-8')).hexdigest()[:12]
+
+# Optional rule hit recorder (see categorizer_telemetry.py); None keeps categorization overhead-free
+CATEGORIZER_TELEMETRY = None
+# Optional persistent categorization cache (see categorization_cache.py); None categorizes every time
+CATEGORIZATION_CACHE = None
+
+def match_banner_rule(description: str) -> Tuple[str, str]:
     """
-    Determine if criteria can be accessed from Banner system
-    Based on actual Banner data fields available:
-    Term Code, Term, PIDM, ID, First Name, Last Name, Gender, Hispanic/Latino Flag,
-    Term Hours Enrolled, Term Hours Billed, Residency, Sport Code, High School,
-    Level, Classification, College 1, Major Code 1, Major 1, College 2, Major Code 2,
-    Major 2, College Code 3, Major Code 3, Major 3, Minor Code 1, Minor 1,
-    Minor Code 2, Minor 2, Minor Code 3, Minor 3, Term Admitted, Admission Type,
-    Transfer Hours, Cumulative Hours, Cumulative GPA, Unmet Need, FAFSA, Emails
+    Find the first categorization rule matching a criteria description.
+    Returns (category, rule), where rule names the pattern list and the pattern that fired.
     """
-    
-    # Fields directly available from Banner
-    banner_accessible_patterns = [
-        # Academic information
-        'SIS_Major', 'SIS_Minor', 'SIS_Classification', 'SIS_College', 'SIS_Level',
-        'SIS_CumGPA', 'SIS_MajorGPA', 'SIS_Hours', 'SIS_Term_Hours', 'SIS_Cumulative_Hours',
-        'SIS_Enrolled HRS', 'SIS_Enrolled_HRS', 'SIS_UCO_Completed_Hours',
-        
-        # Student demographics  
-        'SIS_Gender', 'SIS_Hispanic', 'SIS_Resident', 'SIS_Residency',
-        
-        # Enrollment status
-        'SIS_Enrolled_Status', 'SIS_Term_Enrolled', 'SIS_Full_Time', 'SIS_Part_Time',
-        
-        # Academic history
-        'SIS_Transfer_Hours', 'SIS_Admission_Type', 'SIS_Term_Admitted',
-        'SIS_High_School', 'SIS_High_School_Name',
-        
-        # Financial aid (from Banner FAFSA integration)
-        'SIS_FAFSA', 'SIS_Unmet_Need', 'SIS_Financial_Need',
-        
-        # Athletics (if Sport Code is tracked)
-        'SIS_Sport', 'SIS_Athletic'
-    ]
-    
-    # Requirements that need application materials
-    application_patterns = [
-        'Complete Attachment', 'Complete Essay', 'Upload', 'Submit',
-        'Provide', 'Must provide', 'statement', 'essay', 'attachment',
-        'portfolio', 'writing sample', 'recommendation', 'letter',
-        'transcript', 'resume', 'interview'
-    ]
-    
-    # Special cases that might need manual review despite being in Banner
-    manual_review_patterns = [
-        'demonstrated financial need', 'extracurricular activities',
-        'community service', 'leadership', 'volunteer', 'employment',
-        'family income', 'hardship', 'circumstances'
-    ]
-    
     description_lower = description.lower()
     
     # Check if it's Banner accessible FIRST (these take priority)
-    for pattern in banner_accessible_patterns:
+    for pattern in BANNER_ACCESSIBLE_PATTERNS:
         if description.startswith(pattern):
-            return 'banner_accessible'
+            return 'banner_accessible', f'banner_prefix:{pattern}'
     
     # Additional check for SIS patterns with operators (>=, <=, =, is, etc.)
     if description.startswith('SIS_'):
         # Extract the field name (everything before the first space or operator)
         field_name = description.split()[0].split('>=')[0].split('<=')[0].split('=')[0].split(' is')[0]
-        if field_name in banner_accessible_patterns:
-            return 'banner_accessible'
+        if field_name in BANNER_ACCESSIBLE_PATTERNS:
+            return 'banner_accessible', f'banner_field:{field_name}'
     
     # Check for manual review patterns (these override application requirements)
-    for pattern in manual_review_patterns:
+    for pattern in MANUAL_REVIEW_PATTERNS:
         if pattern in description_lower:
-            return 'manual_review'
+            return 'manual_review', f'manual_review:{pattern}'
     
     # Check if it's application required
-    for pattern in application_patterns:
+    for pattern in APPLICATION_PATTERNS:
         if pattern.lower() in description_lower:
-            return 'application_required'
+            return 'application_required', f'application:{pattern}'
     
     # Default to manual review for unknown criteria
-    return 'manual_review'
+    return 'manual_review', 'default'
+
+def categorize_banner_accessibility(criteria_type: str, description: str) -> str:
+    """
+    Determine if criteria can be accessed from Banner system
+    Based on actual Banner data fields available:
+    Term Code, Term, PIDM, ID, First Name, Last Name, Gender, Hispanic/Latino Flag,
+    Term Hours Enrolled, Term Hours Billed, Residency, Sport Code, High School,
+    Level, Classification, College 1, Major Code 1, Major 1, College 2, Major Code 2,
+    Major 2, College Code 3, Major Code 3, Major 3, Minor Code 1, Minor 1,
+    Minor Code 2, Minor 2, Minor Code 3, Minor 3, Term Admitted, Admission Type,
+    Transfer Hours, Cumulative Hours, Cumulative GPA, Unmet Need, FAFSA, Emails
+    """
+    return categorize_with_rule(description)[0]
+
+def categorize_with_rule(description: str) -> Tuple[str, str]:
+    """
+    match_banner_rule, recorded on the telemetry when one is installed
+    """
+    if CATEGORIZER_TELEMETRY is None:
+        return match_banner_rule(description)
+    
+    rule_start = time.perf_counter()
+    category, rule = match_banner_rule(description)
+    CATEGORIZER_TELEMETRY.record(rule, category, time.perf_counter() - rule_start)
+    return category, rule
 
-def improve_criteria_parsing(criteria_item: Dict) -> Dict:
+def improve_criteria_parsing(criteria_item: Dict, metrics: Optional[PipelineMetrics] = None) -> Dict:
     """
     Improve the parsing of criteria items
     """
+    if metrics:
+        parse_start = time.perf_counter()
+    
     improved_item = criteria_item.copy()
+    description = improved_item['description']
+    cached = CATEGORIZATION_CACHE.get(description) if CATEGORIZATION_CACHE is not None else None
     
     # Parse SIS criteria for better organization
-    if any(field in improved_item['description'] for field in ['SIS_Major', 'SIS_Minor', 'SIS_Classification']):
-        parsed_sis = parse_sis_criteria(improved_item['description'])
+    if cached is not None:
+        parsed_sis = cached.parsed_sis
+    elif any(field in description for field in ['SIS_Major', 'SIS_Minor', 'SIS_Classification']):
+        parsed_sis = parse_sis_criteria(description)
+    else:
+        parsed_sis = None
+    
+    if parsed_sis is not None:
         improved_item['parsed_sis'] = parsed_sis
         
         # Create a cleaner description
@@ -175,32 +231,62 @@ def improve_criteria_parsing(criteria_item: Dict) -> Dict:
         if clean_parts:
             improved_item['clean_description'] = ' | '.join(clean_parts)
     
+    if metrics:
+        categorize_start = time.perf_counter()
+        metrics.add('parse', categorize_start - parse_start)
+    
     # Add Banner accessibility
-    improved_item['banner_accessibility'] = categorize_banner_accessibility(
-        improved_item['type'], 
-        improved_item['description']
-    )
+    if cached is not None:
+        improved_item['banner_accessibility'] = cached.category
+        if CATEGORIZER_TELEMETRY is not None:
+            # The rule still decided this criterion, only its result was remembered
+            CATEGORIZER_TELEMETRY.record(cached.rule, cached.category, 0.0, cached=True)
+    else:
+        category, rule = categorize_with_rule(description)
+        improved_item['banner_accessibility'] = category
+        if CATEGORIZATION_CACHE is not None:
+            CATEGORIZATION_CACHE.put(description, category, rule, parsed_sis)
+    
+    if metrics:
+        metrics.add('categorize', time.perf_counter() - categorize_start)
     
     return improved_item
 
-def process_scholarship_json(json_file_path: str) -> bool:
+def process_scholarship_json(json_file_path: str, metrics: Optional[PipelineMetrics] = None,
+                             changed_files: Optional[List[str]] = None) -> bool:
     """
-    Process a single scholarship JSON file with improvements
+    Process a single scholarship JSON file with improvements.
+    Stage timings are recorded on metrics when one is passed; the path is appended
+    to changed_files when its content changed.
     """
+    file_start = time.perf_counter()
+    criteria_count = 0
+    
     try:
         # Read the JSON file
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            scholarship_data = json.load(f)
+        raw_json = corpus_storage.read_text(json_file_path)
+        
+        decode_start = time.perf_counter()
+        scholarship_data = json_backend.loads(raw_json)
+        
+        if metrics:
+            metrics.add('read', decode_start - file_start)
+            metrics.add('decode', time.perf_counter() - decode_start)
         
-        # Handle both qualifying_criteria (old) and hard_criteria (current)
-        if 'qualifying_criteria' in scholarship_data:
-            hard_criteria = scholarship_data.pop('qualifying_criteria')
-            # Update the description
-            hard_criteria['description'] = "Hard requirements that must be met to qualify for the scholarship"
-        elif 'hard_criteria' in scholarship_data:
+        # Bring the file up to the current schema (qualifying_criteria rename, progress_status, ...)
+        scholarship_data, applied_migrations = apply_migrations(scholarship_data)
+        
+        if 'hard_criteria' in scholarship_data:
             hard_criteria = scholarship_data['hard_criteria']
         else:
-            # No criteria to process
+            # No criteria to process, only persist schema changes
+            if applied_migrations:
+                write_text_atomic(json_file_path, encode_json(scholarship_data))
+                if changed_files is not None:
+                    changed_files.append(json_file_path)
+            if metrics:
+                metrics.record_write(bool(applied_migrations))
+                metrics.record_file(json_file_path, time.perf_counter() - file_start, 0)
             return True
         
         # Improve each criteria item
@@ -210,7 +296,7 @@ def process_scholarship_json(json_file_path: str) -> bool:
         manual_review_count = 0
         
         for criteria in hard_criteria['criteria']:
-            improved_criteria_item = improve_criteria_parsing(criteria)
+            improved_criteria_item = improve_criteria_parsing(criteria, metrics)
             improved_criteria.append(improved_criteria_item)
             
             # Count by accessibility type
@@ -243,7 +329,7 @@ def process_scholarship_json(json_file_path: str) -> bool:
             general_manual_review_count = 0
             
             for criteria in general_criteria['criteria']:
-                improved_criteria_item = improve_criteria_parsing(criteria)
+                improved_criteria_item = improve_criteria_parsing(criteria, metrics)
                 improved_general_criteria.append(improved_criteria_item)
                 
                 # Count by accessibility type
@@ -266,50 +352,117 @@ def process_scholarship_json(json_file_path: str) -> bool:
             
             scholarship_data['general_criteria'] = general_criteria
         
-        # Add progress_status field if it doesn't exist
-        if 'progress_status' not in scholarship_data:
-            scholarship_data['progress_status'] = 'not-processed'
+        criteria_count = len(improved_criteria) + len(scholarship_data.get('general_criteria', {}).get('criteria', []))
         
         # Write back the improved JSON
-        with open(json_file_path, 'w', encoding='utf-8') as f:
-            json.dump(scholarship_data, f, indent=2, ensure_ascii=False)
+        encode_start = time.perf_counter()
+        json_text = encode_json(scholarship_data)
+        write_start = time.perf_counter()
+        # Unchanged files are left alone, so their mtimes do not look like edits to watchers
+        changed = json_text != raw_json
+        if changed:
+            write_text_atomic(json_file_path, json_text)
+            if changed_files is not None:
+                changed_files.append(json_file_path)
+        
+        if metrics:
+            metrics.add('encode', write_start - encode_start)
+            metrics.add('write', time.perf_counter() - write_start)
+            metrics.record_write(changed)
+            metrics.record_file(json_file_path, time.perf_counter() - file_start, criteria_count)
         
         return True
         
     except Exception as e:
         print(f"Error processing {json_file_path}: {e}")
+        if metrics:
+            metrics.record_file(json_file_path, time.perf_counter() - file_start, criteria_count, ok=False)
         return False
 
-def update_all_scholarships():
+def update_all_scholarships(json_files: Optional[List[str]] = None,
+                            metrics: Optional[PipelineMetrics] = None) -> Dict:
     """
     Update all scholarship JSON files with improvements
     """
-    json_files = glob.glob('/Users/Nayan/Documents/UCO-Foundation/Python/Scholarship_info_website/scholarship_json_files/*.json')
-    
-    # Exclude file-list.json
-    json_files = [f for f in json_files if not f.endswith('file-list.json')]
+    if json_files is None:
+        json_files = get_scholarship_files()
     
     print(f"Found {len(json_files)} scholarship files to process...")
     
     updated_count = 0
     failed_count = 0
+    changed = []
     
-    for json_file in json_files:
-        if process_scholarship_json(json_file):
+    for processed, json_file in enumerate(json_files, 1):
+        if process_scholarship_json(json_file, metrics, changed):
             updated_count += 1
         else:
             failed_count += 1
         
-        if updated_count % 50 == 0:
-            print(f"Processed {updated_count} files...")
+        if processed % 50 == 0:
+            print(f"Processed {processed} files...")
+    
+    if metrics:
+        metrics.finish()
     
-    print(f"\\nProcessing complete!")
+    print(f"\nProcessing complete!")
     print(f"Successfully updated: {updated_count}")
     print(f"Failed: {failed_count}")
+    
+    return {'updated': updated_count, 'failed': failed_count, 'changed': changed}
 
-if __name__ == "__main__":
-    update_all_scholarships()
+def update_derived_views(result: Dict, json_dir: str):
+    """
+    Refresh the derived index and automation view for the files whose content changed
+    """
+    from derived_artifacts import update_artifacts
+    update_artifacts(result['changed'], json_dir=json_dir)
+    print(f"Derived artifacts refreshed for {len(result['changed'])} changed files")
 
+def run_pipeline(args: argparse.Namespace):
+    json_files = get_scholarship_files(args.json_dir)
+    if not (args.report or args.profile or args.tracemalloc):
+        update_derived_views(update_all_scholarships(json_files), args.json_dir)
+        return
+    
+    metrics = PipelineMetrics(slowest_n=args.slowest)
+    result, capture = run_with_capture(lambda: update_all_scholarships(json_files, metrics),
+                                       profile=args.profile, trace_memory=args.tracemalloc)
+    update_derived_views(result, args.json_dir)
+    report = metrics.report()
+    report.update(capture)
+    
+    print(f"\n{report['files_per_second']:.1f} files/s, {report['criteria_per_second']:.1f} criteria/s, "
+          f"{report['files_written']} files written, {report['writes_skipped']} unchanged")
+    for stage, stage_report in report['stages'].items():
+        print(f"  {stage:<11} {stage_report['seconds'] * 1000:9.1f} ms ({stage_report['share'] * 100:.1f}%)")
+    
+    if args.report:
+        write_report(report, args.report)
+        print(f"Report written to {args.report}")
 
+def main():
+    parser = argparse.ArgumentParser(description="Reprocess scholarship JSON files")
+    parser.add_argument('--json-dir', default=SCHOLARSHIP_JSON_DIR, help="Directory of scholarship JSON files")
+    parser.add_argument('--report', help="Write a per-stage timing report (JSON) to this path")
+    parser.add_argument('--slowest', type=int, default=10, help="Number of slowest files to include in the report")
+    parser.add_argument('--profile', action='store_true', help="Capture a cProfile of the run into the report")
+    parser.add_argument('--tracemalloc', action='store_true', help="Capture memory allocations into the report")
+    parser.add_argument('--no-cache', action='store_true', help="Recategorize every description (skip categorization_cache)")
+    args = parser.parse_args()
+    
+    if args.no_cache:
+        run_pipeline(args)
+        return
+    
+    from categorization_cache import use_categorization_cache
+    with use_categorization_cache() as cache:
+        run_pipeline(args)
+    print(f"Categorization cache: {cache.hits} hits, {cache.misses} misses, {len(cache)} entries")
 
 
+if __name__ == "__main__":
+    # Run the imported module, not __main__: the hooks other modules install
+    # (categorization cache, telemetry) are set on improved_processor
+    import improved_processor
+    improved_processor.main()
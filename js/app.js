@@ -38,7 +38,12 @@ function calculateComplexityScore(scholarship) {
 function determineProgressStatus(scholarship) {
     const scholarshipId = scholarship.basic_information.scholarship_id;
     
-    // Check localStorage first for any manual overrides
+    // Shared server-side status takes precedence when the progress API is available
+    if (serverProgressStatuses && serverProgressStatuses[scholarshipId]) {
+        return serverProgressStatuses[scholarshipId].status;
+    }
+    
+    // Check localStorage for any manual overrides
     const localStatus = getLocalProgressStatus(scholarshipId);
     if (localStatus) {
         return localStatus;
@@ -63,6 +68,7 @@ function setLocalProgressStatus(scholarshipId, status) {
         const localStatuses = JSON.parse(localStorage.getItem('scholarshipProgressStatus') || '{}');
         localStatuses[scholarshipId] = status;
         localStorage.setItem('scholarshipProgressStatus', JSON.stringify(localStatuses));
+        queueServerProgressUpdate(scholarshipId, status);
         
         // Also update the in-memory scholarship data
         const scholarship = scholarships.find(s => s.basic_information.scholarship_id === scholarshipId);
@@ -77,6 +83,150 @@ function setLocalProgressStatus(scholarshipId, status) {
     }
 }
 
+// Server-side progress store (api_server.py). When it is reachable, status changes are
+// queued and sent in batches; localStorage remains the fallback for the static site.
+const PROGRESS_API_URL = 'api/progress';
+let serverProgressStatuses = null;
+let pendingServerProgressUpdates = {};
+let serverProgressFlushTimer = null;
+
+async function loadServerProgressStatuses() {
+    try {
+        const response = await fetch(PROGRESS_API_URL, { cache: 'no-store' });
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+        const data = await response.json();
+        serverProgressStatuses = data.statuses;
+    } catch (error) {
+        console.log('Progress API unavailable, using localStorage only:', error.message);
+        serverProgressStatuses = null;
+    }
+}
+
+function queueServerProgressUpdate(scholarshipId, status) {
+    if (!serverProgressStatuses) return;
+    
+    const current = serverProgressStatuses[scholarshipId];
+    pendingServerProgressUpdates[scholarshipId] = {
+        scholarship_id: scholarshipId,
+        status: status,
+        expected_version: current ? current.version : 0
+    };
+    
+    clearTimeout(serverProgressFlushTimer);
+    serverProgressFlushTimer = setTimeout(flushServerProgressUpdates, 500);
+}
+
+async function flushServerProgressUpdates() {
+    const updates = Object.values(pendingServerProgressUpdates);
+    pendingServerProgressUpdates = {};
+    if (updates.length === 0) return;
+    
+    try {
+        const response = await fetch(PROGRESS_API_URL, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ updates: updates })
+        });
+        const result = await response.json();
+        
+        (result.applied || []).forEach(entry => {
+            serverProgressStatuses[entry.scholarship_id] = { status: entry.status, version: entry.version };
+        });
+        if (result.conflicts && result.conflicts.length > 0) {
+            showNotification(`${result.conflicts.length} status change(s) conflicted with another update. Reload to see the latest.`, 'warning');
+        }
+    } catch (error) {
+        console.error('Error saving progress status to server:', error);
+    }
+}
+
+// Server-side catalog queries (api_server.py /api/catalog). When the API is available the
+// page only fetches the scholarships it displays; otherwise every file is loaded and filtered here.
+const CATALOG_API_URL = 'api/catalog';
+let catalogMode = false;
+let catalogTotal = 0;
+let catalogFacets = null;
+let catalogPageCursors = [null];
+let catalogRequestSeq = 0;
+
+function getCatalogQueryParams() {
+    const params = new URLSearchParams();
+    const searchTerm = document.getElementById('searchInput').value.trim();
+    const committeeFilter = document.getElementById('committeeFilter').value;
+    const renewableFilter = document.getElementById('renewableFilter').value;
+    const minGPA = document.getElementById('minGPA').value;
+    const levelFilter = document.getElementById('levelFilter').value;
+    const progressFilter = document.getElementById('progressFilter').value;
+    
+    if (searchTerm) params.set('q', searchTerm);
+    if (committeeFilter) params.set('committee', committeeFilter);
+    if (renewableFilter !== '') params.set('renewable', renewableFilter);
+    if (minGPA) params.set('gpa_min', minGPA);
+    if (levelFilter) params.set('level', levelFilter);
+    if (progressFilter) params.set('progress_status', progressFilter);
+    params.set('sort', document.getElementById('sortBy').value);
+    params.set('limit', itemsPerPage);
+    return params;
+}
+
+// Load one page of results; catalogPageCursors[n] holds the cursor where page n + 1 starts
+async function loadCatalogPage(page) {
+    const requestId = ++catalogRequestSeq;
+    const params = getCatalogQueryParams();
+    const cursor = catalogPageCursors[page - 1];
+    if (cursor) {
+        params.set('cursor', cursor);
+    }
+    
+    const response = await fetch(`${CATALOG_API_URL}?${params}`, { cache: 'no-store' });
+    if (!response.ok) {
+        throw new Error(`HTTP ${response.status}`);
+    }
+    const data = await response.json();
+    
+    // Ignore responses that arrive after a newer query was sent
+    if (requestId !== catalogRequestSeq) return false;
+    
+    data.items.forEach(scholarship => {
+        scholarship.progressStatus = determineProgressStatus(scholarship);
+    });
+    scholarships = data.items;
+    filteredScholarships = data.items;
+    catalogTotal = data.total;
+    catalogFacets = data.facets;
+    catalogPageCursors = catalogPageCursors.slice(0, page);
+    if (data.next_cursor) {
+        catalogPageCursors.push(data.next_cursor);
+    }
+    currentPage = page;
+    return true;
+}
+
+async function showCatalogPage(page) {
+    try {
+        if (await loadCatalogPage(page)) {
+            displayScholarships();
+        }
+    } catch (error) {
+        console.error('Error querying catalog:', error);
+        showNotification('Failed to load scholarships from the server. Please try again.', 'error');
+    }
+}
+
+// Full scholarship record for the details modal (catalog results only carry card fields)
+async function loadFullScholarship(scholarshipId) {
+    const response = await fetch(`scholarship_json_files/${scholarshipId}.json`);
+    if (!response.ok) {
+        throw new Error(`HTTP ${response.status}`);
+    }
+    const scholarship = await response.json();
+    scholarship.complexityScore = calculateComplexityScore(scholarship);
+    scholarship.progressStatus = determineProgressStatus(scholarship);
+    return scholarship;
+}
+
 function getProgressStatusInfo(status) {
     const statusConfig = {
         'not-processed': {
@@ -235,6 +385,23 @@ async function loadScholarships() {
     console.log('Starting to load scholarships...');
     
     try {
+        // Shared progress statuses, if the API server is running
+        await loadServerProgressStatuses();
+        
+        // Query the catalog API when it is available instead of downloading every file
+        try {
+            await loadCatalogPage(1);
+            catalogMode = true;
+            console.log(`Catalog API available: ${catalogTotal} scholarships`);
+            populateFilters();
+            updateStatistics();
+            displayScholarships();
+            showLoading(false);
+            return;
+        } catch (error) {
+            console.log('Catalog API unavailable, loading all scholarship files:', error.message);
+        }
+        
         // Static list of all JSON files (GitHub Pages compatible)
         const jsonFiles = await getScholarshipFileList();
         console.log(`Found ${jsonFiles.length} JSON files to load`);
@@ -335,7 +502,9 @@ function populateFilters() {
     if (scholarships.length === 0) return;
     
     // Populate committee filter
-    const committees = [...new Set(scholarships.map(s => s.basic_information.committee_name))].sort();
+    const committees = catalogMode ?
+        Object.keys(catalogFacets.committee).sort() :
+        [...new Set(scholarships.map(s => s.basic_information.committee_name))].sort();
     const committeeFilter = document.getElementById('committeeFilter');
     committees.forEach(committee => {
         if (committee) {
@@ -349,6 +518,15 @@ function populateFilters() {
 
 // Update statistics
 function updateStatistics() {
+    if (catalogMode) {
+        // Facet counts from the unfiltered first query cover the whole catalog
+        const committeesCount = Object.keys(catalogFacets.committee).filter(name => name.trim() !== '').length;
+        document.getElementById('total-scholarships').textContent = catalogTotal.toLocaleString();
+        document.getElementById('renewable-scholarships').textContent = (catalogFacets.renewable.true || 0).toLocaleString();
+        document.getElementById('committees-count').textContent = committeesCount.toLocaleString();
+        return;
+    }
+    
     console.log('Updating statistics with', scholarships.length, 'scholarships');
     
     if (scholarships.length === 0) {
@@ -383,6 +561,12 @@ function updateStatistics() {
 
 // Apply filters
 function applyFilters() {
+    if (catalogMode) {
+        catalogPageCursors = [null];
+        showCatalogPage(1);
+        return;
+    }
+    
     const searchTerm = document.getElementById('searchInput').value.toLowerCase();
     const committeeFilter = document.getElementById('committeeFilter').value;
     const renewableFilter = document.getElementById('renewableFilter').value;
@@ -498,11 +682,12 @@ function displayScholarships() {
     const container = document.getElementById('scholarships-container');
     const startIndex = (currentPage - 1) * itemsPerPage;
     const endIndex = startIndex + itemsPerPage;
-    const pageScholarships = filteredScholarships.slice(startIndex, endIndex);
+    const pageScholarships = catalogMode ? filteredScholarships : filteredScholarships.slice(startIndex, endIndex);
+    const resultCount = catalogMode ? catalogTotal : filteredScholarships.length;
     
     // Update results count
     document.getElementById('results-count').textContent = 
-        `${filteredScholarships.length} scholarship${filteredScholarships.length !== 1 ? 's' : ''}`;
+        `${resultCount} scholarship${resultCount !== 1 ? 's' : ''}`;
     
     // Clear container
     container.innerHTML = '';
@@ -620,9 +805,19 @@ function createScholarshipCard(scholarship) {
 
 // Show scholarship details in modal
 async function showScholarshipDetails(scholarshipId) {
-    const scholarship = scholarships.find(s => s.basic_information.scholarship_id === scholarshipId);
+    let scholarship = scholarships.find(s => s.basic_information.scholarship_id === scholarshipId);
     if (!scholarship) return;
     
+    if (catalogMode) {
+        try {
+            scholarship = await loadFullScholarship(scholarshipId);
+        } catch (error) {
+            console.error(`Error loading scholarship ${scholarshipId}:`, error);
+            showNotification('Failed to load scholarship details.', 'error');
+            return;
+        }
+    }
+    
     const modalTitle = document.getElementById('scholarshipModalLabel');
     const modalBody = document.getElementById('scholarship-details');
     
@@ -736,7 +931,9 @@ async function showScholarshipDetails(scholarshipId) {
 
 // Update pagination
 function updatePagination() {
-    const totalPages = Math.ceil(filteredScholarships.length / itemsPerPage);
+    const totalPages = Math.ceil((catalogMode ? catalogTotal : filteredScholarships.length) / itemsPerPage);
+    // Catalog pages can only be reached through cursors already returned by the server
+    const lastReachablePage = catalogMode ? Math.min(totalPages, catalogPageCursors.length) : totalPages;
     const pagination = document.getElementById('pagination');
     
     pagination.innerHTML = '';
@@ -751,7 +948,7 @@ function updatePagination() {
     
     // Page numbers
     const startPage = Math.max(1, currentPage - 2);
-    const endPage = Math.min(totalPages, currentPage + 2);
+    const endPage = Math.min(lastReachablePage, currentPage + 2);
     
     for (let i = startPage; i <= endPage; i++) {
         const li = document.createElement('li');
@@ -769,6 +966,13 @@ function updatePagination() {
 
 // Change page
 function changePage(page) {
+    if (catalogMode) {
+        if (page < 1 || page > catalogPageCursors.length) return;
+        showCatalogPage(page);
+        document.getElementById('scholarships').scrollIntoView({ behavior: 'smooth' });
+        return;
+    }
+    
     const totalPages = Math.ceil(filteredScholarships.length / itemsPerPage);
     if (page < 1 || page > totalPages) return;
     
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+JSON Backend
+Encodes and decodes scholarship files with the fastest installed library while
+keeping the on-disk format byte-identical to json.dumps(indent=2, ensure_ascii=False):
+- orjson is used when installed; without it (or with SCHOLARSHIP_JSON_BACKEND=stdlib)
+  everything goes through the stdlib json module
+- orjson writes a few values differently (floats in exponent form, NaN/Infinity,
+  non-string keys, ints beyond 64 bits), so a document holding any of them is
+  encoded by the stdlib instead; inputs orjson rejects are decoded by the stdlib
+- Verify mode (SCHOLARSHIP_JSON_VERIFY=1 or set_verify) also encodes every document
+  with the stdlib, writes the stdlib bytes and counts any difference
+
+    python json_backend.py              # verify the corpus and time both backends
+"""
+
+import json
+import math
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Union
+
+import corpus_storage
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKENDS = ('orjson', 'stdlib')
+JSON_INDENT = 2
+
+def available_backend(requested: Optional[str] = None) -> str:
+    requested = requested or os.environ.get('SCHOLARSHIP_JSON_BACKEND') or 'orjson'
+    if requested not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend {requested!r}; choose from {', '.join(BACKENDS)}")
+    return requested if requested == 'stdlib' or orjson is not None else 'stdlib'
+
+BACKEND = available_backend()
+VERIFY = os.environ.get('SCHOLARSHIP_JSON_VERIFY') == '1'
+# Documents encoded, sent to the stdlib because orjson would format them differently, and
+# (in verify mode) fast encodings that did not match the stdlib bytes
+STATS = {'encoded': 0, 'stdlib_fallbacks': 0, 'verified': 0, 'mismatches': 0}
+
+def set_backend(name: str) -> str:
+    global BACKEND
+    BACKEND = available_backend(name)
+    return BACKEND
+
+def set_verify(enabled: bool):
+    global VERIFY
+    VERIFY = enabled
+
+def stdlib_dumps(data) -> str:
+    """
+    The reference on-disk format
+    """
+    return json.dumps(data, indent=JSON_INDENT, ensure_ascii=False)
+
+def orjson_safe(value) -> bool:
+    """
+    True when orjson formats value exactly like the stdlib: plain containers with string
+    keys, and no floats that the stdlib would write in exponent form or as NaN/Infinity
+    """
+    kind = type(value)
+    if kind is dict:
+        for key, item in value.items():
+            if type(key) is not str or not orjson_safe(item):
+                return False
+        return True
+    if kind is list:
+        for item in value:
+            if not orjson_safe(item):
+                return False
+        return True
+    if kind is str or kind is bool or value is None:
+        return True
+    if kind is int:
+        return -2 ** 63 <= value < 2 ** 64
+    if kind is float:
+        return math.isfinite(value) and 'e' not in repr(value)
+    return False
+
+def dumps(data) -> str:
+    """
+    Encode a document in the repository's on-disk JSON format
+    """
+    STATS['encoded'] += 1
+    if BACKEND == 'stdlib':
+        return stdlib_dumps(data)
+    if not orjson_safe(data):
+        STATS['stdlib_fallbacks'] += 1
+        return stdlib_dumps(data)
+    text = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    if VERIFY:
+        STATS['verified'] += 1
+        expected = stdlib_dumps(data)
+        if text != expected:
+            STATS['mismatches'] += 1
+            return expected
+    return text
+
+def loads(text: Union[str, bytes]):
+    if BACKEND == 'orjson':
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity literals and huge ints are valid for the stdlib; anything else raises there too
+            pass
+    return json.loads(text)
+
+def verify_files(json_files: List[str]) -> Dict:
+    """
+    Round-trip every file through both backends; a file counts as identical when the
+    fast encoding of its fast decoding equals the stdlib encoding byte for byte
+    """
+    identical = 0
+    mismatched = []
+    for json_file, text in zip(json_files, corpus_storage.read_texts(json_files)):
+        data = loads(text)
+        if dumps(data) == stdlib_dumps(json.loads(text)):
+            identical += 1
+        else:
+            mismatched.append(json_file)
+    return {'files': len(json_files), 'identical': identical, 'mismatched': mismatched}
+
+def time_backend(name: str, texts: List[str]) -> Dict[str, float]:
+    previous = BACKEND
+    set_backend(name)
+    try:
+        start = time.perf_counter()
+        documents = [loads(text) for text in texts]
+        decoded_at = time.perf_counter()
+        for document in documents:
+            dumps(document)
+        encoded_at = time.perf_counter()
+    finally:
+        set_backend(previous)
+    return {'decode': decoded_at - start, 'encode': encoded_at - decoded_at}
+
+if __name__ == "__main__":
+    from improved_processor import get_scholarship_files
+
+    json_files = get_scholarship_files()
+    print(f"Backend: {BACKEND} (orjson {'installed' if orjson is not None else 'not installed'})")
+    result = verify_files(json_files)
+    print(f"Byte-identical round trips: {result['identical']} of {result['files']}")
+    for json_file in result['mismatched']:
+        print(f"  MISMATCH {json_file}")
+
+    texts = corpus_storage.read_texts(json_files)
+    for name in BACKENDS:
+        if name == 'orjson' and orjson is None:
+            continue
+        timings = time_backend(name, texts)
+        print(f"  {name:<7} decode {timings['decode'] * 1000:7.1f} ms, encode {timings['encode'] * 1000:7.1f} ms")
+    sys.exit(1 if result['mismatched'] else 0)
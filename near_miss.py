@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Near-Miss Analysis
+Finds the students who are one Banner-checkable criterion away from a scholarship
+(a 2.95 GPA against 3.00, a business minor where a business major is required)
+and explains what they are missing:
+- Failures are counted over the whole roster at once: walking a plan's criteria
+  keeps two bitsets, "failed none so far" and "failed exactly one so far", updated
+  with a few & | ~ per criterion, so no (student, scholarship) pair is visited
+- Only pairs that failed exactly one criterion are expanded, into sparse groups per
+  scholarship and failing criterion: the students, their numeric gap for threshold
+  predicates and those holding a failed major/minor value in the other slot family
+- Failures are summarized by field with their gap distribution
+
+    python near_miss.py roster.csv                  # write derived_data/near_misses/near_misses.json
+    python near_miss.py roster.csv --max-gap 0.1    # numeric misses only when within 0.1 of the threshold
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from banner_roster import read_roster
+from bitsets import bit_positions
+from derived_artifacts import DERIVED_DIR
+from eligibility_engine import SIS_FIELD_COLUMNS, CompiledCriterion, Predicate, RosterIndex, ScholarshipPlan, compile_corpus
+from improved_processor import get_scholarship_files
+from schema_migrations import write_text_atomic
+
+NEAR_MISS_DIR = os.path.join(DERIVED_DIR, 'near_misses')
+NEAR_MISS_FILE = 'near_misses.json'
+
+# A failed text predicate on one slot family is "related" when the value sits in the other
+RELATED_COLUMNS = {
+    SIS_FIELD_COLUMNS['SIS_Major'][1]: SIS_FIELD_COLUMNS['SIS_Minor'][1],
+    SIS_FIELD_COLUMNS['SIS_Minor'][1]: SIS_FIELD_COLUMNS['SIS_Major'][1],
+}
+
+class NearMissGroup(NamedTuple):
+    """
+    Students who fail only one criterion of a scholarship
+    """
+    criterion: int                          # position in plan.criteria
+    field: str
+    student_ids: List[str]
+    gaps: Optional[List[Optional[float]]]   # per student distance to the closest numeric threshold
+    related: List[str]                      # students holding the missing major/minor value in the other slot family
+
+def criterion_field(criterion: CompiledCriterion) -> str:
+    """
+    Summary label of a criterion: its SIS fields without slot suffixes
+    """
+    return '/'.join(sorted({re.sub(r'(_[12])+$', '', predicate.field) for predicate in criterion.predicates}))
+
+def criterion_mask(criterion: CompiledCriterion, roster: RosterIndex) -> int:
+    mask = 0
+    for predicate in criterion.predicates:
+        mask |= roster.predicate_mask(predicate)
+    return mask
+
+def related_mask(criterion: CompiledCriterion, roster: RosterIndex) -> int:
+    mask = 0
+    for predicate in criterion.predicates:
+        for column in RELATED_COLUMNS.get(predicate.columns, ()):
+            mask |= roster.text[column].get(predicate.value, 0)
+    return mask
+
+def rank_values(roster: RosterIndex) -> Dict[str, List[Optional[float]]]:
+    """
+    Numeric roster columns by student rank, for the gaps of near-miss pairs
+    """
+    by_rank = {}
+    for column, (values, ranks) in roster.numbers.items():
+        column_values: List[Optional[float]] = [None] * roster.size
+        for value, rank in zip(values, ranks):
+            column_values[rank] = value
+        by_rank[column] = column_values
+    return by_rank
+
+def predicate_gap(predicate: Predicate, rank: int, values: Dict[str, List[Optional[float]]]) -> Optional[float]:
+    """
+    How far a failing student is from satisfying a numeric predicate (closest column)
+    """
+    gaps = []
+    for column in predicate.columns:
+        value = values[column][rank]
+        if value is None:
+            continue
+        if predicate.op in ('>=', '>'):
+            gaps.append(predicate.value - value)
+        elif predicate.op in ('<=', '<'):
+            gaps.append(value - predicate.value)
+        else:
+            gaps.append(abs(value - predicate.value))
+    return min(gaps) if gaps else None
+
+def criterion_gap(criterion: CompiledCriterion, rank: int, values: Dict[str, List[Optional[float]]]) -> Optional[float]:
+    gaps = [gap for gap in (predicate_gap(predicate, rank, values)
+                            for predicate in criterion.predicates if predicate.kind == 'number') if gap is not None]
+    return round(min(gaps), 6) if gaps else None
+
+def failure_masks(plan: ScholarshipPlan, roster: RosterIndex) -> Tuple[int, int, List[int]]:
+    """
+    (students failing no criterion, students failing exactly one, failing set per criterion)
+    """
+    passed_all = roster.all_mask
+    failed_one = 0
+    failing = []
+    for criterion in plan.criteria:
+        failed = roster.all_mask & ~criterion_mask(criterion, roster)
+        failing.append(failed)
+        failed_one = (failed_one & ~failed) | (passed_all & failed)
+        passed_all &= ~failed
+    return passed_all, failed_one, failing
+
+def plan_near_misses(plan: ScholarshipPlan, roster: RosterIndex, values: Dict[str, List[Optional[float]]],
+                     max_gap: Optional[float] = None) -> Tuple[int, List[NearMissGroup]]:
+    """
+    Eligible students and the one-criterion misses of one scholarship, grouped by failing criterion
+    """
+    eligible, failed_one, failing = failure_masks(plan, roster)
+    groups = []
+    for position, (criterion, failed) in enumerate(zip(plan.criteria, failing)):
+        near = failed_one & failed
+        if not near:
+            continue
+        ranks = bit_positions(near)
+        gaps = None
+        if any(predicate.kind == 'number' for predicate in criterion.predicates):
+            gaps = [criterion_gap(criterion, rank, values) for rank in ranks]
+            if max_gap is not None:
+                kept = [index for index, gap in enumerate(gaps) if gap is None or gap <= max_gap]
+                ranks = [ranks[index] for index in kept]
+                gaps = [gaps[index] for index in kept]
+                if not ranks:
+                    continue
+        related = related_mask(criterion, roster) & near
+        groups.append(NearMissGroup(position, criterion_field(criterion), [roster.student_ids[rank] for rank in ranks],
+                                    gaps, roster.student_list(related) if related else []))
+    return eligible, groups
+
+def find_near_misses(plans: Iterable[ScholarshipPlan], roster: RosterIndex,
+                     max_gap: Optional[float] = None) -> Dict[int, Dict]:
+    """
+    Near misses per scholarship with at least one Banner-checkable criterion
+    """
+    values = rank_values(roster)
+    results = {}
+    for plan in plans:
+        if not plan.criteria:
+            continue
+        eligible, groups = plan_near_misses(plan, roster, values, max_gap)
+        results[plan.scholarship_id] = {
+            'scholarship_id': plan.scholarship_id,
+            'scholarship_name': plan.name,
+            'college_code': plan.college_code,
+            'eligible_count': eligible.bit_count(),
+            'near_miss_count': sum(len(group.student_ids) for group in groups),
+            'unevaluated_criteria': len(plan.unevaluated),
+            'near_misses': [dict(group._asdict(), description=plan.criteria[group.criterion].description)
+                            for group in groups]
+        }
+    return results
+
+def summarize_by_field(results: Dict[int, Dict]) -> Dict[str, Dict]:
+    """
+    Near-miss pairs per failing field, with distinct students, related matches and gaps
+    """
+    fields: Dict[str, Dict] = {}
+    for result in results.values():
+        for group in result['near_misses']:
+            entry = fields.setdefault(group['field'], {'pairs': 0, 'students': set(), 'scholarships': 0,
+                                                       'related': 0, 'gaps': []})
+            entry['pairs'] += len(group['student_ids'])
+            entry['students'].update(group['student_ids'])
+            entry['scholarships'] += 1
+            entry['related'] += len(group['related'])
+            if group['gaps'] is not None:
+                entry['gaps'].extend(gap for gap in group['gaps'] if gap is not None)
+
+    summary = {}
+    for field, entry in sorted(fields.items(), key=lambda item: -item[1]['pairs']):
+        gaps = entry['gaps']
+        summary[field] = {
+            'pairs': entry['pairs'],
+            'students': len(entry['students']),
+            'scholarships': entry['scholarships'],
+            'related_matches': entry['related'],
+            'gap_min': min(gaps) if gaps else None,
+            'gap_median': statistics.median(gaps) if gaps else None
+        }
+    return summary
+
+def write_near_misses(results: Dict[int, Dict], summary: Dict[str, Dict], output_dir: str = NEAR_MISS_DIR) -> str:
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, NEAR_MISS_FILE)
+    write_text_atomic(path, json.dumps({'summary_by_field': summary,
+                                        'scholarships': [results[key] for key in sorted(results)]},
+                                       separators=(',', ':')))
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List students one Banner-checkable criterion away from each scholarship")
+    parser.add_argument('roster', help="Banner extract CSV")
+    parser.add_argument('--max-gap', type=float, help="Drop numeric misses further than this from the threshold")
+    parser.add_argument('--output', default=NEAR_MISS_DIR)
+    args = parser.parse_args()
+
+    plans = compile_corpus(get_scholarship_files())
+    roster = RosterIndex(read_roster(args.roster))
+    start = time.perf_counter()
+    results = find_near_misses(plans, roster, args.max_gap)
+    summary = summarize_by_field(results)
+    elapsed = time.perf_counter() - start
+
+    pairs = sum(result['near_miss_count'] for result in results.values())
+    print(f"Checked {roster.size} students × {len(results)} scholarships in {elapsed * 1000:.0f} ms: "
+          f"{pairs:,} near misses")
+    print(f"{'field':<36} {'pairs':>8} {'students':>9} {'related':>8} {'min gap':>8} {'median gap':>11}")
+    for field, entry in summary.items():
+        gap_min = f"{entry['gap_min']:.2f}" if entry['gap_min'] is not None else '-'
+        gap_median = f"{entry['gap_median']:.2f}" if entry['gap_median'] is not None else '-'
+        print(f"{field:<36} {entry['pairs']:>8} {entry['students']:>9} {entry['related_matches']:>8} "
+              f"{gap_min:>8} {gap_median:>11}")
+    print(f"  → {write_near_misses(results, summary, args.output)}")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Pipeline Metrics
+Per-stage timing and throughput for the scholarship processing pipeline:
+- Cumulative seconds for read, decode, parse, categorize, encode and write
+- Files per second and criteria per second
+- Files written back and files whose content was unchanged, so the write was skipped
+- Slowest N files
+- Optional cProfile / tracemalloc capture around a whole run
+Reports are plain dicts so they can be written as JSON and compared across runs.
+"""
+
+import cProfile
+import heapq
+import io
+import json
+import pstats
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+STAGES = ['read', 'decode', 'parse', 'categorize', 'encode', 'write']
+
+STAGE_DESCRIPTIONS = {
+    'read': 'Reading scholarship files from disk',
+    'decode': 'JSON decoding',
+    'parse': 'improve_criteria_parsing (excluding categorization)',
+    'categorize': 'categorize_banner_accessibility',
+    'encode': 'JSON encoding',
+    'write': 'Writing scholarship files to disk'
+}
+
+class PipelineMetrics:
+    """
+    Accumulates stage timings for one processing run
+    """
+
+    def __init__(self, slowest_n: int = 10):
+        self.slowest_n = slowest_n
+        self.stage_seconds = {stage: 0.0 for stage in STAGES}
+        self.files = 0
+        self.failed_files = 0
+        self.criteria = 0
+        self.files_written = 0
+        self.writes_skipped = 0
+        self.started = time.perf_counter()
+        self.finished = None
+        self._slowest: List[Tuple[float, str, int]] = []
+
+    def add(self, stage: str, seconds: float):
+        self.stage_seconds[stage] += seconds
+
+    def record_write(self, written: bool):
+        if written:
+            self.files_written += 1
+        else:
+            self.writes_skipped += 1
+
+    def record_file(self, path: str, seconds: float, criteria_count: int, ok: bool = True):
+        """
+        Record one processed file, keeping only the slowest N in a bounded heap
+        """
+        self.files += 1
+        self.criteria += criteria_count
+        if not ok:
+            self.failed_files += 1
+
+        entry = (seconds, path, criteria_count)
+        if len(self._slowest) < self.slowest_n:
+            heapq.heappush(self._slowest, entry)
+        elif entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    def report(self) -> Dict:
+        """
+        Machine-readable summary of the run
+        """
+        wall_seconds = (self.finished or time.perf_counter()) - self.started
+        staged_seconds = sum(self.stage_seconds.values())
+
+        return {
+            'wall_seconds': wall_seconds,
+            'files': self.files,
+            'failed_files': self.failed_files,
+            'criteria': self.criteria,
+            'files_written': self.files_written,
+            'writes_skipped': self.writes_skipped,
+            'files_per_second': self.files / wall_seconds if wall_seconds else 0,
+            'criteria_per_second': self.criteria / wall_seconds if wall_seconds else 0,
+            'stages': {
+                stage: {
+                    'description': STAGE_DESCRIPTIONS[stage],
+                    'seconds': seconds,
+                    'share': seconds / staged_seconds if staged_seconds else 0
+                }
+                for stage, seconds in self.stage_seconds.items()
+            },
+            'slowest_files': [
+                {'file': path, 'seconds': seconds, 'criteria': criteria_count}
+                for seconds, path, criteria_count in sorted(self._slowest, reverse=True)
+            ]
+        }
+
+def run_with_capture(func: Callable, profile: bool = False, trace_memory: bool = False,
+                     top_n: int = 20) -> Tuple[object, Dict]:
+    """
+    Run func under optional cProfile and tracemalloc capture.
+    Returns (func result, capture report).
+    """
+    capture = {}
+    profiler = cProfile.Profile() if profile else None
+
+    if trace_memory:
+        tracemalloc.start()
+    if profiler:
+        profiler.enable()
+
+    try:
+        result = func()
+    finally:
+        if profiler:
+            profiler.disable()
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            capture['memory'] = {
+                'current_bytes': current_bytes,
+                'peak_bytes': peak_bytes,
+                'top_allocations': [
+                    {'location': str(stat.traceback), 'bytes': stat.size, 'count': stat.count}
+                    for stat in snapshot.statistics('lineno')[:top_n]
+                ]
+            }
+
+    if profiler:
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        hot_functions = []
+        for (filename, line, name), (_, calls, total_time, cumulative_time, _) in stats.stats.items():
+            hot_functions.append({
+                'function': f"{filename}:{line}({name})",
+                'calls': calls,
+                'total_seconds': total_time,
+                'cumulative_seconds': cumulative_time
+            })
+        hot_functions.sort(key=lambda item: item['total_seconds'], reverse=True)
+        capture['profile'] = {'hot_functions': hot_functions[:top_n]}
+
+    return result, capture
+
+def write_report(report: Dict, path: str):
+    """
+    Write a metrics report as JSON
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
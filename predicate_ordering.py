@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Predicate Ordering
+Reorders each compiled plan so per-student checks reject early and cheaply:
+- Selectivity statistics are collected once from a roster snapshot: value counts
+  for every text column and a quantile sketch for every numeric column, so any
+  "SIS_Field op value" predicate can be estimated, not just the ones in today's corpus
+- Within a criterion (an OR) predicates are tried most-likely-to-match per
+  comparison first; across criteria (an AND) the criterion with the lowest
+  cost / rejection rate goes first, the classic order for independent filters
+- explain_plan shows the estimated pass rate and cost of every step
+- The saved statistics are applied by eligibility_service.py, so the API's snapshots
+  (and the eligibility batcher behind them) evaluate plans in cost order
+
+    python predicate_ordering.py roster.csv                 # collect stats, time file vs cost order
+    python predicate_ordering.py roster.csv --explain 1234  # show the plan of one scholarship
+"""
+
+import argparse
+import json
+import os
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from banner_roster import iter_roster, read_roster
+from banner_slots import SLOT_VARIANTS
+from eligibility_delta import ELIGIBILITY_DIR
+from eligibility_engine import (SIS_FIELD_COLUMNS, CompiledCriterion, Predicate, ScholarshipPlan, compile_corpus,
+                                evaluate_student, student_record)
+from improved_processor import get_scholarship_files
+from schema_migrations import write_text_atomic
+
+STATS_FILE = os.path.join(ELIGIBILITY_DIR, 'predicate_stats.json')
+QUANTILES = 256
+
+class PredicateStatistics:
+    """
+    Roster snapshot statistics: per text column value → count, per numeric column
+    a sorted quantile sketch of its present values and the share that is present
+    """
+
+    def __init__(self, size: int, text: Dict[str, Dict[str, int]], numbers: Dict[str, Tuple[List[float], float]]):
+        self.size = size
+        self.text = text
+        self.numbers = numbers
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, str]]) -> 'PredicateStatistics':
+        columns = {column: kind for kind, field_columns in SIS_FIELD_COLUMNS.values() for column in field_columns}
+        text: Dict[str, Dict[str, int]] = {column: {} for column, kind in columns.items() if kind == 'text'}
+        values: Dict[str, List[float]] = {column: [] for column, kind in columns.items() if kind == 'number'}
+        size = 0
+        for row in rows:
+            size += 1
+            record = student_record(row)
+            for column, counts in text.items():
+                value = record[column]
+                if value is not None:
+                    counts[value] = counts.get(value, 0) + 1
+            for column, column_values in values.items():
+                value = record[column]
+                if value is not None:
+                    column_values.append(value)
+        numbers = {}
+        for column, column_values in values.items():
+            column_values.sort()
+            if len(column_values) > QUANTILES:
+                step = (len(column_values) - 1) / (QUANTILES - 1)
+                sketch = [column_values[round(i * step)] for i in range(QUANTILES)]
+            else:
+                sketch = column_values
+            numbers[column] = (sketch, len(column_values) / size if size else 0.0)
+        return cls(size, text, numbers)
+
+    def column_share(self, predicate: Predicate, column: str) -> float:
+        if predicate.kind == 'text':
+            return self.text.get(column, {}).get(predicate.value, 0) / self.size if self.size else 0.0
+        sketch, present = self.numbers.get(column, ([], 0.0))
+        if not sketch:
+            return 0.0
+        threshold = predicate.value
+        if predicate.op == '>=':
+            matched = len(sketch) - bisect_left(sketch, threshold)
+        elif predicate.op == '>':
+            matched = len(sketch) - bisect_right(sketch, threshold)
+        elif predicate.op == '<=':
+            matched = bisect_right(sketch, threshold)
+        elif predicate.op == '<':
+            matched = bisect_left(sketch, threshold)
+        else:
+            matched = bisect_right(sketch, threshold) - bisect_left(sketch, threshold)
+        return present * matched / len(sketch)
+
+    def selectivity(self, predicate: Predicate) -> float:
+        """
+        Estimated share of students matching a predicate (any of its columns)
+        """
+        missed = 1.0
+        for column in predicate.columns:
+            missed *= 1.0 - self.column_share(predicate, column)
+        return 1.0 - missed
+
+    def to_dict(self) -> Dict:
+        return {
+            'collected_at': datetime.now().isoformat(timespec='seconds'),
+            'size': self.size,
+            'text': self.text,
+            'numbers': {column: {'quantiles': sketch, 'present': present}
+                        for column, (sketch, present) in self.numbers.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PredicateStatistics':
+        return cls(data['size'], data['text'],
+                   {column: (entry['quantiles'], entry['present']) for column, entry in data['numbers'].items()})
+
+def load_statistics(path: str = STATS_FILE) -> Optional[PredicateStatistics]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return PredicateStatistics.from_dict(json.load(f))
+
+def save_statistics(stats: PredicateStatistics, path: str = STATS_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_text_atomic(path, json.dumps(stats.to_dict()))
+
+def predicate_cost(predicate: Predicate) -> float:
+    """
+    Comparisons one predicate makes when it does not match: one per roster column,
+    or a single lookup for major/minor/college slots
+    """
+    return 1.0 if predicate.field in SLOT_VARIANTS else float(len(predicate.columns))
+
+def predicate_rank(predicate: Predicate, stats: PredicateStatistics) -> float:
+    # Inside an OR, try the test most likely to succeed per comparison first
+    selectivity = stats.selectivity(predicate)
+    return predicate_cost(predicate) / selectivity if selectivity > 0 else float('inf')
+
+def criterion_estimate(criterion: CompiledCriterion, stats: PredicateStatistics) -> Tuple[float, float]:
+    """
+    (pass rate, expected comparisons) of an OR of predicates in their current order,
+    treating predicates as independent
+    """
+    cost = 0.0
+    missed = 1.0
+    for predicate in criterion.predicates:
+        cost += missed * predicate_cost(predicate)
+        missed *= 1.0 - stats.selectivity(predicate)
+    return 1.0 - missed, cost
+
+def criterion_rank(criterion: CompiledCriterion, stats: PredicateStatistics) -> float:
+    # Inside an AND, run the test that rejects the most students per comparison first
+    pass_rate, cost = criterion_estimate(criterion, stats)
+    return cost / (1.0 - pass_rate) if pass_rate < 1.0 else float('inf')
+
+def plan_cost(plan: ScholarshipPlan, stats: PredicateStatistics) -> float:
+    """
+    Expected comparisons to check one student against a plan in its current order
+    """
+    cost = 0.0
+    reached = 1.0
+    for criterion in plan.criteria:
+        pass_rate, criterion_cost = criterion_estimate(criterion, stats)
+        cost += reached * criterion_cost
+        reached *= pass_rate
+    return cost
+
+def order_plan(plan: ScholarshipPlan, stats: PredicateStatistics) -> ScholarshipPlan:
+    """
+    The same plan with predicates and criteria in cost order; sorts are stable, so
+    ties keep their file order
+    """
+    criteria = [criterion._replace(predicates=tuple(sorted(criterion.predicates,
+                                                           key=lambda predicate: predicate_rank(predicate, stats))))
+                for criterion in plan.criteria]
+    criteria.sort(key=lambda criterion: criterion_rank(criterion, stats))
+    return plan._replace(criteria=tuple(criteria))
+
+def order_plans(plans: Iterable[ScholarshipPlan], stats: PredicateStatistics) -> List[ScholarshipPlan]:
+    return [order_plan(plan, stats) for plan in plans]
+
+def explain_plan(plan: ScholarshipPlan, stats: PredicateStatistics) -> List[str]:
+    """
+    Human-readable cost order of one plan: each criterion with its estimated pass rate,
+    expected comparisons and the share of students that reach it
+    """
+    ordered = order_plan(plan, stats)
+    lines = [f"{plan.scholarship_id} {plan.name}: {plan_cost(ordered, stats):.1f} expected comparisons per student "
+             f"(file order {plan_cost(plan, stats):.1f})"]
+    reached = 1.0
+    for step, criterion in enumerate(ordered.criteria, 1):
+        pass_rate, cost = criterion_estimate(criterion, stats)
+        lines.append(f"  {step}. pass {pass_rate:6.1%}  cost {cost:5.1f}  reached by {reached:6.1%}  "
+                     f"{len(criterion.predicates)} predicate(s): {criterion.description[:80]}")
+        reached *= pass_rate
+    for description in plan.unevaluated:
+        lines.append(f"  -  not Banner-checkable: {description[:80]}")
+    return lines
+
+def time_per_student(plans: List[ScholarshipPlan], rows: List[Dict[str, str]]) -> Tuple[float, List[List[int]]]:
+    start = time.perf_counter()
+    results = [evaluate_student(plans, row) for row in rows]
+    return time.perf_counter() - start, results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect predicate statistics and order plans by estimated cost")
+    parser.add_argument('roster', help="Banner extract CSV (the statistics snapshot)")
+    parser.add_argument('--stats', default=STATS_FILE)
+    parser.add_argument('--explain', type=int, metavar='SCHOLARSHIP_ID', help="Print one scholarship's plan and stop")
+    args = parser.parse_args()
+
+    plans = compile_corpus(get_scholarship_files())
+    start = time.perf_counter()
+    stats = PredicateStatistics.from_rows(iter_roster(args.roster))
+    save_statistics(stats, args.stats)
+    print(f"Collected statistics over {stats.size} students in {time.perf_counter() - start:.2f} s → {args.stats}")
+
+    if args.explain is not None:
+        plan = next((plan for plan in plans if plan.scholarship_id == args.explain), None)
+        if plan is None:
+            print(f"No scholarship {args.explain}")
+        else:
+            print('\n'.join(explain_plan(plan, stats)))
+    else:
+        rows = read_roster(args.roster)
+        ordered = order_plans(plans, stats)
+        file_seconds, file_results = time_per_student(plans, rows)
+        ordered_seconds, ordered_results = time_per_student(ordered, rows)
+        assert file_results == ordered_results, "cost order changed an eligibility result"
+        estimated = sum(plan_cost(plan, stats) for plan in plans), sum(plan_cost(plan, stats) for plan in ordered)
+        print(f"Per-student checks of {len(rows)} students × {len(plans)} scholarships:")
+        print(f"  file order {file_seconds:.2f} s, cost order {ordered_seconds:.2f} s "
+              f"({file_seconds / ordered_seconds:.2f}× faster)")
+        print(f"  estimated comparisons per student: {estimated[0]:,.0f} → {estimated[1]:,.0f}")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Progress Status Store
+Keeps scholarship progress_status values in SQLite (WAL mode) instead of
+rewriting a whole scholarship JSON file for every status change:
+- bulk_update applies many changes in one transaction, with optional
+  expected_version checks so concurrent editors never silently overwrite each other
+- export_to_json syncs changed statuses back into the JSON files (and the
+  derived bundles) in one batch
+- localStorage exports from the website can be imported directly
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import corpus_storage
+from improved_processor import SCHOLARSHIP_JSON_DIR, get_scholarship_files
+from schema_migrations import encode_json
+
+PROGRESS_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'progress_status.db')
+VALID_STATUSES = ('not-processed', 'in-process', 'complete')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress_status (
+    scholarship_id INTEGER PRIMARY KEY,
+    status TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    exported_version INTEGER NOT NULL DEFAULT 0,
+    updated_by TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL
+)
+"""
+
+class ProgressStore:
+    """
+    SQLite-backed progress statuses, safe to share between server threads
+    """
+
+    def __init__(self, db_path: str = PROGRESS_DB):
+        self.db_path = db_path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets readers proceed while a writer commits
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=30000')
+            self._local.conn = conn
+        return conn
+
+    def get(self, scholarship_id: int) -> Optional[Dict]:
+        row = self._connection().execute(
+            'SELECT status, version, updated_by, updated_at FROM progress_status WHERE scholarship_id = ?',
+            (scholarship_id,)).fetchone()
+        if row is None:
+            return None
+        return {'status': row[0], 'version': row[1], 'updated_by': row[2], 'updated_at': row[3]}
+
+    def get_all(self) -> Dict[int, Dict]:
+        rows = self._connection().execute('SELECT scholarship_id, status, version FROM progress_status')
+        return {row[0]: {'status': row[1], 'version': row[2]} for row in rows}
+
+    def bulk_update(self, changes: Iterable[Dict], updated_by: str = '') -> Dict[str, List[Dict]]:
+        """
+        Apply status changes in a single transaction.
+        Each change is {'scholarship_id', 'status', optional 'expected_version'}; repeated
+        changes to the same scholarship are coalesced (last one wins). A change whose
+        expected_version no longer matches is reported as a conflict instead of applied.
+        """
+        coalesced = {}
+        for change in changes:
+            if not isinstance(change, dict) or 'scholarship_id' not in change or 'status' not in change:
+                raise ValueError(f"Each update needs a scholarship_id and a status: {change!r}")
+            status = change['status']
+            if status not in VALID_STATUSES:
+                raise ValueError(f"Invalid progress status: {status}")
+            try:
+                scholarship_id = int(change['scholarship_id'])
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid scholarship_id: {change['scholarship_id']!r}")
+            expected_version = change.get('expected_version')
+            if expected_version is not None and (not isinstance(expected_version, int) or isinstance(expected_version, bool)):
+                raise ValueError(f"Invalid expected_version: {expected_version!r}")
+            coalesced[scholarship_id] = change
+
+        applied = []
+        conflicts = []
+        now = datetime.now().isoformat(timespec='seconds')
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for scholarship_id, change in coalesced.items():
+                row = conn.execute('SELECT version FROM progress_status WHERE scholarship_id = ?',
+                                   (scholarship_id,)).fetchone()
+                current_version = row[0] if row else 0
+                expected_version = change.get('expected_version')
+
+                if expected_version is not None and expected_version != current_version:
+                    conflicts.append({'scholarship_id': scholarship_id, 'expected_version': expected_version,
+                                      'current_version': current_version})
+                    continue
+
+                conn.execute(
+                    'INSERT INTO progress_status (scholarship_id, status, version, updated_by, updated_at) '
+                    'VALUES (?, ?, 1, ?, ?) '
+                    'ON CONFLICT(scholarship_id) DO UPDATE SET status = excluded.status, '
+                    'version = progress_status.version + 1, updated_by = excluded.updated_by, '
+                    'updated_at = excluded.updated_at',
+                    (scholarship_id, change['status'], updated_by, now))
+                applied.append({'scholarship_id': scholarship_id, 'status': change['status'],
+                                'version': current_version + 1})
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+        return {'applied': applied, 'conflicts': conflicts}
+
+    def seed_from_json(self, json_files: Iterable[str]) -> int:
+        """
+        Load progress_status from scholarship files for scholarships not yet in the store
+        """
+        known = set(self.get_all())
+        rows = []
+        for text in corpus_storage.read_texts(json_files):
+            scholarship = json.loads(text)
+            scholarship_id = scholarship.get('basic_information', {}).get('scholarship_id')
+            if scholarship_id is None or scholarship_id in known:
+                continue
+            rows.append((scholarship_id, scholarship.get('progress_status', 'not-processed')))
+
+        now = datetime.now().isoformat(timespec='seconds')
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        conn.executemany(
+            'INSERT OR IGNORE INTO progress_status (scholarship_id, status, version, exported_version, updated_by, updated_at) '
+            "VALUES (?, ?, 1, 1, 'seed', ?)", [(sid, status, now) for sid, status in rows])
+        conn.execute('COMMIT')
+        return len(rows)
+
+    def import_local_export(self, local_statuses: Dict[str, str], updated_by: str = 'import') -> Dict[str, List[Dict]]:
+        """
+        Import the {scholarship_id: status} file produced by the website's Export button
+        """
+        return self.bulk_update([{'scholarship_id': sid, 'status': status}
+                                 for sid, status in local_statuses.items()], updated_by)
+
+    def export_to_json(self, json_dir: str = SCHOLARSHIP_JSON_DIR, update_bundles: bool = True) -> Dict:
+        """
+        Write statuses changed since the last export into the scholarship files in one batch
+        """
+        conn = self._connection()
+        pending = {row[0]: (row[1], row[2]) for row in conn.execute(
+            'SELECT scholarship_id, status, version FROM progress_status WHERE version > exported_version')}
+        if not pending:
+            return {'files_written': 0, 'pending': 0}
+
+        # Scholarship files are named <scholarship_id>.json (or .json.gz when stored compressed)
+        files_by_id = {os.path.splitext(corpus_storage.logical_name(f))[0]: f for f in get_scholarship_files(json_dir)}
+        targets = [(scholarship_id, status, version, files_by_id[str(scholarship_id)])
+                   for scholarship_id, (status, version) in pending.items() if str(scholarship_id) in files_by_id]
+        texts = corpus_storage.read_texts(json_file for _, _, _, json_file in targets)
+        updates = {}
+        exported = []
+        for (scholarship_id, status, version, json_file), text in zip(targets, texts):
+            scholarship = json.loads(text)
+            if scholarship.get('progress_status') != status:
+                scholarship['progress_status'] = status
+                updates[json_file] = encode_json(scholarship)
+            exported.append((version, scholarship_id))
+        corpus_storage.write_texts(updates)
+        written = list(updates)
+
+        conn.execute('BEGIN IMMEDIATE')
+        conn.executemany('UPDATE progress_status SET exported_version = ? WHERE scholarship_id = ?', exported)
+        conn.execute('COMMIT')
+
+        if update_bundles and written:
+            from derived_artifacts import update_artifacts
+            update_artifacts(written, json_dir=json_dir)
+
+        return {'files_written': len(written), 'pending': len(pending) - len(exported)}
+
+if __name__ == "__main__":
+    store = ProgressStore()
+    if len(sys.argv) > 2 and sys.argv[1] == 'import':
+        with open(sys.argv[2], 'r', encoding='utf-8') as f:
+            result = store.import_local_export(json.load(f))
+        print(f"Imported {len(result['applied'])} statuses ({len(result['conflicts'])} conflicts)")
+    elif len(sys.argv) > 1 and sys.argv[1] == 'export':
+        result = store.export_to_json()
+        print(f"Wrote {result['files_written']} scholarship files")
+    else:
+        seeded = store.seed_from_json(get_scholarship_files())
+        print(f"Seeded {seeded} statuses into {store.db_path}")
+        print("Usage: python progress_store.py [import EXPORT.json | export]")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Sampling Profiler
+Statistical profiler for a live process, using only the stdlib:
+- A background thread reads every other thread's stack with sys._current_frames()
+  at a fixed interval; the profiled code is not instrumented, so overhead stays at
+  one stack walk per thread per sample
+- Identical stacks are counted and written in the collapsed-stack format
+  ("thread;outer (file:line);...;inner (file:line) count"), which flamegraph.pl,
+  speedscope and inferno read directly
+- The API server exposes it as GET /debug/profile; the CLI profiles a script
+
+    python sampling_profiler.py --seconds 10 --output profile.folded eligibility_batcher.py roster.csv
+    flamegraph.pl profile.folded > profile.svg
+"""
+
+import argparse
+import os
+import runpy
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Iterable, Optional, Set
+
+DEFAULT_INTERVAL = 0.005
+MAX_SECONDS = 60.0
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def stack_key(thread_name: str, frame) -> str:
+    """
+    One collapsed stack, outermost frame first
+    """
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name.replace(';', ':').replace(' ', '_'))
+    return ';'.join(reversed(labels))
+
+def sample_stacks(seconds: float, interval: float = DEFAULT_INTERVAL, exclude: Iterable[int] = (),
+                  stop: Optional[threading.Event] = None) -> Counter:
+    """
+    Collapsed stack → sample count for every thread but the caller and `exclude`, for `seconds`
+    """
+    skipped: Set[int] = set(exclude) | {threading.get_ident()}
+    stacks = Counter()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline and not (stop is not None and stop.is_set()):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id not in skipped:
+                stacks[stack_key(names.get(thread_id, f'thread-{thread_id}'), frame)] += 1
+        time.sleep(interval)
+    return stacks
+
+def collapsed_text(stacks: Counter) -> str:
+    return ''.join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+def profile_script(argv, seconds: float, interval: float) -> Counter:
+    """
+    Run a script in this process while a sampler thread profiles it
+    """
+    result: Counter = Counter()
+    stop = threading.Event()
+
+    def sampler():
+        result.update(sample_stacks(seconds, interval, stop=stop))
+
+    thread = threading.Thread(target=sampler, name='sampler', daemon=True)
+    thread.start()
+    sys.argv = list(argv)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(argv[0])))
+    try:
+        runpy.run_path(argv[0], run_name='__main__')
+    except SystemExit:
+        pass
+    finally:
+        stop.set()
+        thread.join()
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile a Python script into collapsed stacks for flame graphs")
+    parser.add_argument('--seconds', type=float, default=MAX_SECONDS, help="Stop sampling after this long")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help="Seconds between samples")
+    parser.add_argument('--output', help="Collapsed stacks file (default: stdout, after the script's own output)")
+    parser.add_argument('script', nargs=argparse.REMAINDER, help="Script and its arguments")
+    args = parser.parse_args()
+    if not args.script:
+        parser.error("a script to profile is required")
+
+    stacks = profile_script(args.script, args.seconds, args.interval)
+    text = collapsed_text(stacks)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"{sum(stacks.values())} samples in {len(stacks)} distinct stacks → {args.output}", file=sys.stderr)
+    else:
+        sys.stdout.write(text)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Scholarship JSON Schema Migrations
+- Stamps every scholarship file with a schema_version
+- Applies registered migrations in version order
+- Skips files already at the target version without parsing them
+- Rewrites files in streaming batches with atomic replacement, each batch through
+  the corpus_storage thread pool
+"""
+
+import re
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+import corpus_storage
+import json_backend
+
+# Registered migrations as (version, description, function), kept sorted by version
+MIGRATIONS: List[Tuple[int, str, Callable[[Dict], Dict]]] = []
+
+# schema_version is always written as the first key, so it can be read from the file header
+SCHEMA_VERSION_HEADER = re.compile(rb'^\s*\{\s*"schema_version"\s*:\s*(\d+)')
+HEADER_PEEK_BYTES = 128
+
+def migration(version: int, description: str):
+    """
+    Register a migration that upgrades a scholarship from version - 1 to version
+    """
+    def register(func: Callable[[Dict], Dict]) -> Callable[[Dict], Dict]:
+        if any(existing[0] == version for existing in MIGRATIONS):
+            raise ValueError(f"Duplicate schema migration for version {version}")
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda entry: entry[0])
+        return func
+    return register
+
+@migration(1, "Rename qualifying_criteria to hard_criteria")
+def rename_qualifying_criteria(scholarship_data: Dict) -> Dict:
+    if 'qualifying_criteria' in scholarship_data:
+        hard_criteria = scholarship_data.pop('qualifying_criteria')
+        hard_criteria['description'] = "Hard requirements that must be met to qualify for the scholarship"
+        scholarship_data['hard_criteria'] = hard_criteria
+    return scholarship_data
+
+@migration(2, "Add progress_status field")
+def add_progress_status(scholarship_data: Dict) -> Dict:
+    if 'progress_status' not in scholarship_data:
+        scholarship_data['progress_status'] = 'not-processed'
+    return scholarship_data
+
+CURRENT_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(scholarship_data: Dict) -> int:
+    """
+    Schema version of parsed scholarship data (files written before versioning are 0)
+    """
+    return scholarship_data.get('schema_version', 0)
+
+def peek_schema_version(json_file_path: str) -> int:
+    """
+    Read the schema version from the first bytes of a file without parsing it
+    """
+    header = corpus_storage.read_prefix(json_file_path, HEADER_PEEK_BYTES)
+    match = SCHEMA_VERSION_HEADER.match(header)
+    return int(match.group(1)) if match else 0
+
+def apply_migrations(scholarship_data: Dict, target_version: int = CURRENT_SCHEMA_VERSION) -> Tuple[Dict, List[int]]:
+    """
+    Run every registered migration between the data's version and target_version.
+    Returns the migrated data (schema_version as first key) and the versions applied.
+    """
+    current_version = get_schema_version(scholarship_data)
+    applied = []
+
+    for version, _, func in MIGRATIONS:
+        if current_version < version <= target_version:
+            scholarship_data = func(scholarship_data)
+            applied.append(version)
+
+    if applied or 'schema_version' not in scholarship_data:
+        scholarship_data.pop('schema_version', None)
+        scholarship_data = {'schema_version': max([current_version] + applied), **scholarship_data}
+
+    return scholarship_data, applied
+
+def encode_json(data: Dict) -> str:
+    """
+    Encode scholarship data in the repository's on-disk JSON format
+    """
+    return json_backend.dumps(data)
+
+def write_text_atomic(json_file_path: str, text: str):
+    """
+    Write text to a temporary file in the same directory and swap it into place,
+    so readers never see a half-written scholarship file; compressed scholarship
+    files (.json.gz, .json.zst) stay compressed
+    """
+    corpus_storage.write_bytes_atomic(json_file_path, corpus_storage.encode_bytes(json_file_path, text))
+
+def write_json_atomic(json_file_path: str, data: Dict):
+    """
+    Encode data and atomically replace json_file_path with it
+    """
+    write_text_atomic(json_file_path, encode_json(data))
+
+def migrate_file(json_file_path: str, target_version: int = CURRENT_SCHEMA_VERSION, dry_run: bool = False) -> str:
+    """
+    Migrate a single file. Returns 'skipped', 'migrated' or 'failed'.
+    """
+    try:
+        if peek_schema_version(json_file_path) >= target_version:
+            return 'skipped'
+
+        scholarship_data = json_backend.loads(corpus_storage.read_text(json_file_path))
+
+        scholarship_data, _ = apply_migrations(scholarship_data, target_version)
+
+        if not dry_run:
+            write_json_atomic(json_file_path, scholarship_data)
+        return 'migrated'
+
+    except Exception as e:
+        print(f"Error migrating {json_file_path}: {e}")
+        return 'failed'
+
+def iter_batches(items: Iterable[str], batch_size: int) -> Iterator[List[str]]:
+    """
+    Group an iterable into lists of at most batch_size items
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def migrate_corpus(json_files: Iterable[str], target_version: int = CURRENT_SCHEMA_VERSION,
+                   batch_size: int = 50, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Migrate files in streaming batches so only one batch is held in memory at a time;
+    the files of a batch are read and rewritten concurrently
+    """
+    totals = {'migrated': 0, 'skipped': 0, 'failed': 0}
+
+    for batch_number, batch in enumerate(iter_batches(json_files, batch_size), 1):
+        for status in corpus_storage.map_files(lambda json_file: migrate_file(json_file, target_version, dry_run), batch):
+            totals[status] += 1
+        print(f"Batch {batch_number}: {totals['migrated']} migrated, {totals['skipped']} skipped, {totals['failed']} failed")
+
+    return totals
+
+if __name__ == "__main__":
+    from improved_processor import get_scholarship_files
+
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else CURRENT_SCHEMA_VERSION
+    print(f"Migrating scholarship files to schema version {target}...")
+    for version, description, _ in MIGRATIONS:
+        print(f"  v{version}: {description}")
+
+    result = migrate_corpus(get_scholarship_files(), target)
+    print(f"\nMigration complete!")
+    print(f"Migrated: {result['migrated']}")
+    print(f"Already current: {result['skipped']}")
+    print(f"Failed: {result['failed']}")
@@ -33,8 +33,11 @@ if command -v python3 &> /dev/null; then
         open http://localhost:8000
     fi
     
-    # Start Python server
-    python3 -m http.server 8000
+    # Precompress site files, then serve with caching headers plus the /api/, /metrics
+    # and /debug/profile endpoints. The progress API accepts unauthenticated writes, so this
+    # listens on 127.0.0.1 only; to share the portal read-only on the intranet, run
+    # `python3 static_server.py --build --host 0.0.0.0 8000` (without --api) instead
+    python3 static_server.py --build --api 8000
     
 elif command -v python &> /dev/null; then
     echo "Starting local server on http://localhost:8000"
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Static Site Server
+Local/intranet replacement for `python3 -m http.server`:
+- Serves .br / .gz siblings produced by the build step when the client accepts them
+- Serves a scholarship corpus kept compressed (corpus_storage.py compress) at its
+  plain .json URLs, decompressing for clients that do not accept gzip
+- Content-hash ETags with If-None-Match → 304 Not Modified
+- HTTP/1.1 keep-alive with one thread per connection
+- Long-lived immutable caching for content-hashed bundle names
+- Optionally mounts the api_server.py endpoints on the same origin: everything under
+  /api/ plus /metrics and /debug/profile. Progress writes are unauthenticated, so the
+  API is only served on a loopback address
+
+    python static_server.py --build-only       # write .gz/.br siblings, then exit
+    python static_server.py --build --api 8000 # build, then serve site + API on port 8000
+"""
+
+import argparse
+import gzip
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+import threading
+from email.utils import formatdate
+from typing import Dict, Optional
+from urllib.parse import unquote, urlparse
+
+from api_server import ScholarshipAPIHandler, ScholarshipAPIServer
+from corpus_storage import write_bytes_atomic
+
+SITE_ROOT = os.path.dirname(os.path.abspath(__file__))
+COMPRESSIBLE_EXTENSIONS = ('.json', '.js', '.css', '.html', '.svg', '.txt', '.md')
+BUILD_DIRS = ('.', 'css', 'js', 'scholarship_json_files', os.path.join('derived_data', 'bundles'))
+MIN_COMPRESS_BYTES = 512
+BLOCKED_EXTENSIONS = ('.py', '.pyc', '.db', '.db-wal', '.db-shm', '.sh')
+
+# Bundles written by derived_artifacts.py carry a 12-character content hash in their name
+HASHED_NAME = re.compile(r'-[0-9a-f]{12}\.json$')
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'no-cache'
+
+# Encodings in order of preference with the sibling file suffix that holds them
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+def build_precompressed(root: str = SITE_ROOT, dirs=BUILD_DIRS) -> Dict[str, int]:
+    """
+    Write .gz (and .br when the brotli package is installed) siblings for every
+    compressible file whose sibling is missing or older than the source
+    """
+    totals = {'files': 0, 'written': 0, 'source_bytes': 0, 'gzip_bytes': 0}
+    for directory in dirs:
+        full_dir = os.path.join(root, directory)
+        if not os.path.isdir(full_dir):
+            continue
+        for name in os.listdir(full_dir):
+            path = os.path.join(full_dir, name)
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS) or name.startswith('.') or not os.path.isfile(path):
+                continue
+            source_stat = os.stat(path)
+            if source_stat.st_size < MIN_COMPRESS_BYTES:
+                continue
+
+            totals['files'] += 1
+            totals['source_bytes'] += source_stat.st_size
+            data = None
+            for encoding, suffix in ENCODINGS:
+                if encoding == 'br' and brotli is None:
+                    continue
+                sibling = path + suffix
+                if not os.path.exists(sibling) or os.stat(sibling).st_mtime_ns < source_stat.st_mtime_ns:
+                    if data is None:
+                        with open(path, 'rb') as f:
+                            data = f.read()
+                    compressed = brotli.compress(data) if encoding == 'br' else gzip.compress(data, 9, mtime=0)
+                    write_bytes_atomic(sibling, compressed)
+                    totals['written'] += 1
+                if encoding == 'gzip':
+                    totals['gzip_bytes'] += os.path.getsize(sibling)
+    return totals
+
+class FileInfoCache:
+    """
+    ETag, content type and compressed siblings per file, refreshed when the file changes
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str, stat: os.stat_result, stored_gzip: bool = False) -> Dict:
+        """
+        stored_gzip: path is the only, gzip-compressed, copy of the file the URL names
+        """
+        key = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(path)
+        if entry is not None and entry['key'] == key:
+            return entry
+
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                hasher.update(chunk)
+
+        variants = {}
+        if stored_gzip:
+            variants['gzip'] = path
+        else:
+            for encoding, suffix in ENCODINGS:
+                sibling = path + suffix
+                if os.path.exists(sibling) and os.stat(sibling).st_mtime_ns >= stat.st_mtime_ns:
+                    variants[encoding] = sibling
+
+        served_name = path[:-len('.gz')] if stored_gzip else path
+        content_type = mimetypes.guess_type(served_name)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/json', 'application/javascript'):
+            content_type += '; charset=utf-8'
+
+        entry = {
+            'key': key,
+            'etag': hasher.hexdigest()[:20],
+            'content_type': content_type,
+            'variants': variants,
+            'stored_gzip': stored_gzip,
+            'last_modified': formatdate(stat.st_mtime, usegmt=True),
+            'cache_control': IMMUTABLE_CACHE if HASHED_NAME.search(served_name) else REVALIDATE_CACHE
+        }
+        with self._lock:
+            self._entries[path] = entry
+        return entry
+
+def file_stat(path: str) -> Optional[os.stat_result]:
+    """
+    stat of a regular file, or None when path is missing or not a file
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat if os.path.isfile(path) else None
+
+def accepted_encodings(header: Optional[str]) -> set:
+    """
+    Content codings the client accepts (q=0 entries excluded)
+    """
+    accepted = set()
+    for part in (header or '').split(','):
+        token, _, params = part.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if token and quality > 0:
+            accepted.add(token.strip().lower())
+    return accepted
+
+def content_etags(header: str) -> set:
+    """
+    Content hashes named by an If-None-Match list, with W/ prefixes, quotes and the
+    per-encoding suffix removed
+    """
+    tags = set()
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        for encoding, _ in ENCODINGS:
+            if tag.endswith(f'-{encoding}'):
+                tag = tag[:-len(encoding) - 1]
+                break
+        if tag:
+            tags.add(tag)
+    return tags
+
+class StaticFileHandler(ScholarshipAPIHandler):
+    server_version = 'ScholarshipStatic/1.0'
+    timeout = 30
+
+    def do_GET(self):
+        if self.is_api_path(self.GET_ROUTES):
+            if self.server.api_enabled:
+                return super().do_GET()
+            return self.send_json(404, {'error': 'API not enabled on this server'})
+        self.serve_static(send_body=True)
+
+    def do_HEAD(self):
+        if self.is_api_path(self.GET_ROUTES):
+            if self.server.api_enabled:
+                return super().do_HEAD()
+            return self.send_json(404, {'error': 'API not enabled on this server'})
+        self.serve_static(send_body=False)
+
+    def do_POST(self):
+        if self.server.api_enabled and self.is_api_path(self.POST_ROUTES):
+            return super().do_POST()
+        self.send_json(405, {'error': 'Method not allowed'})
+
+    def is_api_path(self, routes: Dict[str, str]) -> bool:
+        """
+        Paths the API dispatcher answers: anything under /api/ and the API's other routes
+        """
+        path = urlparse(self.path).path
+        return path.startswith('/api/') or (path.rstrip('/') or '/') in routes
+
+    def resolve_path(self) -> Optional[str]:
+        """
+        Map the URL path to a file under the site root, refusing traversal and private files
+        """
+        url_path = posixpath.normpath(unquote(urlparse(self.path).path))
+        parts = [part for part in url_path.split('/') if part and part != '.']
+        if any(part.startswith('.') or part == '..' for part in parts):
+            return None
+
+        path = os.path.join(self.server.root, *parts)
+        if os.path.isdir(path):
+            path = os.path.join(path, 'index.html')
+        if path.endswith(BLOCKED_EXTENSIONS):
+            return None
+        return path
+
+    def serve_static(self, send_body: bool):
+        path = self.resolve_path()
+        stat = file_stat(path) if path else None
+        stored_gzip = False
+        if stat is None and path and path.endswith('.json'):
+            # A compressed corpus keeps only <id>.json.gz
+            stat = file_stat(path + '.gz')
+            stored_gzip = stat is not None
+            path += '.gz'
+        if stat is None:
+            return self.send_error(404, 'File not found')
+
+        info = self.server.file_info.get(path, stat, stored_gzip)
+        encoding = next((enc for enc, _ in ENCODINGS
+                         if enc in info['variants'] and enc in accepted_encodings(self.headers.get('Accept-Encoding'))),
+                        None)
+        etag = f'"{info["etag"]}-{encoding}"' if encoding else f'"{info["etag"]}"'
+
+        # Any representation of unchanged content is still valid for the client
+        if_none_match = self.headers.get('If-None-Match', '')
+        if if_none_match.strip() == '*' or info['etag'] in content_etags(if_none_match):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', info['cache_control'])
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+
+        body_path = info['variants'][encoding] if encoding else path
+        with open(body_path, 'rb') as f:
+            body = f.read()
+        if info['stored_gzip'] and not encoding:
+            body = gzip.decompress(body)
+
+        self.send_response(200)
+        self.send_header('Content-Type', info['content_type'])
+        self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', info['last_modified'])
+        self.send_header('Cache-Control', info['cache_control'])
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+class StaticSiteServer(ScholarshipAPIServer):
+    def __init__(self, address, root: str = SITE_ROOT, api_enabled: bool = False, quiet: bool = False):
+        super().__init__(address, quiet=quiet, handler_class=StaticFileHandler)
+        self.root = os.path.abspath(root)
+        self.api_enabled = api_enabled
+        self.file_info = FileInfoCache()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the scholarship portal with compression and caching")
+    parser.add_argument('port', nargs='?', type=int, default=8000)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--root', default=SITE_ROOT)
+    parser.add_argument('--build', action='store_true', help="Write .gz/.br siblings before serving")
+    parser.add_argument('--build-only', action='store_true', help="Write .gz/.br siblings and exit")
+    parser.add_argument('--api', action='store_true', help="Also serve the api_server.py endpoints (/api/, /metrics, /debug/profile)")
+    parser.add_argument('--quiet', action='store_true')
+    args = parser.parse_args()
+    if args.api and args.host not in LOOPBACK_HOSTS:
+        parser.error("--api serves unauthenticated progress writes; bind it to 127.0.0.1 "
+                     "or serve the site read-only without --api")
+
+    if args.build or args.build_only:
+        result = build_precompressed(args.root)
+        print(f"Precompressed {result['files']} files ({result['written']} siblings written): "
+              f"{result['source_bytes'] / 1024:.0f} KB → {result['gzip_bytes'] / 1024:.0f} KB gzip")
+        if args.build_only:
+            raise SystemExit(0)
+
+    server = StaticSiteServer((args.host, args.port), args.root, args.api, args.quiet)
+    if args.api:
+        server.snapshots.start()
+    print(f"Serving {server.root} on http://{args.host}:{args.port}" + (" (with /api/)" if args.api else ""))
+    print("Press Ctrl+C to stop the server")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+    finally:
+        server.server_close()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Synthetic Scholarship and Roster Generator
+- Scholarships sample the criterion type, SIS field, application item and essay
+  tag distributions recorded in criteria_summary.json
+- Banner rosters use the extract columns from banner_roster.py, drawing majors,
+  colleges and classifications from the same vocabulary the criteria use
+Scales are multiples of the real corpus (671 scholarships) and of a 200-student roster.
+"""
+
+import argparse
+import json
+import os
+import random
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from banner_roster import write_roster
+from improved_processor import improve_criteria_parsing
+from schema_migrations import CURRENT_SCHEMA_VERSION, write_json_atomic
+
+CRITERIA_SUMMARY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'criteria_summary.json')
+
+SCHOLARSHIPS_PER_SCALE = 671
+STUDENTS_PER_SCALE = 200
+ROSTER_SCALES = (1, 10, 100)
+
+# college code -> (SIS_College value, majors offered)
+PROGRAMS = {
+    'CLA': ('Liberal Arts', ['English', 'English-Creative Writing', 'Creative Writing', 'History',
+                             'Political Science', 'Political Science-Pre-Law', 'Mass Comm-Photographic Arts',
+                             'Modern Language-Spanish', 'Philosophy', 'Psychology', 'Sociology']),
+    'CEPS': ('Education and Prof Studies', ['Elementary Education', 'Early Childhood Education',
+                                            'Special Education', 'Spec Ed-Mild/Mod Disabilities',
+                                            'Physical Education/Health', 'Mathematics Education',
+                                            'History Education', 'Science Ed-Chemistry', 'Kinesiology']),
+    'COB': ('Business Administration', ['Accounting', 'Finance', 'Finance-Real Estate',
+                                        'Finance-Insurance & Risk Mgmt', 'Marketing',
+                                        'Marketing-Professional Selling', 'Management',
+                                        'Mngt-Professional Golf Mngt', 'Economics', 'Information Systems']),
+    'CMS': ('Mathematics and Science', ['Biology', 'Biology-Biomedical Sciences', 'Biology-Pre-Medical',
+                                        'Chemistry', 'Chemistry-Pre-Pharmacy', 'Mathematics', 'Statistics',
+                                        'Nursing', 'Physics', 'Computer Science']),
+    'CFAD': ('Fine Arts and Design', ['Art', 'Graphic Design', 'Music', 'Music Education', 'Theatre Arts',
+                                      'Dance', 'Interior Design', 'Fashion Marketing', 'Photographic Arts']),
+}
+
+COLLEGE_NAMES = {
+    'CLA': 'College of Liberal Arts',
+    'CEPS': 'College of Education and Professional Studies',
+    'COB': 'College of Business',
+    'CMS': 'College of Mathematics and Science',
+    'CFAD': 'College of Fine Arts and Design',
+    'GENERAL': 'General Scholarships'
+}
+
+CLASSIFICATION_WEIGHTS = {
+    'Freshman': 22, 'Sophomore': 19, 'Junior': 20, 'Senior': 23,
+    '1st Year Graduate': 8, '2nd Year Graduate': 5, 'Second Bachelors': 3
+}
+GRADUATE_CLASSIFICATIONS = {'1st Year Graduate', '2nd Year Graduate'}
+CUMULATIVE_HOURS_RANGE = {
+    'Freshman': (0, 29), 'Sophomore': (30, 59), 'Junior': (60, 89), 'Senior': (90, 140),
+    '1st Year Graduate': (0, 17), '2nd Year Graduate': (18, 40), 'Second Bachelors': (120, 160)
+}
+GPA_THRESHOLDS = [2.0, 2.5, 2.5, 2.75, 3.0, 3.0, 3.0, 3.25, 3.5]
+FIRST_NAMES = ['Alex', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Avery', 'Quinn', 'Jamie', 'Drew']
+LAST_NAMES = ['Smith', 'Johnson', 'Nguyen', 'Garcia', 'Brown', 'Davis', 'Lopez', 'Wilson', 'Clark', 'Lee']
+
+def load_distributions(summary_file: str = CRITERIA_SUMMARY_FILE) -> Dict:
+    """
+    Load criterion distributions from criteria_summary.json
+    """
+    with open(summary_file, 'r', encoding='utf-8') as f:
+        summary = json.load(f)
+    return {
+        'avg_criteria': summary['totals']['avg_criteria_per_scholarship'],
+        'criterion_types': dict(summary['criterion_type_counts']),
+        'sis_fields': dict(summary['sis_field_counts_top20']),
+        'application_items': summary['application_item_counts'],
+        'essay_tags': dict(summary['essay_tags_top50']),
+        'attachment_tags': dict(summary['attachment_tags_top30'])
+    }
+
+def weighted_choice(rng: random.Random, weights: Dict[str, float]) -> str:
+    keys = list(weights)
+    return rng.choices(keys, weights=[weights[k] for k in keys])[0]
+
+def major_description(rng: random.Random, college_code: str, field: str = 'Major') -> str:
+    """
+    Build a major or minor criterion repeated across the SIS slot variants, as in the real corpus
+    """
+    majors = rng.sample(PROGRAMS[college_code][1], rng.randint(1, 4))
+    variants = [f'SIS_{field}_2', f'SIS_{field}', f'SIS_{field}_1_2', f'SIS_{field}_2_2']
+    return '   or '.join(f"{variant} is {major}" for variant in variants for major in majors)
+
+def sis_field_description(rng: random.Random, distributions: Dict, college_code: str) -> str:
+    """
+    Description for an 'unknown' typed criterion, sampled by SIS field frequency
+    """
+    field_weights = {field: count for field, count in distributions['sis_fields'].items()
+                     if not field.startswith('sis_major') and field not in ('sis_cumgpa', 'sis_level')}
+    field = weighted_choice(rng, field_weights)
+
+    if field == 'sis_classification':
+        classes = rng.sample(list(CLASSIFICATION_WEIGHTS), rng.randint(1, 3))
+        return '   or '.join(f"SIS_Classification is {c}" for c in classes)
+    if field.startswith('sis_college'):
+        return f"SIS_College is {PROGRAMS[college_code][0]}"
+    if field.startswith('sis_minor'):
+        return major_description(rng, college_code, 'Minor')
+    if field in ('sis_enrolled_status', 'sis_enrolled'):
+        return "SIS_Enrolled_Status is Full Time"
+    if field == 'sis_overall_hours':
+        return f"SIS_Overall_Hours >= {rng.choice([15, 30, 45, 60]):.2f}"
+    if field == 'sis_uco_completed_hours':
+        return f"SIS_UCO_Completed_Hours >= {rng.choice([9, 12, 24]):.2f}"
+    if field == 'sis_uscitizen':
+        return "SIS_USCitizen = Yes"
+    if field == 'sis_okresidency':
+        return "SIS_OKResidency = Yes"
+    if field == 'sis_gender':
+        return "SIS_Gender is Female"
+    return "SIS_Enrolled_Status is Full Time"
+
+def criterion_description(rng: random.Random, criteria_type: str, distributions: Dict, college_code: str) -> str:
+    """
+    Realistic description text for a criterion of the given type
+    """
+    if criteria_type == 'application':
+        item = weighted_choice(rng, distributions['application_items'])
+        if item == 'complete_essay':
+            return f'Complete Essay "{weighted_choice(rng, distributions["essay_tags"])}"'
+        if item == 'complete_attachment':
+            return f'Complete Attachment:  "{weighted_choice(rng, distributions["attachment_tags"])}"'
+        return 'Complete Application: "UCO Foundation Qualifying Scholarship Application"'
+    if criteria_type == 'major':
+        return major_description(rng, college_code)
+    if criteria_type == 'gpa':
+        return f"SIS_CumGPA >= {rng.choice(GPA_THRESHOLDS):.2f}"
+    if criteria_type == 'level':
+        return f"SIS_Level is {rng.choice(['Undergraduate', 'Undergraduate', 'Undergraduate', 'Graduate'])}"
+    if criteria_type == 'hours':
+        return f"SIS_Enrolled HRS >= {rng.choice([6, 9, 12, 12, 12]):.2f}"
+    if criteria_type == 'citizenship':
+        return "SIS_USCitizen = Yes"
+    if criteria_type == 'activities':
+        return "Demonstrated leadership through campus activities"
+    if criteria_type == 'military':
+        return "Veteran or dependent of a veteran of the U.S. Armed Forces"
+    if criteria_type == 'financial_need':
+        return "Must have demonstrated financial need"
+    return sis_field_description(rng, distributions, college_code)
+
+def generate_scholarship(rng: random.Random, scholarship_id: int, distributions: Dict) -> Dict:
+    """
+    One processed scholarship record in the on-disk schema
+    """
+    college_code = rng.choice(list(PROGRAMS) + ['GENERAL'])
+    program_college = college_code if college_code in PROGRAMS else rng.choice(list(PROGRAMS))
+    criteria_count = max(1, min(15, round(rng.gauss(distributions['avg_criteria'], 2))))
+
+    hard_criteria = []
+    for criteria_id in range(1, criteria_count + 1):
+        criteria_type = weighted_choice(rng, distributions['criterion_types'])
+        description = criterion_description(rng, criteria_type, distributions, program_college)
+        item = {'id': criteria_id, 'type': criteria_type, 'description': description, 'raw_text': description}
+        hard_criteria.append(improve_criteria_parsing(item))
+
+    general_criteria = []
+    for criteria_id in range(1, rng.choice([0, 0, 1, 1, 2, 3]) + 1):
+        criteria_type = rng.choice(['gpa', 'unknown', 'major'])
+        description = criterion_description(rng, criteria_type, distributions, program_college)
+        item = {'id': criteria_id, 'type': criteria_type, 'description': description,
+                'raw_text': description, 'points': rng.choice([1, 1, 2, 3])}
+        general_criteria.append(improve_criteria_parsing(item))
+
+    def banner_summary(items: List[Dict]) -> Dict:
+        return {
+            'total_criteria': len(items),
+            'banner_accessible': sum(1 for c in items if c['banner_accessibility'] == 'banner_accessible'),
+            'application_required': sum(1 for c in items if c['banner_accessibility'] == 'application_required'),
+            'manual_review': sum(1 for c in items if c['banner_accessibility'] == 'manual_review')
+        }
+
+    renewable = rng.random() < 0.2
+    return {
+        'schema_version': CURRENT_SCHEMA_VERSION,
+        'basic_information': {
+            'scholarship_id': scholarship_id,
+            'scholarship_name': f"Synthetic {PROGRAMS[program_college][0]} Scholarship {scholarship_id}",
+            'scholarship_code': f"S{scholarship_id % 100000:05d}",
+            'scholarship_notes': '',
+            'donor_name': 'UCO Foundation',
+            'committee_name': f"{college_code} - Scholarship Committee",
+            'candidate_count': rng.choice([0, 1, 2, 3, 5, 8, 12, 20, 40]),
+            'college_code': college_code,
+            'college_name': COLLEGE_NAMES[college_code]
+        },
+        'renewable_information': {'is_renewable': renewable, 'renewable_years': rng.choice([1, 2, 3]) if renewable else 0},
+        'description': f"Synthetic scholarship generated for benchmarking ({college_code}).",
+        'general_criteria': {
+            'description': 'Soft requirements that provide additional points/consideration',
+            'criteria_count': len(general_criteria),
+            'criteria': general_criteria,
+            'total_possible_points': sum(c['points'] for c in general_criteria),
+            'banner_summary': banner_summary(general_criteria)
+        },
+        'conditional_criteria': {'description': 'Requirements for scholarship renewal', 'criteria_count': 0, 'criteria': []},
+        'metadata': {
+            'processed_date': datetime.now().isoformat(),
+            'source_file': 'synthetic',
+            'processing_notes': {'html_cleaned': True, 'requirements_parsed': True, 'criteria_categorized': True}
+        },
+        'hard_criteria': {
+            'description': 'Hard requirements that must be met to qualify for the scholarship',
+            'criteria_count': len(hard_criteria),
+            'criteria': hard_criteria,
+            'banner_summary': banner_summary(hard_criteria)
+        },
+        'progress_status': rng.choice(['not-processed', 'not-processed', 'in-process', 'complete'])
+    }
+
+def generate_corpus(output_dir: str, scale: float = 1, seed: int = 42,
+                    distributions: Optional[Dict] = None) -> List[str]:
+    """
+    Write scale x 671 synthetic scholarship files plus file-list.json. Returns the file paths.
+    """
+    rng = random.Random(seed)
+    distributions = distributions or load_distributions()
+    os.makedirs(output_dir, exist_ok=True)
+
+    paths = []
+    for offset in range(int(SCHOLARSHIPS_PER_SCALE * scale)):
+        scholarship_id = 900000 + offset
+        path = os.path.join(output_dir, f'{scholarship_id}.json')
+        write_json_atomic(path, generate_scholarship(rng, scholarship_id, distributions))
+        paths.append(path)
+
+    names = [os.path.basename(p) for p in paths]
+    write_json_atomic(os.path.join(output_dir, 'file-list.json'),
+                      {'files': names, 'count': len(names), 'last_updated': datetime.now().date().isoformat()})
+    return paths
+
+def generate_student(rng: random.Random, index: int) -> Dict[str, str]:
+    """
+    One Banner extract row
+    """
+    classification = weighted_choice(rng, CLASSIFICATION_WEIGHTS)
+    level = 'Graduate' if classification in GRADUATE_CLASSIFICATIONS else 'Undergraduate'
+    low, high = CUMULATIVE_HOURS_RANGE[classification]
+    enrolled_hours = rng.choice([3, 6, 9, 12, 12, 15, 15, 15, 18])
+    gpa = min(4.0, max(0.0, rng.gauss(3.05, 0.55)))
+
+    row = {
+        'Term Code': '202620', 'Term': 'Fall 2025', 'PIDM': str(1000000 + index), 'ID': f"*{20000000 + index}",
+        'First Name': rng.choice(FIRST_NAMES), 'Last Name': rng.choice(LAST_NAMES),
+        'Gender': rng.choice(['F', 'M']), 'Hispanic/Latino Flag': 'Y' if rng.random() < 0.15 else 'N',
+        'Term Hours Enrolled': f"{enrolled_hours}", 'Term Hours Billed': f"{enrolled_hours}",
+        'Residency': 'Resident' if rng.random() < 0.85 else 'Non-Resident',
+        'Sport Code': rng.choice(['FB', 'BB', 'SB', 'VB']) if rng.random() < 0.04 else '',
+        'High School': rng.choice(['Edmond North High School', 'Piedmont High School', 'Deer Creek High School', '']),
+        'Level': level, 'Classification': classification,
+        'Term Admitted': rng.choice(['202220', '202320', '202420', '202520']),
+        'Admission Type': rng.choice(['First Time Freshman', 'Transfer', 'Readmit']),
+        'Transfer Hours': f"{rng.choice([0, 0, 0, 12, 30, 60])}",
+        'Cumulative Hours': f"{rng.randint(low, high)}",
+        'Cumulative GPA': f"{gpa:.2f}",
+        'Unmet Need': f"{max(0, rng.gauss(4000, 3500)):.0f}",
+        'FAFSA': 'Y' if rng.random() < 0.7 else 'N',
+        'UCO Email': f"student{index}@uco.edu"
+    }
+
+    slot_count = 1 + (rng.random() < 0.2) + (rng.random() < 0.05)
+    for slot, college_column in zip(range(1, slot_count + 1), ['College 1', 'College 2', 'College Code 3']):
+        college_code = rng.choice(list(PROGRAMS))
+        major = rng.choice(PROGRAMS[college_code][1])
+        row[college_column] = PROGRAMS[college_code][0]
+        row[f'Major Code {slot}'] = major[:4].upper()
+        row[f'Major {slot}'] = major
+
+    if rng.random() < 0.15:
+        minor = rng.choice(PROGRAMS[rng.choice(list(PROGRAMS))][1])
+        row['Minor Code 1'] = minor[:4].upper()
+        row['Minor 1'] = minor
+
+    return row
+
+def generate_roster(student_count: int, seed: int = 7) -> List[Dict[str, str]]:
+    """
+    Generate student_count Banner extract rows
+    """
+    rng = random.Random(seed)
+    return [generate_student(rng, index) for index in range(student_count)]
+
+def generate_rosters(output_dir: str, scales=ROSTER_SCALES, seed: int = 7) -> Dict[int, str]:
+    """
+    Write one roster CSV per scale. Returns {scale: csv path}.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for scale in scales:
+        path = os.path.join(output_dir, f'roster_{scale}x.csv')
+        write_roster(path, generate_roster(STUDENTS_PER_SCALE * scale, seed))
+        paths[scale] = path
+    return paths
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic scholarships and Banner rosters")
+    parser.add_argument('output_dir', help="Directory to write scholarship_json_files/ and rosters/ into")
+    parser.add_argument('--scale', type=float, default=1, help="Corpus size as a multiple of 671 scholarships")
+    parser.add_argument('--roster-scales', type=int, nargs='*', default=list(ROSTER_SCALES),
+                        help="Roster sizes as multiples of 200 students")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(os.path.join(args.output_dir, 'scholarship_json_files'), args.scale, args.seed)
+    rosters = generate_rosters(os.path.join(args.output_dir, 'rosters'), args.roster_scales, args.seed)
+    print(f"Wrote {len(corpus)} synthetic scholarships and {len(rosters)} rosters to {args.output_dir}")
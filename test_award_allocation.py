@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Checks that scholarships whose soft criteria are all worth 0 points add no soft bonus,
+that limited allocations match an exact min-cost flow, and that a two-award limit on
+the largest synthetic roster solves within a time bound
+"""
+
+import random
+import time
+from collections import deque
+
+from award_allocation import allocate, build_problem
+from candidate_ranking import compile_ranking_corpus, compile_ranking_plan
+from eligibility_engine import RosterIndex
+from improved_processor import get_scholarship_files
+from synthetic_data import ROSTER_SCALES, STUDENTS_PER_SCALE, generate_roster
+
+# Seconds allowed for max_awards=2 on the largest synthetic roster (about 10 s on one core)
+ROSTER_TIME_LIMIT = 30
+
+def scholarship(scholarship_id: int, points: int):
+    return {
+        'basic_information': {'scholarship_id': scholarship_id, 'scholarship_name': f'Test {scholarship_id}',
+                              'candidate_count': 3},
+        'hard_criteria': {'criteria': []},
+        'general_criteria': {'total_possible_points': points * 2, 'criteria': [
+            {'id': 1, 'type': 'classification', 'description': 'SIS_Classification is Senior', 'points': points},
+            {'id': 2, 'type': 'gpa', 'description': 'SIS_Cumulative_GPA is 3.0 or higher', 'points': points}
+        ]}
+    }
+
+def test_all_zero_point_plan_has_no_soft_bonus():
+    roster = RosterIndex(generate_roster(200))
+    plans = [compile_ranking_plan(scholarship(1, 0)), compile_ranking_plan(scholarship(2, 5))]
+    problem = build_problem(plans, roster)
+    zero_index = [plan.eligibility.scholarship_id for plan in problem.plans].index(1)
+    assert set(problem.bonuses[zero_index].values()) == {0}
+
+    result = allocate(plans, roster, max_awards=1)
+    zero_awards = [award for award in result['awards'] if award['scholarship_id'] == 1]
+    assert len(zero_awards) == 3
+    assert all(award['score'] == 0 for award in zero_awards)
+
+def exact_total_weight(problem, size: int, max_awards: int) -> int:
+    """
+    Best total weight by successive longest augmenting paths on the full flow network
+    """
+    count = len(problem.capacities)
+    source, sink = size + count, size + count + 1
+    graph = [[] for _ in range(sink + 1)]
+
+    def add_edge(tail, head, capacity, gain):
+        graph[tail].append([head, capacity, gain, len(graph[head])])
+        graph[head].append([tail, 0, -gain, len(graph[tail]) - 1])
+
+    for position in range(size):
+        add_edge(source, position, max_awards, 0)
+    for index, levels in enumerate(problem.levels):
+        for score, mask in levels.items():
+            for position in range(size):
+                if mask >> position & 1:
+                    add_edge(position, size + index, 1, problem.student_values[position] + problem.bonuses[index][score])
+    for index, capacity in enumerate(problem.capacities):
+        add_edge(size + index, sink, capacity, 0)
+
+    total = 0
+    while True:
+        distance = [None] * len(graph)
+        previous = [None] * len(graph)
+        distance[source] = 0
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            for position, (head, capacity, gain, _) in enumerate(graph[node]):
+                if capacity and (distance[head] is None or distance[node] + gain > distance[head]):
+                    distance[head] = distance[node] + gain
+                    previous[head] = (node, position)
+                    queue.append(head)
+        if distance[sink] is None or distance[sink] <= 0:
+            return total
+        total += distance[sink]
+        node = sink
+        while node != source:
+            tail, position = previous[node]
+            edge = graph[tail][position]
+            edge[1] -= 1
+            graph[node][edge[3]][1] += 1
+            node = tail
+
+def test_limited_allocation_matches_exact_flow():
+    plans = compile_ranking_corpus(get_scholarship_files())
+    rng = random.Random(3)
+    for _ in range(40):
+        size = rng.randint(20, 80)
+        roster = RosterIndex(generate_roster(size, seed=rng.randrange(10 ** 6)))
+        chosen = rng.sample(plans, rng.randint(5, 50))
+        overrides = {plan.eligibility.scholarship_id: rng.randint(1, 5) for plan in chosen}
+        max_awards = rng.randint(1, 3)
+        result = allocate(chosen, roster, max_awards, overrides)
+        assert result['optimal']
+        assert result['total_weight'] == exact_total_weight(build_problem(chosen, roster, overrides), size, max_awards)
+
+def test_two_award_limit_at_roster_scale():
+    plans = compile_ranking_corpus(get_scholarship_files())
+    roster = RosterIndex(generate_roster(STUDENTS_PER_SCALE * max(ROSTER_SCALES)))
+    start = time.perf_counter()
+    result = allocate(plans, roster, max_awards=2)
+    elapsed = time.perf_counter() - start
+    assert result['optimal']
+    assert elapsed < ROSTER_TIME_LIMIT, f"max_awards=2 took {elapsed:.1f}s"
+
+if __name__ == "__main__":
+    test_all_zero_point_plan_has_no_soft_bonus()
+    test_limited_allocation_matches_exact_flow()
+    test_two_award_limit_at_roster_scale()
+    print("award allocation checks passed")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Checks that candidate_ranking scores stay within each scholarship's total_possible_points
+"""
+
+from candidate_ranking import compile_ranking_corpus, compile_ranking_plan, rank_candidates
+from eligibility_engine import RosterIndex
+from improved_processor import get_scholarship_files
+from synthetic_data import generate_roster
+
+def zero_point_scholarship():
+    return {
+        'basic_information': {'scholarship_id': 1, 'scholarship_name': 'Zero Point Test', 'candidate_count': 2},
+        'hard_criteria': {'criteria': []},
+        'general_criteria': {'total_possible_points': 0, 'criteria': [
+            {'id': 1, 'type': 'classification', 'description': 'SIS_Classification is Senior', 'points': 0},
+            {'id': 2, 'type': 'gpa', 'description': 'SIS_Cumulative_GPA is 3.0 or higher'}
+        ]}
+    }
+
+def test_zero_point_criteria_do_not_score():
+    plan = compile_ranking_plan(zero_point_scholarship())
+    assert plan.soft_criteria == ()
+    assert plan.unscored_points == 0
+
+    shortlists = rank_candidates([plan], RosterIndex(generate_roster(200)))
+    assert shortlists[1]['candidates']
+    assert all(candidate['score'] == 0 for candidate in shortlists[1]['candidates'])
+
+def test_shortlist_scores_within_total_possible_points():
+    plans = compile_ranking_corpus(get_scholarship_files())
+    shortlists = rank_candidates(plans, RosterIndex(generate_roster(2000)))
+    assert shortlists
+    over = [(shortlist['scholarship_id'], candidate['score'], shortlist['total_possible_points'])
+            for shortlist in shortlists.values() for candidate in shortlist['candidates']
+            if candidate['score'] > shortlist['total_possible_points']]
+    assert not over, f"Scores above total_possible_points: {over[:10]}"
+
+if __name__ == "__main__":
+    test_zero_point_criteria_do_not_score()
+    test_shortlist_scores_within_total_possible_points()
+    print("candidate ranking checks passed")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Checks catalog_index queries against a plain scan of the records: facet, GPA and text
+filters, facet counts, cursor paging in every sort order, resuming a cursor after the
+corpus changed, and live progress overrides
+"""
+
+from catalog_index import FACETS, SORT_ORDERS, CatalogIndex, load_catalog
+
+def expected_ids(records, sort: str, predicate):
+    field, descending = SORT_ORDERS[sort]
+    ordered = sorted(records, key=lambda record: record['id'])
+    ordered.sort(key=lambda record: record[field], reverse=descending)
+    return [record['id'] for record in ordered if predicate(record)]
+
+def page_through(catalog: CatalogIndex, params, limit: int = 7):
+    ids, cursor = [], None
+    while True:
+        result = catalog.query({**params, 'limit': limit, **({'cursor': cursor} if cursor else {})})
+        ids.extend(card['basic_information']['scholarship_id'] for card in result['items'])
+        cursor = result['next_cursor']
+        if cursor is None:
+            return ids, result['total']
+
+def test_cursor_paging_matches_sorted_scan():
+    catalog = load_catalog()
+    records = catalog.orders['id'].records
+    for sort in SORT_ORDERS:
+        ids, total = page_through(catalog, {'sort': sort}, limit=97)
+        assert ids == expected_ids(records, sort, lambda record: True)
+        assert total == catalog.size
+
+def test_filters_match_scan():
+    catalog = load_catalog()
+    records = catalog.orders['id'].records
+    colleges = sorted({record['facets']['college'][0] for record in records})[:2]
+    word = records[0]['sort_name'].split()[0][:5]
+    cases = [
+        ({'college': ','.join(colleges)}, lambda record: record['facets']['college'][0] in colleges),
+        ({'gpa_min': '2.5', 'gpa_max': '3.0'}, lambda record: record['gpa'] is not None and 2.5 <= record['gpa'] <= 3.0),
+        ({'q': word}, lambda record: word in record['search_text']),
+        ({'q': 'of'}, lambda record: 'of' in record['search_text']),
+        ({'renewable': 'true', 'college': colleges[0]},
+         lambda record: record['facets']['renewable'] == ['true'] and record['facets']['college'] == [colleges[0]]),
+    ]
+    for params, predicate in cases:
+        ids, total = page_through(catalog, {**params, 'sort': 'complexity-desc'})
+        assert ids == expected_ids(records, 'complexity-desc', predicate), params
+        assert total == len(ids)
+
+def test_facet_counts_leave_out_their_own_filter():
+    catalog = load_catalog()
+    records = catalog.orders['id'].records
+    college = records[0]['facets']['college'][0]
+    result = catalog.query({'college': college, 'renewable': 'true'})
+    renewable = [record for record in records if record['facets']['renewable'] == ['true']]
+    expected = {}
+    for record in renewable:
+        expected[record['facets']['college'][0]] = expected.get(record['facets']['college'][0], 0) + 1
+    assert result['facets']['college'] == dict(sorted(expected.items()))
+    assert set(result['facets']) == set(FACETS)
+
+def test_cursor_resumes_after_the_corpus_changed():
+    catalog = load_catalog()
+    records = catalog.orders['id'].records
+    first = catalog.query({'sort': 'name', 'limit': 10})
+    shown = [card['basic_information']['scholarship_id'] for card in first['items']]
+
+    # Drop one already-shown and one not-yet-shown scholarship
+    upcoming = catalog.query({'cursor': first['next_cursor'], 'limit': 5})['items']
+    dropped = {shown[3], upcoming[0]['basic_information']['scholarship_id']}
+    changed = CatalogIndex([record for record in records if record['id'] not in dropped])
+    assert changed.version != catalog.version
+
+    resumed = changed.query({'cursor': first['next_cursor'], 'limit': 5})
+    remaining = expected_ids(records, 'name', lambda record: record['id'] not in dropped)
+    start = remaining.index(shown[-1]) + 1
+    assert [card['basic_information']['scholarship_id'] for card in resumed['items']] == remaining[start:start + 5]
+
+def test_progress_overrides_and_bad_input():
+    catalog = load_catalog()
+    scholarship_id = catalog.orders['id'].records[0]['id']
+    result = catalog.query({'progress_status': 'completed', 'sort': 'id', 'limit': 100},
+                           status_overrides={scholarship_id: 'completed'})
+    ids = [card['basic_information']['scholarship_id'] for card in result['items']]
+    assert scholarship_id in ids
+    assert result['items'][ids.index(scholarship_id)]['progress_status'] == 'completed'
+
+    for params in ({'sort': 'nonsense'}, {'cursor': 'not a cursor'}):
+        try:
+            catalog.query(params)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{params} should be rejected")
+
+if __name__ == "__main__":
+    test_cursor_paging_matches_sorted_scan()
+    test_filters_match_scan()
+    test_facet_counts_leave_out_their_own_filter()
+    test_cursor_resumes_after_the_corpus_changed()
+    test_progress_overrides_and_bad_input()
+    print("catalog index checks passed")
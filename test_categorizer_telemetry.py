@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Checks that rule telemetry counts the same hits whether or not decisions come from
+the categorization cache
+"""
+
+import os
+import tempfile
+
+from categorization_cache import categorize_corpus, use_categorization_cache
+from categorizer_telemetry import collect_telemetry
+from improved_processor import get_scholarship_files
+
+def test_cache_hits_are_recorded():
+    json_files = get_scholarship_files()[:60]
+    with collect_telemetry() as uncached:
+        count = categorize_corpus(json_files)
+    assert uncached.total == count and not uncached.cached
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_path = os.path.join(work_dir, 'cache.db')
+        with use_categorization_cache(db_path) as cache:
+            categorize_corpus(json_files)
+        with use_categorization_cache(db_path) as cache, collect_telemetry() as warm:
+            categorize_corpus(json_files)
+        assert cache.misses == 0
+
+    assert warm.hits == uncached.hits
+    assert warm.categories == uncached.categories
+    assert warm.cached == warm.hits
+    assert warm.unused_rules() == uncached.unused_rules()
+
+if __name__ == "__main__":
+    test_cache_hits_are_recorded()
+    print("categorizer telemetry checks passed")
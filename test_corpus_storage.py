@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Checks that compressing the corpus and decompressing it again restores every file
+byte for byte, that compressed files read transparently, and that list_files and
+the pooled bulk reads and writes keep their order and forms
+"""
+
+import os
+import shutil
+import tempfile
+
+import corpus_storage
+from improved_processor import get_scholarship_files
+
+FILE_COUNT = 40
+
+def copy_corpus(json_dir: str):
+    os.makedirs(json_dir)
+    originals = {}
+    for json_file in get_scholarship_files()[:FILE_COUNT]:
+        path = os.path.join(json_dir, os.path.basename(json_file))
+        shutil.copyfile(json_file, path)
+        with open(json_file, 'rb') as f:
+            originals[os.path.basename(json_file)] = f.read()
+    return originals
+
+def stored_names(json_dir: str):
+    return sorted(name for name in os.listdir(json_dir) if not name.startswith('.'))
+
+def test_compress_decompress_round_trip():
+    with tempfile.TemporaryDirectory() as work_dir:
+        json_dir = os.path.join(work_dir, 'scholarship_json_files')
+        originals = copy_corpus(json_dir)
+        plain_bytes = sum(len(data) for data in originals.values())
+
+        for codec, (suffix, _, _) in corpus_storage.CODECS.items():
+            assert corpus_storage.convert_directory(json_dir, codec, workers=4) == {'files': FILE_COUNT,
+                                                                                    'converted': FILE_COUNT}
+            assert stored_names(json_dir) == sorted(name + suffix for name in originals)
+            paths = corpus_storage.list_files(json_dir)
+            assert [corpus_storage.logical_name(path) for path in paths] == sorted(originals)
+            assert all(corpus_storage.codec_of(path) == codec for path in paths)
+            assert sum(os.path.getsize(path) for path in paths) < plain_bytes
+            texts = corpus_storage.read_texts(paths, workers=4)
+            assert [text.encode('utf-8') for text in texts] == [originals[name] for name in sorted(originals)]
+            assert corpus_storage.convert_directory(json_dir, codec)['converted'] == 0
+
+            assert corpus_storage.convert_directory(json_dir, None, workers=4)['converted'] == FILE_COUNT
+            assert stored_names(json_dir) == sorted(originals)
+            for name, data in originals.items():
+                with open(os.path.join(json_dir, name), 'rb') as f:
+                    assert f.read() == data
+
+def test_plain_file_wins_over_compressed_sibling():
+    with tempfile.TemporaryDirectory() as work_dir:
+        json_dir = os.path.join(work_dir, 'scholarship_json_files')
+        originals = copy_corpus(json_dir)
+        name = sorted(originals)[0]
+        sibling = os.path.join(json_dir, name + '.gz')
+        corpus_storage.write_bytes_atomic(sibling, corpus_storage.encode_bytes(sibling, originals[name].decode('utf-8')))
+        with open(os.path.join(json_dir, corpus_storage.MANIFEST_FILE), 'w') as f:
+            f.write('{"files": []}')
+
+        paths = corpus_storage.list_files(json_dir)
+        assert len(paths) == FILE_COUNT
+        assert os.path.join(json_dir, name) in paths
+        assert corpus_storage.read_prefix(sibling, 1) == b'{'
+
+        # Converting drops the static build's .gz sibling along with the plain file
+        corpus_storage.convert_directory(json_dir, 'gzip')
+        corpus_storage.convert_directory(json_dir, None)
+        assert stored_names(json_dir) == sorted(list(originals) + [corpus_storage.MANIFEST_FILE])
+
+def test_bulk_writes_keep_each_form():
+    with tempfile.TemporaryDirectory() as work_dir:
+        texts = {os.path.join(work_dir, f'{index}.json' + ('.gz' if index % 2 else '')): f'{{"id": {index}}}'
+                 for index in range(25)}
+        corpus_storage.write_texts(texts, workers=3)
+        assert corpus_storage.read_texts(list(texts), workers=3) == list(texts.values())
+        for path in texts:
+            with open(path, 'rb') as f:
+                assert f.read(2) == (b'\x1f\x8b' if path.endswith('.gz') else b'{"')
+        assert not [name for name in os.listdir(work_dir) if name.startswith('.tmp-')]
+
+def test_unknown_codec_rejected():
+    with tempfile.TemporaryDirectory() as work_dir:
+        try:
+            corpus_storage.convert_directory(work_dir, 'lzma')
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("unknown codecs should be rejected")
+
+if __name__ == "__main__":
+    test_compress_decompress_round_trip()
+    test_plain_file_wins_over_compressed_sibling()
+    test_bulk_writes_keep_each_form()
+    test_unknown_codec_rejected()
+    print("corpus storage checks passed")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Checks that update_artifacts, after edits, a college move, an addition and a removal,
+leaves the same index, automation view, summary and bundles as rebuild_all
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+from derived_artifacts import (AUTOMATION_VIEW_FILE, BUNDLE_DIR, BUNDLE_MANIFEST, INDEX_FILE, SUMMARY_FILE,
+                               load_json, rebuild_all, update_artifacts)
+from improved_processor import get_scholarship_files
+
+def artifacts(derived_dir: str):
+    """
+    Every derived artifact, with bundles keyed by college rather than by hashed name
+    """
+    bundles = load_json(os.path.join(derived_dir, BUNDLE_DIR, BUNDLE_MANIFEST))
+    return {
+        'index': load_json(os.path.join(derived_dir, INDEX_FILE)),
+        'automation_view': load_json(os.path.join(derived_dir, AUTOMATION_VIEW_FILE)),
+        'summary': load_json(os.path.join(derived_dir, SUMMARY_FILE)),
+        'bundles': {college: load_json(os.path.join(derived_dir, BUNDLE_DIR, name))
+                    for college, name in bundles.items()},
+        'bundle_files': sorted(os.listdir(os.path.join(derived_dir, BUNDLE_DIR))),
+    }
+
+def edit(path: str, change):
+    with open(path) as f:
+        data = json.load(f)
+    change(data)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+def test_incremental_update_matches_full_rebuild():
+    with tempfile.TemporaryDirectory() as work_dir:
+        json_dir = os.path.join(work_dir, 'scholarship_json_files')
+        os.makedirs(json_dir)
+        corpus = get_scholarship_files()
+        for json_file in corpus[:30]:
+            shutil.copyfile(json_file, os.path.join(json_dir, os.path.basename(json_file)))
+        incremental_dir = os.path.join(work_dir, 'incremental')
+        assert rebuild_all(json_dir, incremental_dir)['scholarships'] == 30
+
+        paths = get_scholarship_files(json_dir)
+        renamed, moved, removed = paths[0], paths[1], paths[2]
+        edit(renamed, lambda data: data['basic_information'].update(scholarship_name='Renamed Scholarship'))
+        edit(moved, lambda data: data['basic_information'].update(college_code='MOVED'))
+        edit(moved, lambda data: data.update(progress_status='completed'))
+        os.remove(removed)
+        added = os.path.join(json_dir, os.path.basename(corpus[30]))
+        shutil.copyfile(corpus[30], added)
+
+        result = update_artifacts([renamed, moved, added], [removed], json_dir, incremental_dir)
+        assert result['scholarships'] == 4
+        assert result['manifest_written']
+
+        rebuilt_dir = os.path.join(work_dir, 'rebuilt')
+        rebuild_all(json_dir, rebuilt_dir)
+        incremental = artifacts(incremental_dir)
+        assert incremental == artifacts(rebuilt_dir)
+        assert incremental['bundles']['MOVED']['scholarships'][0]['progress_status'] == 'completed'
+        assert len(incremental['index']) == 30
+
+def test_missing_index_falls_back_to_rebuild():
+    with tempfile.TemporaryDirectory() as work_dir:
+        json_dir = os.path.join(work_dir, 'scholarship_json_files')
+        os.makedirs(json_dir)
+        for json_file in get_scholarship_files()[:5]:
+            shutil.copyfile(json_file, os.path.join(json_dir, os.path.basename(json_file)))
+        derived_dir = os.path.join(work_dir, 'derived')
+
+        result = update_artifacts([], [], json_dir, derived_dir)
+        assert result['scholarships'] == 5
+        assert len(load_json(os.path.join(derived_dir, INDEX_FILE))) == 5
+
+if __name__ == "__main__":
+    test_incremental_update_matches_full_rebuild()
+    test_missing_index_falls_back_to_rebuild()
+    print("derived artifact checks passed")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Checks that the eligibility batcher answers like a direct evaluation and that its
+worker thread survives a failing batch
+"""
+
+from eligibility_batcher import EligibilityBatcher, evaluate_students
+from eligibility_service import SnapshotManager
+from synthetic_data import generate_roster
+
+def test_batched_results_match_direct_evaluation():
+    snapshot = SnapshotManager().current()
+    rows = generate_roster(40)
+    batcher = EligibilityBatcher(lambda: snapshot)
+    futures = [batcher.submit(rows[start:start + 4]) for start in range(0, len(rows), 4)]
+    results = [entry for future in futures for entry in future.result(30)['results']]
+    assert results == evaluate_students(snapshot, rows)['results']
+    assert batcher.requests == len(futures) and batcher.students == len(rows)
+
+def test_worker_survives_failing_batches():
+    snapshot = SnapshotManager().current()
+    rows = generate_roster(5)
+    failures = {'provider': 1, 'on_batch': 1}
+
+    def provider():
+        if failures['provider']:
+            failures['provider'] -= 1
+            raise RuntimeError("snapshot unavailable")
+        return snapshot
+
+    def on_batch(students, seconds):
+        if failures['on_batch']:
+            failures['on_batch'] -= 1
+            raise RuntimeError("metrics hook failed")
+
+    batcher = EligibilityBatcher(provider, on_batch=on_batch)
+    try:
+        batcher.evaluate(rows[:1], timeout=10)
+        raise AssertionError("A failing snapshot provider did not reach the caller")
+    except RuntimeError as e:
+        assert str(e) == "snapshot unavailable"
+
+    # The hook fails after the results were handed out, so the caller still gets them
+    first = batcher.evaluate(rows[:1], timeout=10)
+    assert first['results'] == evaluate_students(snapshot, rows[:1])['results']
+
+    # And the same worker keeps answering afterwards
+    assert batcher.evaluate(rows, timeout=10)['results'] == evaluate_students(snapshot, rows)['results']
+    assert batcher.failed_batches == 2
+    assert batcher.last_error == "RuntimeError: metrics hook failed"
+
+if __name__ == "__main__":
+    test_batched_results_match_direct_evaluation()
+    test_worker_survives_failing_batches()
+    print("eligibility batcher checks passed")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Checks that a delta recomputation matches a full re-evaluation of the new roster
+"""
+
+import random
+
+from eligibility_delta import (STUDENT_ID_COLUMN, EligibilityState, apply_delta, full_evaluation, get_bit,
+                               project_row)
+from eligibility_engine import compile_corpus
+from improved_processor import get_scholarship_files
+from synthetic_data import generate_roster, generate_student
+
+STUDENTS = 2000
+CHANGED = 100
+REMOVED = 15
+ADDED = 10
+
+def next_extract(rows, seed: int = 11):
+    """
+    The roster after CHANGED students took another student's record, REMOVED left and ADDED enrolled
+    """
+    rng = random.Random(seed)
+    rows = [dict(row) for row in rows]
+    for index in rng.sample(range(len(rows)), CHANGED):
+        donor = rows[rng.randrange(len(rows))]
+        rows[index] = dict(donor, **{STUDENT_ID_COLUMN: rows[index][STUDENT_ID_COLUMN]})
+    for index in sorted(rng.sample(range(len(rows)), REMOVED), reverse=True):
+        del rows[index]
+    rows.extend(generate_student(rng, STUDENTS + index) for index in range(ADDED))
+    return rows
+
+def eligible_pairs(state: EligibilityState):
+    return {(student_id, scholarship_id)
+            for scholarship_id, bitmap in state.matrix.items()
+            for student_id, position in state.positions.items() if get_bit(bitmap, position)}
+
+def test_delta_matches_full_evaluation():
+    plans = compile_corpus(get_scholarship_files())
+    rows = generate_roster(STUDENTS)
+    new_rows = next_extract(rows)
+
+    # Through to_dict/from_dict, as the CLI stores state between extracts
+    state = EligibilityState.from_dict(full_evaluation(plans, rows).to_dict())
+    before = eligible_pairs(state)
+    result = apply_delta(state, plans, new_rows)
+    assert (result['students_added'], result['students_removed']) == (ADDED, REMOVED)
+    assert 0 < result['students_changed'] <= CHANGED
+
+    full = full_evaluation(plans, new_rows)
+    after = eligible_pairs(state)
+    assert after == eligible_pairs(full)
+    assert set(state.rows) == set(full.rows)
+    assert all(state.rows[student_id] == project_row(row) for student_id, row in
+               ((row[STUDENT_ID_COLUMN], row) for row in new_rows))
+
+    # The change log accounts for exactly the pairs that flipped
+    gained = {(change['student_id'], change['scholarship_id']) for change in result['changes']
+              if change['change'] == 'newly_eligible'}
+    lost = {(change['student_id'], change['scholarship_id']) for change in result['changes']
+            if change['change'] == 'newly_ineligible'}
+    assert gained == after - before
+    assert lost == before - after
+
+def test_changed_criteria_are_reevaluated_for_everyone():
+    plans = compile_corpus(get_scholarship_files())
+    rows = generate_roster(500)
+    state = full_evaluation(plans, rows)
+    # Pretend the first scholarships' criteria changed since the stored run
+    for plan in plans[:20]:
+        state.plan_signatures[plan.scholarship_id] = 'stale'
+        state.matrix[plan.scholarship_id] = bytearray()
+
+    result = apply_delta(state, plans, rows)
+    assert result['scholarships_changed'] == 20
+    assert eligible_pairs(state) == eligible_pairs(full_evaluation(plans, rows))
+
+if __name__ == "__main__":
+    test_delta_matches_full_evaluation()
+    test_changed_criteria_are_reevaluated_for_everyone()
+    print("eligibility delta checks passed")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Checks SnapshotManager swaps: unchanged corpora keep their snapshot, edits re-read only
+the changed file, old snapshots stay intact for in-flight requests, unreadable files and
+failed builds keep serving the last good data, and readers see no errors during
+background swaps
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from eligibility_service import SnapshotManager
+from improved_processor import get_scholarship_files
+
+FILE_COUNT = 20
+
+def copy_corpus(json_dir: str):
+    os.makedirs(json_dir)
+    for json_file in get_scholarship_files()[:FILE_COUNT]:
+        shutil.copyfile(json_file, os.path.join(json_dir, os.path.basename(json_file)))
+    return get_scholarship_files(json_dir)
+
+def rewrite(path: str, change):
+    """
+    Apply change to the file's data and move its mtime forward so the edit is always seen
+    """
+    with open(path) as f:
+        data = json.load(f)
+    change(data)
+    mtime_ns = os.stat(path).st_mtime_ns
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.utime(path, ns=(mtime_ns + 10 ** 9, mtime_ns + 10 ** 9))
+    return data['basic_information']['scholarship_id']
+
+def card_names(snapshot):
+    return {record['id']: record['card']['basic_information']['scholarship_name']
+            for record in snapshot.catalog.orders['id'].records}
+
+def test_swaps_reuse_unchanged_files_and_keep_old_snapshots():
+    with tempfile.TemporaryDirectory() as work_dir:
+        json_dir = os.path.join(work_dir, 'scholarship_json_files')
+        paths = copy_corpus(json_dir)
+        manager = SnapshotManager(json_dir, stats_path=None)
+        first = manager.current()
+        assert first.version == 1 and len(first.plans) == FILE_COUNT
+        assert not manager.refresh()
+        assert manager.current() is first
+
+        scholarship_id = rewrite(paths[0], lambda data: data['basic_information'].update(scholarship_name='Renamed'))
+        assert manager.refresh()
+        second = manager.current()
+        assert second.version == 2 and second.reused_files == FILE_COUNT - 1
+        assert second.catalog.version != first.catalog.version
+        assert card_names(second)[scholarship_id] == 'Renamed'
+        # A request still holding the first snapshot keeps seeing the old corpus
+        assert card_names(first)[scholarship_id] != 'Renamed'
+
+        os.remove(paths[1])
+        assert manager.refresh()
+        assert len(manager.current().plans) == FILE_COUNT - 1
+        metrics = manager.metrics()
+        assert metrics['builds'] == 3 and metrics['failed_builds'] == 0
+        assert metrics['files_loaded'] == FILE_COUNT + 1
+
+def test_unreadable_files_and_failed_builds_keep_last_good_data():
+    with tempfile.TemporaryDirectory() as work_dir:
+        json_dir = os.path.join(work_dir, 'scholarship_json_files')
+        paths = copy_corpus(json_dir)
+        stats_path = os.path.join(work_dir, 'predicate_stats.json')
+        manager = SnapshotManager(json_dir, stats_path=stats_path)
+        first = manager.current()
+
+        # A file caught mid-write keeps its previous record and plan
+        with open(paths[0], 'w') as f:
+            f.write('{"basic_information": ')
+        os.utime(paths[0], ns=(time.time_ns() + 10 ** 9,) * 2)
+        assert manager.refresh()
+        assert len(manager.current().plans) == FILE_COUNT
+        assert manager.current().files[paths[0]][1] == first.files[paths[0]][1]
+
+        # A build that raises leaves the current snapshot in place and reports the error
+        with open(stats_path, 'w') as f:
+            f.write('not json')
+        current = manager.current()
+        rewrite(paths[2], lambda data: data['basic_information'].update(scholarship_name='Renamed'))
+        assert not manager.refresh()
+        assert manager.current() is current
+        assert manager.metrics()['failed_builds'] == 1 and manager.last_error
+
+        os.remove(stats_path)
+        assert manager.refresh()
+        assert manager.last_error is None
+
+def test_background_swaps_do_not_disturb_readers():
+    with tempfile.TemporaryDirectory() as work_dir:
+        json_dir = os.path.join(work_dir, 'scholarship_json_files')
+        paths = copy_corpus(json_dir)
+        manager = SnapshotManager(json_dir, poll_interval=0.05, stats_path=None)
+        manager.current()
+        errors = []
+        done = threading.Event()
+
+        def read():
+            while not done.is_set():
+                try:
+                    snapshot = manager.current()
+                    assert len(snapshot.plans) == len(snapshot.plans_by_id) == FILE_COUNT
+                    snapshot.catalog.query({'limit': 5})
+                except Exception as e:
+                    errors.append(e)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        manager.start()
+        try:
+            for round_number in range(3):
+                name = f'Round {round_number}'
+                scholarship_id = rewrite(paths[round_number],
+                                         lambda data: data['basic_information'].update(scholarship_name=name))
+                deadline = time.monotonic() + 30
+                while card_names(manager.current())[scholarship_id] != name and time.monotonic() < deadline:
+                    time.sleep(0.02)
+                assert card_names(manager.current())[scholarship_id] == name
+            assert manager.current().version >= 4
+        finally:
+            manager.stop()
+            done.set()
+            for reader in readers:
+                reader.join()
+        assert errors == []
+
+if __name__ == "__main__":
+    test_swaps_reuse_unchanged_files_and_keep_old_snapshots()
+    test_unreadable_files_and_failed_builds_keep_last_good_data()
+    test_background_swaps_do_not_disturb_readers()
+    print("eligibility service checks passed")
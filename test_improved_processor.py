@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Checks that running improved_processor.py as a script installs the categorization
+cache on the improved_processor module other modules import
+"""
+
+import runpy
+import sys
+
+import improved_processor
+
+def test_script_installs_cache_on_imported_module():
+    seen = []
+    run_pipeline = improved_processor.run_pipeline
+    argv = sys.argv
+    improved_processor.run_pipeline = lambda args: seen.append(improved_processor.CATEGORIZATION_CACHE)
+    sys.argv = ['improved_processor.py']
+    try:
+        runpy.run_path(improved_processor.__file__, run_name='__main__')
+    finally:
+        improved_processor.run_pipeline = run_pipeline
+        sys.argv = argv
+    assert len(seen) == 1 and seen[0] is not None
+    assert improved_processor.CATEGORIZATION_CACHE is None
+
+if __name__ == "__main__":
+    test_script_installs_cache_on_imported_module()
+    print("improved processor checks passed")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Checks that json_backend.dumps writes exactly what the stdlib writes, for every corpus
+file and for the values orjson formats differently, under each available backend
+"""
+
+import json
+import math
+
+import corpus_storage
+import json_backend
+from improved_processor import get_scholarship_files
+
+TRICKY_DOCUMENTS = [
+    {'small': 1e-07, 'large': 1e+20, 'plain': 1.5, 'negative_zero': -0.0},
+    {'nan': float('nan'), 'infinity': float('inf')},
+    {1: 'int key', 'nested': {2.5: 'float key', True: 'bool key'}},
+    {'huge': 2 ** 70, 'below_int64': -2 ** 63 - 1, 'uint64': 2 ** 64 - 1},
+    {'text': 'Señor “quoted”   ✓ \U0001f393', 'control': '\x07\t\n'},
+    {'empty_list': [], 'empty_dict': {}, 'tuple': (1, 2), 'none': None, 'flags': [True, False]},
+    [1, [2, [3, {}]], 'top-level list'],
+]
+
+def backends():
+    return [name for name in json_backend.BACKENDS if json_backend.available_backend(name) == name]
+
+def with_each_backend(check):
+    previous = json_backend.BACKEND
+    try:
+        for name in backends():
+            json_backend.set_backend(name)
+            check(name)
+    finally:
+        json_backend.set_backend(previous)
+
+def test_corpus_encodes_like_stdlib():
+    json_files = get_scholarship_files()
+    texts = corpus_storage.read_texts(json_files)
+
+    def check(name):
+        for json_file, text in zip(json_files, texts):
+            data = json_backend.loads(text)
+            assert json_backend.dumps(data) == json_backend.stdlib_dumps(json.loads(text)), (name, json_file)
+
+    with_each_backend(check)
+
+def test_tricky_values_encode_like_stdlib():
+    def check(name):
+        for document in TRICKY_DOCUMENTS:
+            assert json_backend.dumps(document) == json.dumps(document, indent=2, ensure_ascii=False), (name, document)
+
+    with_each_backend(check)
+
+def test_loads_accepts_what_stdlib_accepts():
+    def check(name):
+        data = json_backend.loads('{"nan": NaN, "huge": 1180591620717411303424}')
+        assert math.isnan(data['nan']) and data['huge'] == 2 ** 70
+        assert json_backend.loads(b'{"a": [1, 2.5]}') == {'a': [1, 2.5]}
+        try:
+            json_backend.loads('{"truncated": ')
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("truncated JSON should be rejected")
+
+    with_each_backend(check)
+
+def test_verify_mode_counts_without_mismatches():
+    if 'orjson' not in backends():
+        return
+    previous, previous_verify = json_backend.BACKEND, json_backend.VERIFY
+    json_backend.set_backend('orjson')
+    json_backend.set_verify(True)
+    try:
+        verified = json_backend.STATS['verified']
+        mismatches = json_backend.STATS['mismatches']
+        json_backend.dumps({'name': 'Scholarship', 'gpa': 3.25, 'criteria': [{'id': 1}]})
+        assert json_backend.STATS['verified'] == verified + 1
+        assert json_backend.STATS['mismatches'] == mismatches
+    finally:
+        json_backend.set_verify(previous_verify)
+        json_backend.set_backend(previous)
+
+def test_unknown_backend_rejected():
+    try:
+        json_backend.available_backend('simdjson')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown backends should be rejected")
+
+if __name__ == "__main__":
+    test_corpus_encodes_like_stdlib()
+    test_tricky_values_encode_like_stdlib()
+    test_loads_accepts_what_stdlib_accepts()
+    test_verify_mode_counts_without_mismatches()
+    test_unknown_backend_rejected()
+    print("json backend checks passed")
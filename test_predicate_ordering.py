@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Checks that cost-ordered plans, as served by the API's snapshots, give the same
+eligibility as plans in file order
+"""
+
+import os
+import tempfile
+
+from eligibility_batcher import evaluate_students
+from eligibility_engine import compile_corpus, evaluate_student
+from eligibility_service import SnapshotManager
+from improved_processor import get_scholarship_files
+from predicate_ordering import PredicateStatistics, order_plans, plan_cost, save_statistics
+from synthetic_data import generate_roster
+
+def test_cost_order_keeps_results_and_lowers_cost():
+    plans = compile_corpus(get_scholarship_files())
+    rows = generate_roster(300)
+    stats = PredicateStatistics.from_rows(rows)
+    ordered = order_plans(plans, stats)
+    assert [evaluate_student(ordered, row) for row in rows] == [evaluate_student(plans, row) for row in rows]
+    assert sum(plan_cost(plan, stats) for plan in ordered) <= sum(plan_cost(plan, stats) for plan in plans)
+
+def test_snapshots_apply_saved_statistics():
+    rows = generate_roster(300)
+    with tempfile.TemporaryDirectory() as work_dir:
+        stats_path = os.path.join(work_dir, 'predicate_stats.json')
+        file_order = SnapshotManager(stats_path=stats_path).current()
+        assert not file_order.cost_ordered
+
+        stats = PredicateStatistics.from_rows(rows)
+        save_statistics(stats, stats_path)
+        cost_order = SnapshotManager(stats_path=stats_path).current()
+        assert cost_order.cost_ordered
+        assert cost_order.plans == order_plans(file_order.plans, stats)
+        assert cost_order.plans_by_id[cost_order.plans[0].scholarship_id] is cost_order.plans[0]
+        assert evaluate_students(cost_order, rows)['results'] == evaluate_students(file_order, rows)['results']
+
+if __name__ == "__main__":
+    test_cost_order_keeps_results_and_lowers_cost()
+    test_snapshots_apply_saved_statistics()
+    print("predicate ordering checks passed")
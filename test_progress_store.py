@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Checks ProgressStore version conflicts, coalescing and the export back to JSON
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import corpus_storage
+from improved_processor import SCHOLARSHIP_JSON_DIR, get_scholarship_files
+from progress_store import ProgressStore
+
+SCHOLARSHIP_ID = 107109
+
+def run_concurrently(store: ProgressStore, change_sets):
+    """
+    Start one bulk_update per change set at the same moment; results in change-set order
+    """
+    barrier = threading.Barrier(len(change_sets))
+    results = [None] * len(change_sets)
+
+    def update(index):
+        barrier.wait()
+        results[index] = store.bulk_update(change_sets[index], updated_by=f'editor-{index}')
+
+    threads = [threading.Thread(target=update, args=(index,)) for index in range(len(change_sets))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_updates_conflict_without_losing_one():
+    with tempfile.TemporaryDirectory() as work_dir:
+        store = ProgressStore(os.path.join(work_dir, 'progress.db'))
+        store.bulk_update([{'scholarship_id': SCHOLARSHIP_ID, 'status': 'not-processed'}])
+        version = store.get(SCHOLARSHIP_ID)['version']
+
+        results = run_concurrently(store, [
+            [{'scholarship_id': SCHOLARSHIP_ID, 'status': 'in-process', 'expected_version': version}],
+            [{'scholarship_id': SCHOLARSHIP_ID, 'status': 'complete', 'expected_version': version}],
+        ])
+        applied = [change for result in results for change in result['applied']]
+        conflicts = [conflict for result in results for conflict in result['conflicts']]
+        assert len(applied) == 1 and len(conflicts) == 1
+        assert conflicts[0]['current_version'] == version + 1
+
+        current = store.get(SCHOLARSHIP_ID)
+        assert current['version'] == version + 1
+        assert current['status'] == applied[0]['status']
+
+def test_unversioned_concurrent_updates_are_both_applied():
+    with tempfile.TemporaryDirectory() as work_dir:
+        store = ProgressStore(os.path.join(work_dir, 'progress.db'))
+        results = run_concurrently(store, [
+            [{'scholarship_id': SCHOLARSHIP_ID, 'status': 'in-process'}],
+            [{'scholarship_id': SCHOLARSHIP_ID, 'status': 'complete'}],
+        ])
+        assert all(len(result['applied']) == 1 and not result['conflicts'] for result in results)
+        assert store.get(SCHOLARSHIP_ID)['version'] == 2
+
+def test_repeated_changes_are_coalesced():
+    with tempfile.TemporaryDirectory() as work_dir:
+        store = ProgressStore(os.path.join(work_dir, 'progress.db'))
+        result = store.bulk_update([{'scholarship_id': SCHOLARSHIP_ID, 'status': 'in-process'},
+                                    {'scholarship_id': str(SCHOLARSHIP_ID), 'status': 'complete'}])
+        assert result['applied'] == [{'scholarship_id': SCHOLARSHIP_ID, 'status': 'complete', 'version': 1}]
+        assert store.get(SCHOLARSHIP_ID)['status'] == 'complete'
+
+def test_malformed_updates_raise_value_error():
+    with tempfile.TemporaryDirectory() as work_dir:
+        store = ProgressStore(os.path.join(work_dir, 'progress.db'))
+        for change in ({'scholarship_id': SCHOLARSHIP_ID}, {'status': 'complete'},
+                       {'scholarship_id': None, 'status': 'complete'}, 'complete'):
+            try:
+                store.bulk_update([change])
+            except ValueError:
+                continue
+            raise AssertionError(f"Accepted malformed update {change!r}")
+        assert store.get_all() == {}
+
+def test_export_round_trips_through_json():
+    with tempfile.TemporaryDirectory() as work_dir:
+        json_dir = os.path.join(work_dir, 'scholarship_json_files')
+        os.makedirs(json_dir)
+        for json_file in get_scholarship_files(SCHOLARSHIP_JSON_DIR)[:5]:
+            shutil.copy(json_file, json_dir)
+        json_files = get_scholarship_files(json_dir)
+
+        store = ProgressStore(os.path.join(work_dir, 'progress.db'))
+        assert store.seed_from_json(json_files) == len(json_files)
+        seeded = store.get_all()
+
+        changed = {}
+        for json_file in json_files[:3]:
+            scholarship_id = int(corpus_storage.logical_name(json_file)[:-len('.json')])
+            changed[scholarship_id] = 'complete' if seeded[scholarship_id]['status'] != 'complete' else 'in-process'
+        store.bulk_update([{'scholarship_id': sid, 'status': status} for sid, status in changed.items()])
+
+        assert store.export_to_json(json_dir, update_bundles=False) == {'files_written': 3, 'pending': 0}
+        assert store.export_to_json(json_dir, update_bundles=False) == {'files_written': 0, 'pending': 0}
+
+        expected = {sid: entry['status'] for sid, entry in store.get_all().items()}
+        for json_file in json_files:
+            scholarship = json.loads(corpus_storage.read_text(json_file))
+            scholarship_id = int(scholarship['basic_information']['scholarship_id'])
+            assert scholarship['progress_status'] == expected[scholarship_id]
+
+        # A fresh store seeded from the exported files sees the same statuses
+        reseeded = ProgressStore(os.path.join(work_dir, 'reseeded.db'))
+        reseeded.seed_from_json(json_files)
+        assert {sid: entry['status'] for sid, entry in reseeded.get_all().items()} == expected
+
+if __name__ == "__main__":
+    test_concurrent_updates_conflict_without_losing_one()
+    test_unversioned_concurrent_updates_are_both_applied()
+    test_repeated_changes_are_coalesced()
+    test_malformed_updates_raise_value_error()
+    test_export_round_trips_through_json()
+    print("progress store checks passed")
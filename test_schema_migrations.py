@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Checks that migrate_corpus stamps and upgrades scholarship files (plain and compressed),
+skips files already current, and that peek_schema_version reads the stamped header
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import corpus_storage
+from improved_processor import get_scholarship_files
+from schema_migrations import CURRENT_SCHEMA_VERSION, migrate_corpus, peek_schema_version
+
+def copy_corpus(work_dir: str, count: int):
+    """
+    Copy the first count corpus files into work_dir, returning the copied paths
+    """
+    paths = []
+    for json_file in get_scholarship_files()[:count]:
+        path = os.path.join(work_dir, os.path.basename(json_file))
+        shutil.copyfile(json_file, path)
+        paths.append(path)
+    return paths
+
+def test_migrate_corpus_stamps_and_then_skips():
+    with tempfile.TemporaryDirectory() as work_dir:
+        paths = copy_corpus(work_dir, 5)
+        with open(paths[0]) as f:
+            legacy = json.load(f)
+        legacy['qualifying_criteria'] = legacy.pop('hard_criteria')
+        legacy.pop('progress_status', None)
+        legacy.pop('schema_version', None)
+        with open(paths[0], 'w') as f:
+            json.dump(legacy, f, indent=2)
+        assert peek_schema_version(paths[0]) == 0
+
+        totals = migrate_corpus(paths, batch_size=2)
+        assert totals == {'migrated': 5, 'skipped': 0, 'failed': 0}
+        for path in paths:
+            assert peek_schema_version(path) == CURRENT_SCHEMA_VERSION
+            with open(path) as f:
+                data = json.load(f)
+            assert next(iter(data)) == 'schema_version'
+            assert 'progress_status' in data
+
+        with open(paths[0]) as f:
+            migrated = json.load(f)
+        assert 'qualifying_criteria' not in migrated
+        assert migrated['hard_criteria']['criteria'] == legacy['qualifying_criteria']['criteria']
+        assert migrated['progress_status'] == 'not-processed'
+
+        assert migrate_corpus(paths) == {'migrated': 0, 'skipped': 5, 'failed': 0}
+
+def test_dry_run_and_broken_files_leave_the_corpus_alone():
+    with tempfile.TemporaryDirectory() as work_dir:
+        paths = copy_corpus(work_dir, 2)
+        before = [corpus_storage.read_bytes(path) for path in paths]
+        broken = os.path.join(work_dir, '999999.json')
+        with open(broken, 'w') as f:
+            f.write('{"basic_information": ')
+
+        totals = migrate_corpus(paths + [broken], dry_run=True)
+        assert totals == {'migrated': 2, 'skipped': 0, 'failed': 1}
+        assert [corpus_storage.read_bytes(path) for path in paths] == before
+
+def test_compressed_files_migrate_in_place():
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = copy_corpus(work_dir, 1)[0]
+        compressed = corpus_storage.stored_path(path, 'gzip')
+        corpus_storage.write_bytes_atomic(compressed, corpus_storage.encode_bytes(compressed, corpus_storage.read_text(path)))
+        os.remove(path)
+        assert peek_schema_version(compressed) == 0
+
+        assert migrate_corpus([compressed])['migrated'] == 1
+        assert peek_schema_version(compressed) == CURRENT_SCHEMA_VERSION
+        assert json.loads(corpus_storage.read_text(compressed))['schema_version'] == CURRENT_SCHEMA_VERSION
+
+if __name__ == "__main__":
+    test_migrate_corpus_stamps_and_then_skips()
+    test_dry_run_and_broken_files_leave_the_corpus_alone()
+    test_compressed_files_migrate_in_place()
+    print("schema migration checks passed")
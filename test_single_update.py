@@ -1,6 +1,8 @@
 import json
 import os
 
+from schema_migrations import write_json_atomic
+
 def test_single_scholarship():
     # Test with the specific scholarship we know has the issue
     scholarship_file = "/Users/Nayan/Documents/UCO-Foundation/Python/Scholarship_info_website/scholarship_json_files/107109.json"
@@ -90,8 +92,7 @@ def test_single_scholarship():
         }
         
         # Write the updated file
-        with open(scholarship_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        write_json_atomic(scholarship_file, data)
         
         print(f"\n✅ Updated {scholarship_file}")
         
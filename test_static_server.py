@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Checks static_server encoding negotiation, ETag revalidation (304), the compressed
+corpus fallback, and that traversal, hidden and source files are refused
+"""
+
+import gzip
+import http.client
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from static_server import IMMUTABLE_CACHE, StaticSiteServer, build_precompressed
+
+PAYLOAD = ('{"scholarships": [' + ', '.join(f'{{"id": {index}}}' for index in range(200)) + ']}').encode('utf-8')
+
+def write_file(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+@contextmanager
+def running_site():
+    """
+    Serve a small site (with a secret file next to its root) on a free loopback port
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        root = os.path.join(work_dir, 'site')
+        write_file(os.path.join(work_dir, 'secret.txt'), b'outside the site root')
+        write_file(os.path.join(root, 'index.html'), b'<html>portal</html>')
+        write_file(os.path.join(root, 'data.json'), PAYLOAD)
+        write_file(os.path.join(root, 'bundles', 'CLA-0123456789ab.json'), PAYLOAD)
+        write_file(os.path.join(root, 'scholarship_json_files', '107109.json.gz'), gzip.compress(PAYLOAD))
+        write_file(os.path.join(root, 'api_server.py'), b'# source')
+        write_file(os.path.join(root, '.env'), b'TOKEN=1')
+        build_precompressed(root, dirs=('.',))
+
+        server = StaticSiteServer(('127.0.0.1', 0), root, quiet=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield server.server_address[1]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+def fetch(port: int, path: str, headers=None, method: str = 'GET'):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    try:
+        connection.request(method, path, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+def test_encoding_negotiation_and_revalidation():
+    with running_site() as port:
+        status, headers, body = fetch(port, '/data.json')
+        assert status == 200 and body == PAYLOAD
+        assert 'Content-Encoding' not in headers
+        plain_etag = headers['ETag']
+
+        status, headers, body = fetch(port, '/data.json', {'Accept-Encoding': 'br;q=0, gzip'})
+        assert status == 200 and headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(body) == PAYLOAD
+        assert headers['Vary'] == 'Accept-Encoding'
+        gzip_etag = headers['ETag']
+        assert gzip_etag != plain_etag and gzip_etag.strip('"').startswith(plain_etag.strip('"'))
+
+        # Either representation's tag revalidates the other, weak or not
+        for tag in (plain_etag, gzip_etag, 'W/' + gzip_etag, '"stale", ' + plain_etag, '*'):
+            status, headers, body = fetch(port, '/data.json', {'If-None-Match': tag, 'Accept-Encoding': 'gzip'})
+            assert status == 304 and body == b''
+            assert headers['ETag'] == gzip_etag
+        assert fetch(port, '/data.json', {'If-None-Match': '"stale"'})[0] == 200
+
+        status, headers, body = fetch(port, '/data.json', method='HEAD')
+        assert status == 200 and body == b'' and headers['Content-Length'] == str(len(PAYLOAD))
+
+def test_cache_control_and_directory_index():
+    with running_site() as port:
+        status, headers, body = fetch(port, '/bundles/CLA-0123456789ab.json')
+        assert status == 200 and headers['Cache-Control'] == IMMUTABLE_CACHE
+        status, headers, body = fetch(port, '/')
+        assert status == 200 and body == b'<html>portal</html>'
+        assert headers['Cache-Control'] == 'no-cache'
+
+def test_compressed_corpus_served_at_plain_url():
+    with running_site() as port:
+        status, headers, body = fetch(port, '/scholarship_json_files/107109.json')
+        assert status == 200 and body == PAYLOAD
+        assert headers['Content-Type'].startswith('application/json')
+
+        status, headers, body = fetch(port, '/scholarship_json_files/107109.json', {'Accept-Encoding': 'gzip'})
+        assert status == 200 and headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(body) == PAYLOAD
+
+def test_traversal_and_private_files_refused():
+    with running_site() as port:
+        for path in ('/../secret.txt', '/%2e%2e/secret.txt', '/bundles/../../secret.txt',
+                     '/..%2fsecret.txt', '/.env', '/api_server.py', '/missing.json'):
+            status, _, body = fetch(port, path)
+            assert status == 404, path
+            assert b'outside the site root' not in body
+
+        # The API is not mounted unless asked for
+        assert fetch(port, '/api/progress')[0] == 404
+        assert fetch(port, '/api/progress', method='POST')[0] == 405
+
+if __name__ == "__main__":
+    test_encoding_negotiation_and_revalidation()
+    test_cache_control_and_directory_index()
+    test_compressed_corpus_served_at_plain_url()
+    test_traversal_and_private_files_refused()
+    print("static server checks passed")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Scholarship Watch Mode
+Watches scholarship_json_files for edits, re-processes only the changed files
+and incrementally updates the derived artifacts for the affected scholarships.
+
+Change detection polls file mtimes and sizes, which works on every OS. When the
+optional watchdog package is installed it is only used to wake the poller early.
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from corpus_storage import stored_entries
+from derived_artifacts import DERIVED_DIR, rebuild_all, update_artifacts
+from improved_processor import SCHOLARSHIP_JSON_DIR, process_scholarship_json
+
+FileSignature = Tuple[int, int]
+
+def scan_directory(json_dir: str) -> Dict[str, FileSignature]:
+    """
+    Snapshot (mtime_ns, size) for every scholarship file in the directory
+    """
+    snapshot = {}
+    for entry in stored_entries(json_dir).values():
+        stat = entry.stat()
+        snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+def diff_snapshots(previous: Dict[str, FileSignature], current: Dict[str, FileSignature]) -> Tuple[List[str], List[str]]:
+    """
+    Return (changed_or_added, removed) file paths between two snapshots
+    """
+    changed = [path for path, signature in current.items() if previous.get(path) != signature]
+    removed = [path for path in previous if path not in current]
+    return sorted(changed), sorted(removed)
+
+def start_change_notifier(json_dir: str, wake_event: threading.Event):
+    """
+    Wake the poller on filesystem events when watchdog is available.
+    Returns the observer, or None when falling back to plain polling.
+    """
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class WakeHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            wake_event.set()
+
+    observer = Observer()
+    observer.schedule(WakeHandler(), json_dir, recursive=False)
+    observer.daemon = True
+    observer.start()
+    return observer
+
+def rebuild_changed(changed: List[str], removed: List[str], json_dir: str, derived_dir: str,
+                    reprocess: bool = True) -> Dict:
+    """
+    Re-process changed files and update derived artifacts, timing the whole rebuild
+    """
+    start = time.perf_counter()
+
+    failed = []
+    if reprocess:
+        for json_file in changed:
+            if not process_scholarship_json(json_file):
+                failed.append(json_file)
+
+    result = update_artifacts([f for f in changed if f not in failed], removed, json_dir, derived_dir)
+    result['failed'] = len(failed)
+    result['latency_ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+def watch(json_dir: str = SCHOLARSHIP_JSON_DIR, derived_dir: str = DERIVED_DIR, interval: float = 1.0,
+          reprocess: bool = True, max_cycles: Optional[int] = None):
+    """
+    Poll for changes until interrupted (or for max_cycles polls)
+    """
+    print(f"Building derived artifacts for {json_dir}...")
+    rebuild_all(json_dir, derived_dir)
+    snapshot = scan_directory(json_dir)
+
+    wake_event = threading.Event()
+    observer = start_change_notifier(json_dir, wake_event)
+    mode = 'filesystem events + polling' if observer else 'polling'
+    print(f"Watching {len(snapshot)} scholarship files ({mode}, every {interval:.1f}s). Press Ctrl+C to stop.")
+
+    cycles = 0
+    try:
+        while max_cycles is None or cycles < max_cycles:
+            wake_event.wait(interval)
+            wake_event.clear()
+            cycles += 1
+
+            current = scan_directory(json_dir)
+            changed, removed = diff_snapshots(snapshot, current)
+            if not changed and not removed:
+                continue
+
+            result = rebuild_changed(changed, removed, json_dir, derived_dir, reprocess)
+
+            # Record our own rewrites of the changed files so they are not picked up as new edits
+            snapshot = current
+            for json_file in changed:
+                if os.path.exists(json_file):
+                    stat = os.stat(json_file)
+                    snapshot[json_file] = (stat.st_mtime_ns, stat.st_size)
+
+            print(f"[{time.strftime('%H:%M:%S')}] Rebuilt {len(changed)} changed, {len(removed)} removed "
+                  f"({result['bundles_written']} bundles, {result['failed']} failed) "
+                  f"in {result['latency_ms']:.1f} ms")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        if observer:
+            observer.stop()
+
+if __name__ == "__main__":
+    poll_interval = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    watch(interval=poll_interval)
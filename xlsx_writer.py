@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Streaming XLSX Writer
+Writes .xlsx workbooks without a spreadsheet library and without holding a sheet
+in memory:
+- Each sheet is streamed row by row into its zip entry, so memory stays flat no
+  matter how many rows a report has
+- Strings are written inline (no shared-string table to build first), numbers as
+  numeric cells; the header row uses the bold, bordered style of the hand-made reports
+- The workbook is written to a temporary file and moved into place on close
+"""
+
+import os
+import re
+import zipfile
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PACKAGE_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+WORKSHEET_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml'
+# Rows are buffered into chunks of this many before being compressed
+ROWS_PER_CHUNK = 2000
+MAX_SHEET_NAME = 31
+# Excel's 1,048,576 rows per sheet, less the header
+MAX_DATA_ROWS = 1048575
+
+# Characters XML 1.0 does not allow, even escaped
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+STYLES_XML = (
+    f'<styleSheet xmlns="{MAIN_NS}">'
+    '<fonts count="2"><font><name val="Calibri"/><family val="2"/><sz val="11"/></font>'
+    '<font><b val="1"/><name val="Calibri"/><family val="2"/><sz val="11"/></font></fonts>'
+    '<fills count="2"><fill><patternFill/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="2"><border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="1" applyFont="1" applyBorder="1" applyAlignment="1" xfId="0">'
+    '<alignment horizontal="center" vertical="top"/></xf></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+HEADER_STYLE = 1
+
+def column_letter(index: int) -> str:
+    """
+    Spreadsheet column name of a zero-based column index (0 → A, 26 → AA)
+    """
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def cell_xml(reference: str, value, style: int = 0) -> str:
+    style_attr = f' s="{style}"' if style else ''
+    if value is None or value == '':
+        return f'<c r="{reference}"{style_attr}/>' if style else ''
+    if isinstance(value, bool):
+        return f'<c r="{reference}"{style_attr} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{reference}"{style_attr} t="n"><v>{value}</v></c>'
+    text = INVALID_XML_CHARS.sub('', str(value))
+    space = ' xml:space="preserve"' if text != text.strip() else ''
+    return f'<c r="{reference}"{style_attr} t="inlineStr"><is><t{space}>{escape(text)}</t></is></c>'
+
+class StreamingWorkbook:
+    """
+    One workbook being written; sheets are added in order with write_sheet
+    """
+
+    def __init__(self, path: str, compresslevel: int = 1):
+        self.path = path
+        self.temp_path = path + '.tmp'
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._zip = zipfile.ZipFile(self.temp_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
+        self.sheet_names: List[str] = []
+
+    def write_sheet(self, name: str, header: Sequence[str], rows: Iterable[Sequence],
+                    widths: Optional[Sequence[float]] = None) -> int:
+        """
+        Stream one sheet; rows beyond Excel's limit continue on "name (2)", "name (3)", ...
+        Returns the number of data rows written.
+        """
+        rows = iter(rows)
+        first = next(rows, None)
+        count = 0
+        part = 1
+        while True:
+            written, first = self._write_part(name if part == 1 else f'{name[:MAX_SHEET_NAME - 5]} ({part})',
+                                              header, first, rows, widths)
+            count += written
+            if first is None:
+                return count
+            part += 1
+
+    def _write_part(self, name: str, header: Sequence[str], first: Optional[Sequence], rows: Iterator[Sequence],
+                    widths: Optional[Sequence[float]]) -> Tuple[int, Optional[Sequence]]:
+        """
+        Write up to MAX_DATA_ROWS rows starting with first; returns (rows written, first row left over)
+        """
+        self.sheet_names.append(name[:MAX_SHEET_NAME])
+        letters = [column_letter(index) for index in range(len(header))]
+        cols = ''
+        if widths:
+            cols = '<cols>' + ''.join(f'<col min="{index}" max="{index}" width="{width}" customWidth="1"/>'
+                                      for index, width in enumerate(widths, 1)) + '</cols>'
+
+        count = 0
+        entry = f'xl/worksheets/sheet{len(self.sheet_names)}.xml'
+        with self._zip.open(entry, 'w', force_zip64=True) as sheet:
+            sheet.write((f'<worksheet xmlns="{MAIN_NS}"><sheetViews><sheetView workbookViewId="0">'
+                         '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+                         f'</sheetView></sheetViews><sheetFormatPr defaultRowHeight="15"/>{cols}<sheetData>'
+                         '<row r="1">' + ''.join(cell_xml(f'{letter}1', title, HEADER_STYLE)
+                                                 for letter, title in zip(letters, header)) + '</row>').encode('utf-8'))
+            chunk = []
+            row = first
+            while row is not None and count < MAX_DATA_ROWS:
+                count += 1
+                number = count + 1
+                chunk.append(f'<row r="{number}">' + ''.join(cell_xml(f'{letter}{number}', value)
+                                                             for letter, value in zip(letters, row)) + '</row>')
+                if len(chunk) >= ROWS_PER_CHUNK:
+                    sheet.write(''.join(chunk).encode('utf-8'))
+                    chunk = []
+                row = next(rows, None)
+            if chunk:
+                sheet.write(''.join(chunk).encode('utf-8'))
+            sheet.write(b'</sheetData></worksheet>')
+        return count, row
+
+    def close(self):
+        sheets = ''.join(f'<sheet name={quoteattr(name)} sheetId="{index}" r:id="rId{index}"/>'
+                         for index, name in enumerate(self.sheet_names, 1))
+        self._zip.writestr('xl/workbook.xml', f'<workbook xmlns="{MAIN_NS}" xmlns:r="{REL_NS}"><bookViews>'
+                                              f'<workbookView/></bookViews><sheets>{sheets}</sheets></workbook>')
+        relationships = ''.join(f'<Relationship Id="rId{index}" Type="{REL_NS}/worksheet" '
+                                f'Target="worksheets/sheet{index}.xml"/>'
+                                for index in range(1, len(self.sheet_names) + 1))
+        styles_id = len(self.sheet_names) + 1
+        self._zip.writestr('xl/_rels/workbook.xml.rels',
+                           f'<Relationships xmlns="{PACKAGE_REL_NS}">{relationships}'
+                           f'<Relationship Id="rId{styles_id}" Type="{REL_NS}/styles" Target="styles.xml"/>'
+                           '</Relationships>')
+        self._zip.writestr('xl/styles.xml', STYLES_XML)
+        created = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        self._zip.writestr('docProps/core.xml',
+                           '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/'
+                           'core-properties" xmlns:dc="http://purl.org/dc/elements/1.1/" '
+                           'xmlns:dcterms="http://purl.org/dc/terms/" '
+                           'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+                           '<dc:creator>Scholarship Criteria</dc:creator>'
+                           f'<dcterms:created xsi:type="dcterms:W3CDTF">{created}</dcterms:created>'
+                           '</cp:coreProperties>')
+        self._zip.writestr('_rels/.rels',
+                           f'<Relationships xmlns="{PACKAGE_REL_NS}">'
+                           f'<Relationship Id="rId1" Type="{REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+                           f'<Relationship Id="rId2" Type="{PACKAGE_REL_NS}/metadata/core-properties" '
+                           'Target="docProps/core.xml"/></Relationships>')
+        overrides = ''.join(f'<Override PartName="/xl/worksheets/sheet{index}.xml" ContentType="{WORKSHEET_TYPE}"/>'
+                            for index in range(1, len(self.sheet_names) + 1))
+        self._zip.writestr('[Content_Types].xml',
+                           '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                           '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                           '<Default Extension="xml" ContentType="application/xml"/>'
+                           '<Override PartName="/xl/workbook.xml" '
+                           'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                           '<Override PartName="/xl/styles.xml" '
+                           'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+                           '<Override PartName="/docProps/core.xml" '
+                           'ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+                           f'{overrides}</Types>')
+        self._zip.close()
+        os.replace(self.temp_path, self.path)
+
+    def abort(self):
+        self._zip.close()
+        os.remove(self.temp_path)
+
+    def __enter__(self) -> 'StreamingWorkbook':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()